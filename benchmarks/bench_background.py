@@ -0,0 +1,72 @@
+"""Per-frame cost of the camera background path: old resize/addWeighted/tobytes/frombuffer vs BackgroundCompositor.
+
+    python benchmarks/bench_background.py --screen 3840x2160 --camera 1280x720
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import cv2
+import numpy as np
+import pygame
+
+from sound_jumper.compositor import BackgroundCompositor
+
+
+def parse_size(text):
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+
+def legacy_frame(screen, frame, game_bg_image, size):
+    final_bg_image = cv2.resize(frame, size)
+    final_bg_image = cv2.addWeighted(final_bg_image, 0.7, game_bg_image, 0.3, 0)
+    bg_surface = pygame.image.frombuffer(final_bg_image.tobytes(), final_bg_image.shape[1::-1], "RGB")
+    screen.blit(bg_surface, (0, 0))
+
+
+def time_it(fn, frames):
+    fn()  # warm-up
+    samples = np.empty(frames)
+    for i in range(frames):
+        t0 = time.perf_counter()
+        fn()
+        samples[i] = time.perf_counter() - t0
+    return samples * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--screen", type=parse_size, default=(1920, 1080))
+    parser.add_argument("--camera", type=parse_size, default=(640, 480))
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode(args.screen)
+    rng = np.random.default_rng(0)
+    cam_w, cam_h = args.camera
+    frame = rng.integers(0, 255, (cam_h, cam_w, 3), dtype=np.uint8)
+    game_bg = rng.integers(0, 255, (args.screen[1], args.screen[0], 3), dtype=np.uint8)
+
+    rows = [("legacy", time_it(lambda: legacy_frame(screen, frame, game_bg, args.screen), args.frames))]
+    for scale in (1.0, 0.5, 0.25):
+        comp = BackgroundCompositor(args.screen, scale, game_bg)
+
+        def step():
+            comp.update(frame)
+            comp.blit_to(screen)
+        rows.append((f"compositor x{scale}", time_it(step, args.frames)))
+
+    print(f"screen {args.screen[0]}x{args.screen[1]}, camera {cam_w}x{cam_h}, {args.frames} frames")
+    for name, ms in rows:
+        print(f"{name:<18} mean {ms.mean():7.3f} ms   p50 {np.percentile(ms, 50):7.3f}   p95 {np.percentile(ms, 95):7.3f}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Camera discovery time: serial probing (the old loop) vs concurrent vs the cached profile.
+
+Each source is an index or a URL / video file.  "serial" opens them one after
+another the way the old ``[1, 2, 3, 0]`` loop did (but probes all of them so
+the best can be picked); "concurrent" is ``discover_cameras``; "cached" is
+``find_camera`` once the profile from the previous run exists.  Uses a scratch
+cache directory so the real profile is left alone.
+
+    python benchmarks/bench_camera.py
+    python benchmarks/bench_camera.py --sources 0 1 http://192.168.1.100:8080/video
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from sound_jumper import camera
+
+
+def source_arg(value):
+    return int(value) if value.isdigit() else value
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sources", nargs="+", type=source_arg, default=[1, 2, 3, 0])
+    parser.add_argument("--timeout", type=float, default=3.0)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--fps", type=int, default=30)
+    args = parser.parse_args()
+    settings = dict(width=args.width, height=args.height, fps=args.fps)
+    os.environ["XDG_CACHE_HOME"] = tempfile.mkdtemp()
+
+    t0 = time.perf_counter()
+    for source in args.sources:
+        probe = camera.probe_camera(source, args.timeout, **settings)
+        print(f"  {source!r}: {probe if probe is not None else 'no camera'}")
+        if probe is not None:
+            probe.cap.release()
+    serial = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    best = camera.discover_cameras(args.sources, args.timeout, **settings)
+    concurrent = time.perf_counter() - t0
+    if best is not None:
+        best.cap.release()
+
+    camera.find_camera(args.sources, args.timeout, **settings)   # 写入缓存
+    t0 = time.perf_counter()
+    cached = camera.find_camera(args.sources, args.timeout, **settings)
+    cached_time = time.perf_counter() - t0
+    if cached is not None:
+        cached.cap.release()
+
+    print(f"best: {best if best is not None else 'none'}")
+    print(f"serial {serial * 1000:.0f} ms, concurrent {concurrent * 1000:.0f} ms, cached {cached_time * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Offline accuracy, flicker and throughput of the gesture classifiers.
+
+Compares the prototype's and the backup script's old single-frame rules with
+``sound_jumper.gestures`` (per frame, and with ``GestureDebouncer``).
+
+By default hands are generated from a simple 2D skeleton with random tilt,
+scale, landmark noise and occasional single-frame misreads of one finger, so
+the accuracy figures only say how the rules compare on those synthetic hands.
+``--data`` reads landmark sets instead: ``(N, 21, 3)`` ``.npy`` files named
+after their label (``palm*.npy``, ``fist*.npy``, ``victory*.npy``,
+``unknown*.npy``), played back in file order as one sequence per file.  Nothing
+in the repo captures such sets yet.
+
+The per-hand timing goes through ``classify_hand`` on MediaPipe-like landmark
+objects, as in the game; it also checks that it agrees with ``classify_points``.
+
+    python benchmarks/bench_gestures.py
+    python benchmarks/bench_gestures.py --data landmark_sets/
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+from sound_jumper.gestures import FIST, GESTURE_CODES, GESTURES, PALM, UNKNOWN, VICTORY, GestureDebouncer, \
+    classify_hand, classify_points
+
+# 手指方向（相对竖直向上的角度）与 MCP 相对手腕的位置（手长约 1）
+FINGERS = [(-0.9, (-0.12, -0.10)), (-0.25, (-0.10, -0.45)), (-0.05, (0.0, -0.48)), (0.15, (0.09, -0.44)),
+           (0.35, (0.17, -0.38))]
+SEGMENTS = [(0.18, 0.15, 0.13), (0.22, 0.13, 0.10), (0.25, 0.15, 0.11), (0.23, 0.14, 0.10), (0.18, 0.11, 0.09)]
+POSES = {PALM: (1, 1, 1, 1, 1), FIST: (0, 0, 0, 0, 0), VICTORY: (0, 1, 1, 0, 0), UNKNOWN: (0, 1, 1, 1, 0)}
+
+
+def make_hand(rng, extended, noise=0.004):
+    pts = np.zeros((21, 3))
+    for f, ((angle, base), segs, ext) in enumerate(zip(FINGERS, SEGMENTS, extended)):
+        # 拇指：CMC(1) MCP(2) IP(3) TIP(4)；其余手指：MCP PIP DIP TIP
+        first = 1 + 4 * f
+        p = np.array(base) * (0.5 if f == 0 else 1.0)
+        pts[first, :2] = p
+        a = angle + rng.normal(0, 0.08)
+        for k, length in enumerate(segs):
+            if not ext:
+                a += (1.4 if f else -1.1) + rng.normal(0, 0.15)   # 弯曲：每个关节转向掌心
+            p = p + length * np.array([np.sin(a), -np.cos(a)])
+            pts[first + 1 + k, :2] = p
+    tilt = rng.uniform(-0.5, 0.5)
+    rot = np.array([[np.cos(tilt), -np.sin(tilt)], [np.sin(tilt), np.cos(tilt)]])
+    scale = rng.uniform(0.12, 0.25)
+    pts[:, :2] = pts[:, :2] @ rot.T * scale + rng.uniform(0.3, 0.7, 2)
+    pts[:, :2] += rng.normal(0, noise, (21, 2))
+    pts[:, 2] = rng.normal(0, 0.02, 21)
+    return pts
+
+
+def synthetic_sequences(rng, segments, misread):
+    frames, labels = [], []
+    for _ in range(segments):
+        label = int(rng.choice(list(POSES)))
+        for _ in range(int(rng.integers(15, 60))):
+            ext = np.array(POSES[label])
+            if rng.random() < misread:
+                ext = ext.copy(); ext[rng.integers(0, 5)] ^= 1
+            frames.append(make_hand(rng, ext)); labels.append(label)
+    return np.array(frames, np.float32), np.array(labels)
+
+
+def load_sets(path):
+    frames, labels = [], []
+    for name in sorted(glob.glob(os.path.join(path, "*.npy"))):
+        label = os.path.basename(name).split(".")[0].rstrip("0123456789_-").upper()
+        pts = np.load(name)
+        frames.append(pts); labels.append(np.full(len(pts), GESTURE_CODES[label]))
+    return np.concatenate(frames).astype(np.float32), np.concatenate(labels)
+
+
+# ---------- the old single-frame rules ----------
+def legacy(points, thumb_pip, thumb_axis, victory_needs_thumb_in):
+    tips, pips = [4, 8, 12, 16, 20], [thumb_pip, 6, 10, 14, 18]
+    ext = np.zeros(5, bool)
+    for i in range(1, 5):
+        ext[i] = points[tips[i], 1] < points[pips[i], 1]
+    ext[0] = points[4, thumb_axis] < points[thumb_pip, thumb_axis]
+    count = ext.sum()
+    if count >= 4: return PALM
+    if count <= 1: return FIST
+    if ext[1] and ext[2] and not ext[3] and not ext[4] and not (victory_needs_thumb_in and ext[0]): return VICTORY
+    return UNKNOWN
+
+
+def spurious_triggers(out, truth):
+    """Times the output switches into a skill gesture the hand isn't making."""
+    enter = np.flatnonzero(np.diff(out) != 0) + 1
+    return int(np.sum(np.isin(out[enter], (PALM, FIST, VICTORY)) & (out[enter] != truth[enter])))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", help="directory of <label>*.npy (N, 21, 3) landmark sets")
+    parser.add_argument("--segments", type=int, default=400)
+    parser.add_argument("--misread", type=float, default=0.08, help="synthetic per-frame finger misread rate")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.data:
+        frames, truth = load_sets(args.data)
+    else:
+        frames, truth = synthetic_sequences(np.random.default_rng(args.seed), args.segments, args.misread)
+    print(f"{len(frames)} frames")
+
+    results = {
+        "prototype (thumb 2, x)": np.array([legacy(p, 2, 0, True) for p in frames]),
+        "backup (thumb 3, y)": np.array([legacy(p, 3, 1, False) for p in frames]),
+        "vectorised": classify_points(frames),
+    }
+    debouncer = GestureDebouncer()
+    results["vectorised + debounce"] = np.array([GESTURE_CODES[debouncer.update(GESTURES[c])]
+                                                 for c in results["vectorised"]])
+
+    print(f"{'classifier':<24} {'accuracy':>8} {'spurious':>9}   per class")
+    for name, out in results.items():
+        per_class = "  ".join(f"{GESTURES[c]} {np.mean(out[truth == c] == c):.2f}" for c in np.unique(truth))
+        print(f"{name:<24} {np.mean(out == truth):8.3f} {spurious_triggers(out, truth):9d}   {per_class}")
+
+    # 吞吐量：逐手（MediaPipe 对象 -> 数组 -> 分类）与批量
+    hands = [types.SimpleNamespace(landmark=[types.SimpleNamespace(x=float(x), y=float(y), z=float(z))
+                                             for x, y, z in p]) for p in frames[:2000]]
+    t0 = time.perf_counter()
+    labels = [classify_hand(h) for h in hands]
+    per_hand = (time.perf_counter() - t0) / len(hands)
+    agree = np.mean([GESTURE_CODES[label] for label in labels] == results["vectorised"][:len(hands)])
+    t0 = time.perf_counter()
+    for p in frames[:2000]:
+        legacy(p, 2, 0, True)
+    per_legacy = (time.perf_counter() - t0) / min(2000, len(frames))
+    t0 = time.perf_counter()
+    classify_points(frames)
+    batch = (time.perf_counter() - t0) / len(frames)
+    print(f"throughput: classify_hand {1 / per_hand:,.0f} hands/s ({per_hand * 1e6:.1f} us), "
+          f"legacy rule {1 / per_legacy:,.0f}/s, batch {1 / batch:,.0f} hands/s")
+    print(f"classify_hand agrees with classify_points on {agree:.2%} of hands")
+
+
+if __name__ == "__main__":
+    main()
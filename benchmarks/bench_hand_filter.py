@@ -0,0 +1,128 @@
+"""End-to-end steering latency and jitter of the landmark filters on a hand trace.
+
+Replays landmark measurements (capture time, x, time the game received it)
+through each filter inside a 60 Hz game loop that predicts the hand to display
+time and applies the game's ``player_x += (target - player_x) * 0.2`` steering.
+Lag is the time shift that best aligns the drawn position with the true hand.
+
+Without ``--trace`` a synthetic session is generated: reach-and-hold moves
+sampled by a 30 fps camera with pipeline delay and landmark noise.  Recorded
+traces come from the prototype (SOUND_JUMPER_LANDMARK_TRACE=file.npy); the
+true hand is then approximated by a centred moving average of the samples.
+
+    python benchmarks/bench_hand_filter.py
+    python benchmarks/bench_hand_filter.py --trace hands.npy --lead 0.08
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+from sound_jumper.filters import FILTERS, make_filter
+
+SCREEN_W = 1920
+
+
+def synthetic_trace(rng, seconds, fps, delay, noise, every_n):
+    # 真实手部运动：最小加加速度（min-jerk）移动到随机目标，然后停留
+    t_truth = np.arange(0, seconds, 0.001)
+    truth = np.empty_like(t_truth)
+    x, i = 0.5, 0
+    while i < len(t_truth):
+        move = rng.uniform(0.25, 0.7)
+        hold = rng.uniform(0.2, 1.0)
+        target = rng.uniform(0.1, 0.9)
+        n_move, n_hold = int(move * 1000), int(hold * 1000)
+        s = np.linspace(0, 1, n_move)
+        seg = np.concatenate((x + (target - x) * (10 * s**3 - 15 * s**4 + 6 * s**5), np.full(n_hold, target)))
+        truth[i:i + len(seg)] = seg[:len(truth) - i]
+        i += len(seg); x = target
+
+    capture = np.arange(0, seconds, 1.0 / fps)[::every_n]
+    capture = capture + rng.normal(0, 0.002, len(capture))
+    measured = np.interp(capture, t_truth, truth) + rng.normal(0, noise, len(capture))
+    available = capture + delay + rng.uniform(0, 0.01, len(capture))
+    return np.column_stack((capture, measured, available)), (t_truth, truth)
+
+
+def truth_from_trace(trace, window=5):
+    ok = ~np.isnan(trace[:, 1])
+    t, x = trace[ok, 0], trace[ok, 1]
+    kernel = np.ones(window) / window
+    smooth = np.convolve(np.pad(x, window // 2, mode="edge"), kernel, mode="valid")
+    return t, smooth
+
+
+def run(trace, truth, kind, lead, steering, tick_rate, display_lag, **kwargs):
+    t_truth, x_truth = truth
+    filt = make_filter(kind, **kwargs)
+    order = np.argsort(trace[:, 2])
+    capture, measured, available = trace[order, 0], trace[order, 1], trace[order, 2]
+
+    times = np.arange(available[0], available[-1], 1.0 / tick_rate)
+    target_out = np.empty(len(times)); player_out = np.empty(len(times))
+    j = 0
+    target = player = measured[0]
+    for k, now in enumerate(times):
+        while j < len(available) and available[j] <= now:
+            if measured[j] != measured[j]:
+                filt.reset()
+            else:
+                filt.update(capture[j], measured[j])
+            j += 1
+        if filt.ready:
+            target = filt.predict(now + lead)
+        player += (target - player) * steering
+        target_out[k], player_out[k] = target, player
+
+    shown = times + display_lag   # 画面真正出现在屏幕上的时间
+    speed = np.abs(np.gradient(np.interp(shown, t_truth, x_truth), shown))
+    holds = speed < 0.02
+
+    def lag_and_error(out):
+        shifts = np.arange(-0.1, 0.3, 0.002)
+        shifted = np.interp((shown[None, :] - shifts[:, None]).ravel(), t_truth, x_truth).reshape(len(shifts), -1)
+        best = int(np.argmin(np.mean((out[None, :] - shifted) ** 2, axis=1)))
+        rms = np.sqrt(np.mean((out - np.interp(shown, t_truth, x_truth)) ** 2))
+        return shifts[best] * 1000, rms * SCREEN_W
+
+    # 抖动：手静止时，画出来的角色每帧的位移
+    jitter = np.sqrt(np.mean(np.diff(player_out)[holds[1:]] ** 2)) * SCREEN_W if holds[1:].any() else 0.0
+    return lag_and_error(target_out), lag_and_error(player_out), jitter
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--trace", help="(n, 3) .npy: capture time, x (NaN = lost), time received")
+    parser.add_argument("--seconds", type=float, default=120)
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--every-n", type=int, default=1, help="detection on every Nth camera frame")
+    parser.add_argument("--delay", type=float, default=0.045, help="capture -> landmark pipeline delay (s)")
+    parser.add_argument("--noise", type=float, default=0.003, help="landmark noise (normalised units)")
+    parser.add_argument("--lead", type=float, default=0.05, help="prediction lead past the current frame (s)")
+    parser.add_argument("--display-lag", type=float, default=1 / 60)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.trace:
+        trace = np.load(args.trace)
+        truth = truth_from_trace(trace)
+    else:
+        trace, truth = synthetic_trace(np.random.default_rng(args.seed), args.seconds, args.fps, args.delay,
+                                       args.noise, args.every_n)
+
+    print(f"{len(trace)} landmark samples; lead {args.lead * 1000:.0f} ms; lag and error vs the true hand")
+    print(f"{'filter':<10} {'lead':>6} | {'target lag':>10} {'rms px':>7} | "
+          f"{'player lag':>10} {'rms px':>7} {'jitter px':>9}")
+    for kind in FILTERS:
+        for lead in ((0.0,) if kind == "none" else (0.0, args.lead)):
+            (t_lag, t_rms), (p_lag, p_rms), jitter = run(trace, truth, kind, lead, 0.2, 60, args.display_lag)
+            print(f"{kind:<10} {lead * 1000:4.0f}ms | {t_lag:8.0f}ms {t_rms:7.1f} | "
+                  f"{p_lag:8.0f}ms {p_rms:7.1f} {jitter:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Terrain generation and culling over a long climb: per-platform loop vs pooled chunks.
+
+Scrolls a ``World`` up by a fixed speed for ``--steps`` ticks (well past the
+point where platforms have shrunk to their minimum width) and refills it either
+the old way (everything above the top edge culled on every scroll, then a
+screen of platforms regenerated with one ``random`` draw set and
+``add_platform`` each), with ``ChunkGenerator`` in the tick, or from a
+``ChunkPrefetcher`` that keeps three chunks ready on a background thread.
+
+Reports the per-tick cost of scrolling, culling and generating ("gen ms" is the
+mean over the ticks that added terrain), how many garbage collections ran, and
+then, in a second traced pass, how much memory the steady state (second half
+of the run) allocated.
+
+    python benchmarks/bench_level.py --steps 100000
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+from sound_jumper.level import ChunkGenerator, ChunkPrefetcher, platform_width
+from sound_jumper.world import FALLING, World
+
+WIDTH, HEIGHT = 1920, 1080
+
+
+def legacy(world, seed):
+    rng = random.Random(seed)
+
+    def fill(highest_y, scroll):
+        y = highest_y
+        while y > -HEIGHT:
+            y -= rng.randint(100, 180)
+            w = platform_width(scroll)
+            world.add_platform(rng.randint(0, WIDTH - w), y, w, rng.random() < 0.25)
+        if rng.random() < 0.6:
+            world.add_hazard(rng.randint(0, WIDTH), highest_y - rng.randint(100, 300),
+                             rng.choice([-10, 10]))
+
+    def step(scroll):
+        # 旧的裁剪：屏幕上沿以上的平台和障碍每次滚动都扔掉
+        p, h = world.platforms, world.hazards
+        p.compact(p.y + p.h > 0)
+        h.compact(h.y + h.h > 0)
+        standing = p.y[(p.flags & FALLING) == 0]
+        highest_y = min(HEIGHT, standing.min()) if len(standing) else HEIGHT
+        if len(p) < 15 or highest_y > 0:
+            fill(highest_y, scroll)
+    return step
+
+
+def chunked(world, seed, lookahead=0):
+    level = ChunkGenerator(WIDTH, HEIGHT, 10)
+    if lookahead:
+        level = ChunkPrefetcher(level, lookahead)
+    level.reset(seed, HEIGHT - 300)
+    top = [HEIGHT - 300]
+
+    def step(scroll):
+        while top[0] + scroll > -HEIGHT:
+            chunk = level.next_chunk()
+            world.add_chunk(chunk, scroll)
+            top[0] = chunk.top
+            level.release(chunk)
+    step.level = level
+    return step
+
+
+def prefetch(world, seed):
+    return chunked(world, seed, lookahead=3)
+
+
+def run(make, args, trace_memory):
+    world = World(WIDTH, HEIGHT)
+    step = make(world, args.seed)
+    step(0.0)
+    collections = [0]
+
+    def count(phase, info):
+        if phase == "start":
+            collections[0] += 1
+
+    gc.callbacks.append(count)
+    if trace_memory:
+        tracemalloc.start()
+    scroll, times, generated, base = 0.0, np.zeros(args.steps), np.zeros(args.steps, bool), 0
+    try:
+        for t in range(args.steps):
+            if trace_memory and t == args.steps // 2:
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+            before = len(world.platforms)
+            t0 = time.perf_counter()
+            scroll += args.speed
+            world.scroll(args.speed, 20)
+            step(scroll)
+            times[t] = time.perf_counter() - t0
+            generated[t] = len(world.platforms) > before
+        current, peak = tracemalloc.get_traced_memory() if trace_memory else (0, 0)
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        gc.callbacks.remove(count)
+        if isinstance(getattr(step, "level", None), ChunkPrefetcher):
+            step.level.close()
+    return times * 1000, generated, collections[0], current - base, peak - base
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=int, default=100000)
+    parser.add_argument("--speed", type=float, default=12.0, help="scroll per tick in pixels")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{args.steps} ticks at {args.speed:g} px/tick (scroll {args.steps * args.speed:.0f})")
+    print(f"{'mode':<8} {'gen ticks':>9} {'gen ms':>7} {'p50 ms':>7} {'p99 ms':>7} {'max ms':>7} {'total ms':>9} {'gc runs':>8} "
+          f"{'steady KiB':>10} {'peak KiB':>9}")
+    for name, make in (("legacy", legacy), ("chunked", chunked), ("prefetch", prefetch)):
+        times, generated, collections, _, _ = run(make, args, False)
+        _, _, _, grown, peak = run(make, args, True)
+        print(f"{name:<8} {generated.sum():9d} {times[generated].mean():7.3f} {np.percentile(times, 50):7.3f} {np.percentile(times, 99):7.3f} "
+              f"{times.max():7.3f} {times.sum():9.0f} {collections:8d} {grown / 1024:10.1f} {peak / 1024:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
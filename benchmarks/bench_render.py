@@ -0,0 +1,209 @@
+"""Rendering cost of the game screen at kiosk resolutions.
+
+Plays a seeded game from a synthetic input trace (keyboard moves) and draws
+every tick the way the prototype does, once per mode:
+
+* ``full``  - fill, full-screen alpha dim, draw everything, ``flip``
+* ``dirty`` - ``DirtyRenderer``: static dimmed background, restore and
+  ``display.update`` only the rects drawn this frame and last frame
+* ``full+tiles`` / ``dirty+tiles`` - the same, with platforms and hazards as
+  pre-rendered ``TileSet`` tiles in one ``screen.blits`` per layer instead of
+  a ``pygame.draw`` call each
+* ``gpu`` - ``GpuRenderer``: tiles drawn onto a transparent overlay, whose
+  dirty rects are uploaded to a texture.  The background, dim and camera are
+  composited by an SDL ``Renderer``.
+
+``--camera`` feeds a synthetic 1280x720 camera frame every tick.  The software
+modes blend it on the CPU with ``BackgroundCompositor`` and redraw the whole
+screen (dirty rects are off with a moving background).  ``gpu`` uploads it
+into a streaming texture.
+``--stress N`` adds N platforms and N hazards on screen (like the stress
+level of ``bench_world``) so the per-entity cost shows.  ``--check`` compares
+the final frame of each mode with ``full``.  It reports "identical" or the
+largest channel difference; the GPU's blending rounds differently.
+
+Uses SDL's dummy video driver unless ``--window``.  The dummy driver's
+``flip``/``update`` cost nothing, and its SDL renderer is the software one.
+So there, the numbers are the CPU side only, and ``gpu`` shows the
+software renderer doing the compositing.
+
+    python benchmarks/bench_render.py --size 3840x2160
+    python benchmarks/bench_render.py --size 1920x1080 --stress 2000 --check
+    python benchmarks/bench_render.py --size 3840x2160 --camera --window
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+from bench_sim import synthetic_trace
+
+HAZARD_SIZE = 15
+
+
+def setup(size, window):
+    if not window:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    pygame.init()
+    return pygame, pygame.display.set_mode(size)
+
+
+def run(mode, pygame, display, trace, args):
+    from sound_jumper.compositor import BackgroundCompositor
+    from sound_jumper.dirty import DirtyRenderer
+    from sound_jumper.hud import CachedText, SkillPanel
+    from sound_jumper.sim import SimConfig, Simulation
+    from sound_jumper.tiles import TileSet
+    from sound_jumper.world import BOUNCY, FALLING, World
+
+    width, height = display.get_size()
+    sim = Simulation(SimConfig(width, height), seed=args.seed)
+    font = pygame.font.SysFont(None, 30)
+    big = pygame.font.SysFont(None, 60)
+    panels = [SkillPanel(font, name, color) for name, color in
+              (("Rescue", (255, 165, 0)), ("Shield", (255, 215, 0)), ("Blast", (0, 255, 255)))]
+    score_text = CachedText(big, (255, 255, 255))
+    dim = pygame.Surface((width, height))
+    dim.set_alpha(100)
+    dim.fill((0, 0, 0))
+    background = pygame.Surface((width, height))
+    background.fill((20, 20, 30))
+    background.blit(dim, (0, 0))
+    rng = np.random.default_rng(args.seed)
+    game_bg = gradient(height, width, 0)
+    frames = [gradient(720, 1280, 15 * i) for i in range(4)] if args.camera else None
+    if mode == "gpu":
+        from sound_jumper.gpu import GpuRenderer
+        renderer = GpuRenderer((width, height), title="bench_render", fullscreen=False, vsync=False)
+        renderer.set_background(game_bg)
+        screen = renderer.screen
+    else:
+        renderer = DirtyRenderer(display, background.convert())
+        renderer.set_active(mode.startswith("dirty") and not args.camera)
+        screen = display
+    compositor = BackgroundCompositor((width, height), 1.0, game_bg) if args.camera and mode != "gpu" else None
+    mark = renderer.add
+    tiles = TileSet(15, HAZARD_SIZE) if mode.endswith("+tiles") or mode == "gpu" else None
+
+    times, areas = [], []
+    for t, rec in enumerate(trace):
+        sim.step(float(rec["voice"]), None, int(rec["move"]), None)
+        if sim.game_over:
+            sim.reset(args.seed)
+        if args.stress:
+            add_stress(sim.world, rng, args.stress)
+        t0 = time.perf_counter()
+        if frames is not None:
+            frame = frames[t % len(frames)]
+            if compositor is not None:
+                compositor.update(frame)
+            else:
+                renderer.set_camera_frame(frame)
+        renderer.begin()
+        if not renderer.active:
+            if compositor is not None:
+                compositor.blit_to(screen)
+            else:
+                screen.fill((20, 20, 30))
+            screen.blit(dim, (0, 0))
+        plats = sim.world.platforms
+        xs, ys = World.interpolate(plats, 1.0)
+        hx, hy = World.interpolate(sim.world.hazards, 1.0)
+        if tiles is not None:
+            renderer.extend(screen.blits(tiles.platform_batch(xs, ys, plats.w, plats.flags),
+                                         doreturn=renderer.active))
+            renderer.extend(screen.blits(tiles.hazard_batch(hx, hy), doreturn=renderer.active))
+        else:
+            for x, y, w, h, flags in zip(xs.tolist(), ys.tolist(), plats.w.tolist(), plats.h.tolist(),
+                                         plats.flags.tolist()):
+                color = (80, 80, 80) if flags & FALLING else ((255, 165, 0) if flags & BOUNCY else (180, 180, 100))
+                mark(pygame.draw.rect(screen, color, (int(x), int(y), int(w), int(h))))
+            for x, y in zip(hx.tolist(), hy.tolist()):
+                mark(pygame.draw.circle(screen, (255, 50, 50), (int(x) + HAZARD_SIZE // 2, int(y) + HAZARD_SIZE // 2),
+                                        HAZARD_SIZE // 2))
+        mark(pygame.draw.rect(screen, (200, 80, 120), (int(sim.player_x), int(sim.player_y), 40, 40)))
+        for i, panel in enumerate(panels):
+            mark(screen.blit(panel.get(0.0), (20, height // 2 - 100 + 60 * i)))
+        vol_h = int(min(1.0, float(rec["voice"]) / 0.02) * 200)
+        mark(pygame.draw.rect(screen, (50, 50, 50), (width - 40, height - 250, 20, 200)))
+        mark(pygame.draw.rect(screen, (0, 255, 0), (width - 40, height - 50 - vol_h, 20, vol_h)))
+        score = score_text.get(str(sim.score))
+        mark(screen.blit(score, (width // 2 - score.get_width() // 2, 50)))
+        renderer.present()
+        times.append(time.perf_counter() - t0)
+        areas.append(renderer.dirty_area / (width * height))
+    if mode == "gpu":
+        out = pygame.Surface((width, height), 0, 32)
+        renderer.renderer.to_surface(out)
+        renderer.close()
+    else:
+        out = display
+    return np.array(times[10:]) * 1000, np.array(areas[10:]), pygame.surfarray.array3d(out)
+
+
+def gradient(height, width, phase):
+    """Smooth BGR test image: scaled with different filters, it still comes out (nearly) the same."""
+    y, x = np.mgrid[0:height, 0:width]
+    image = np.empty((height, width, 3), np.uint8)
+    image[..., 0] = x * 200 // max(1, width - 1) + phase
+    image[..., 1] = y * 255 // max(1, height - 1)
+    image[..., 2] = 128
+    return image
+
+
+def add_stress(world, rng, count):
+    """Top the level up to ``count`` extra platforms and hazards scattered over the screen."""
+    width, height = world.width, world.height
+    missing = count + 40 - len(world.platforms)
+    if missing > 0:
+        w = rng.integers(60, 221, missing).astype(float)
+        world.platforms.extend(x=rng.uniform(0, width - w), y=rng.uniform(0, height, missing), w=w,
+                               h=np.full(missing, 15.0), flags=rng.integers(0, 4, missing).astype(np.uint8) & 3)
+        world.platforms.px[:] = world.platforms.x
+        world.platforms.py[:] = world.platforms.y
+    missing = count - len(world.hazards)
+    if missing > 0:
+        world.hazards.extend(x=rng.uniform(0, width - HAZARD_SIZE, missing), y=rng.uniform(0, height, missing),
+                             w=np.full(missing, float(HAZARD_SIZE)), h=np.full(missing, float(HAZARD_SIZE)),
+                             vx=rng.choice([-10.0, 10.0], missing))
+        world.hazards.px[:] = world.hazards.x
+        world.hazards.py[:] = world.hazards.y
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", default="3840x2160")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--window", action="store_true", help="render to a real window instead of the dummy driver")
+    parser.add_argument("--stress", type=int, default=0, help="extra platforms and hazards kept on screen")
+    parser.add_argument("--check", action="store_true", help="compare each mode's last frame with full's")
+    parser.add_argument("--camera", action="store_true", help="composite a synthetic camera frame every tick")
+    args = parser.parse_args()
+
+    size = tuple(int(v) for v in args.size.split("x"))
+    pygame, screen = setup(size, args.window)
+    trace = synthetic_trace(np.random.default_rng(args.seed), args.frames, size[0], 40, False)
+    print(f"{size[0]}x{size[1]}, {args.frames} frames, stress {args.stress}, camera {args.camera}, "
+          f"driver {pygame.display.get_driver()}")
+    print(f"{'mode':<12} {'p50 ms':>7} {'p99 ms':>7} {'updated area':>13}")
+    reference = None
+    for mode in ("full", "full+tiles", "dirty", "dirty+tiles", "gpu"):
+        times, areas, frame = run(mode, pygame, screen, trace, args)
+        line = f"{mode:<12} {np.percentile(times, 50):7.2f} {np.percentile(times, 99):7.2f} {np.mean(areas):12.1%}"
+        if args.check:
+            if reference is None:
+                reference = frame
+            diff = np.abs(frame.astype(np.int16) - reference)
+            line += "  identical" if not diff.any() else f"  max diff {diff.max()}, mean {diff.mean():.2f}"
+        print(line)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
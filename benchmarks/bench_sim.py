@@ -0,0 +1,112 @@
+"""Headless simulation throughput: many seeded games driven by input traces.
+
+Runs without pygame, a display, a microphone or a camera.  Each game replays a
+TRACE_DTYPE array (one record per tick); ``--trace`` loads one from ``.npy``,
+otherwise a synthetic trace is generated per game (voice bursts, a wandering
+hand and the occasional skill).  ``--recording`` replays every game of a
+SOUND_JUMPER_RECORD session and checks each final score against the recording.
+
+    python benchmarks/bench_sim.py --games 1000
+    python benchmarks/bench_sim.py --trace my_trace.npy --games 200
+    python benchmarks/bench_sim.py --recording session.sjrec
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+from sound_jumper.recording import ReplaySource
+from sound_jumper.sim import TRACE_DTYPE, SimConfig, Simulation, run_trace
+
+
+def synthetic_trace(rng, ticks, width, player_w, camera):
+    trace = np.zeros(ticks, TRACE_DTYPE)
+    # 每 0.3~1.2 秒喊一声，持续 3~10 个 tick
+    t = 0
+    while t < ticks:
+        t += int(rng.integers(18, 72))
+        trace["voice"][t:t + int(rng.integers(3, 10))] = rng.uniform(0.002, 0.01)
+    if camera:
+        hand = np.cumsum(rng.normal(0, 12, ticks)) + width / 2
+        trace["hand_x"] = np.clip(hand, 0, width - player_w)
+        trace["hand_x"][rng.random(ticks) < 0.5] = np.nan   # 摄像头帧率低于 tick 频率
+    else:
+        trace["hand_x"] = np.nan
+        trace["move"] = rng.integers(-1, 2, ticks)
+    trace["skill"][rng.random(ticks) < 0.01] = rng.integers(1, 4)
+    return trace
+
+
+def replay_recording(path):
+    source = ReplaySource(path)
+    meta = source.meta
+    config = SimConfig(meta["width"], meta["height"], camera=meta["camera"], tick_rate=meta["tick_rate"])
+    sim = Simulation(config)
+    games = list(source.games())
+
+    total_ticks = mismatches = 0
+    t0 = time.perf_counter()
+    for seed, sensitivity, trace, recorded_score in games:
+        sim.sensitivity = sensitivity
+        sim.reset(seed)
+        total_ticks += run_trace(sim, trace)
+        if recorded_score is not None and sim.score != recorded_score:
+            mismatches += 1
+    elapsed = time.perf_counter() - t0
+
+    recorded_seconds = float(source.records["t"][-1]) if len(source.records) else 0.0
+    print(f"{path}: {len(games)} games, {total_ticks} ticks ({recorded_seconds:.1f} s recorded) in {elapsed:.3f} s")
+    print(f"  simulated fps   {total_ticks / max(elapsed, 1e-9):12.0f} ticks/s")
+    print(f"  score mismatch  {mismatches:12d}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--ticks", type=int, default=3600, help="max ticks per game")
+    parser.add_argument("--trace", help="TRACE_DTYPE .npy file replayed by every game")
+    parser.add_argument("--recording", help="replay a recorded session instead of synthetic games")
+    parser.add_argument("--camera", action="store_true", help="hand x drives the player instead of move")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    args = parser.parse_args()
+    if args.recording:
+        replay_recording(args.recording)
+        return
+
+    config = SimConfig(args.width, args.height, camera=args.camera)
+    rng = np.random.default_rng(args.seed)
+    fixed = np.load(args.trace) if args.trace else None
+
+    traces = [fixed[:args.ticks] if fixed is not None else
+              synthetic_trace(rng, args.ticks, args.width, config.player_w, args.camera) for _ in range(args.games)]
+
+    total_ticks = 0
+    scores = np.empty(args.games)
+    sim = Simulation(config)
+    t0 = time.perf_counter()
+    for g, trace in enumerate(traces):
+        sim.reset(args.seed + g)
+        total_ticks += run_trace(sim, trace)
+        scores[g] = sim.score
+    elapsed = time.perf_counter() - t0
+
+    # 同一种子 + 同一输入必须得到同一局
+    check = Simulation(config, args.seed)
+    run_trace(check, traces[0])
+    deterministic = check.score == scores[0]
+
+    print(f"{args.games} games, {total_ticks} ticks in {elapsed:.2f} s")
+    print(f"  simulated fps   {total_ticks / elapsed:12.0f} ticks/s ({total_ticks / elapsed / config.tick_rate:.0f}x real time)")
+    print(f"  games / minute  {args.games / elapsed * 60:12.0f}")
+    print(f"  score mean/max  {scores.mean():12.1f} / {scores.max():.0f}")
+    print(f"  deterministic   {'yes' if deterministic else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Time to first frame and time to ready of the prototype, over several cold launches.
+
+Starts ``sound_jumper_prototype.py`` (with SDL's dummy video/audio drivers
+unless ``--window``), reads the startup report it prints, and stops it once
+every background startup task has finished.  "serial" is what the same work
+would take if it all ran before the first frame, as it used to: the time to
+first frame plus the sum of the startup task durations (minus "vision",
+which mostly waits for "camera" and "hands").
+
+    python benchmarks/bench_startup.py --runs 5
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+FIRST_FRAME = re.compile(r"首帧耗时: (\d+) ms")
+READY = re.compile(r"启动完成: (\d+) ms（(.*)）")
+TASK = re.compile(r"([^\s，]+) (\d+) ms")
+
+
+def launch(window, timeout):
+    env = dict(os.environ)
+    if not window:
+        env.setdefault("SDL_VIDEODRIVER", "dummy")
+        env.setdefault("SDL_AUDIODRIVER", "dummy")
+    proc = subprocess.Popen([sys.executable, "-u", os.path.join(ROOT, "sound_jumper_prototype.py")], env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, encoding="utf-8")
+    first = ready = None
+    tasks = {}
+    deadline = time.monotonic() + timeout
+    try:
+        for line in proc.stdout:
+            m = FIRST_FRAME.search(line)
+            if m:
+                first = float(m.group(1))
+            m = READY.search(line)
+            if m:
+                ready = float(m.group(1))
+                tasks = {name: float(ms) for name, ms in TASK.findall(m.group(2))}
+                break
+            if time.monotonic() > deadline:
+                break
+    finally:
+        proc.terminate()
+        proc.wait(5)
+    return first, ready, tasks
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--window", action="store_true", help="use the real display instead of SDL's dummy driver")
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    firsts, readies, serials, per_task = [], [], [], {}
+    for i in range(args.runs):
+        first, ready, tasks = launch(args.window, args.timeout)
+        if first is None or ready is None:
+            print(f"run {i}: no startup report (first frame {first}, ready {ready})")
+            continue
+        firsts.append(first); readies.append(ready)
+        serials.append(first + sum(ms for n, ms in tasks.items() if n != "vision"))
+        for name, ms in tasks.items():
+            per_task.setdefault(name, []).append(ms)
+        print(f"run {i}: first frame {first:.0f} ms, ready {ready:.0f} ms  " +
+              "  ".join(f"{n} {ms:.0f}" for n, ms in tasks.items()))
+    if not firsts:
+        return
+    print(f"median over {len(firsts)} runs: first frame {np.median(firsts):.0f} ms, ready {np.median(readies):.0f} ms, "
+          f"serial {np.median(serials):.0f} ms")
+    for name, values in per_task.items():
+        print(f"  {name:<12} {np.median(values):6.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
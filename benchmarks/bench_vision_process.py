@@ -0,0 +1,127 @@
+"""How much a vision thread vs a vision process slows the game loop down.
+
+A 60 Hz loop does a fixed amount of pure-Python work per frame (standing in
+for the game's update/draw) while a fake 30 fps camera feeds a fake ``Hands``
+whose ``process`` holds the GIL for ``--infer-ms`` like MediaPipe's Python-side
+work does.  Reported per mode: the loop's work time per frame (it should not
+grow), camera frames the loop received, and what reading ``latest`` costs.
+
+    python benchmarks/bench_vision_process.py
+    python benchmarks/bench_vision_process.py --infer-ms 15 --seconds 10
+"""
+import argparse
+import functools
+import importlib
+import os
+import sys
+import time
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+from sound_jumper.gestures import classify_hand
+from sound_jumper.vision import VisionWorker
+from sound_jumper.vision_process import VisionProcess
+
+
+class FakeCapture:
+    def __init__(self, shape, fps):
+        self.frame = np.random.default_rng(0).integers(0, 255, shape, np.uint8)
+        self.period = 1.0 / fps
+        self.next = time.perf_counter()
+
+    def read(self):
+        self.next += self.period
+        delay = self.next - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        return True, self.frame.copy()
+
+    def release(self):
+        pass
+
+
+class FakeHands:
+    def __init__(self, infer_ms):
+        self.cost = infer_ms / 1000.0
+
+    def process(self, image):
+        end = time.perf_counter() + self.cost
+        n = 0
+        while time.perf_counter() < end:     # 纯 Python 循环，一直持有 GIL
+            n += 1
+        return types.SimpleNamespace(multi_hand_landmarks=None, multi_handedness=None)
+
+    def close(self):
+        pass
+
+
+def game_work(n):
+    total = 0
+    for i in range(n):
+        total += i * i % 7
+    return total
+
+
+def run(mode, args, this):
+    shape = (args.height, args.width, 3)
+    worker = None
+    if mode == "thread":
+        worker = VisionWorker(FakeCapture(shape, args.fps), FakeHands(args.infer_ms), classify_hand, 1920, 40).start()
+    elif mode == "process":
+        # 子进程按模块名找回这两个类，所以用导入的模块而不是 __main__ 里的定义
+        worker = VisionProcess(functools.partial(this.FakeCapture, shape, args.fps),
+                               functools.partial(this.FakeHands, args.infer_ms), classify_hand, 1920, 40,
+                               shape).start()
+        time.sleep(args.warmup)             # spawn 出的子进程要先导入 numpy / cv2
+
+    work, reads = [], []
+    frames, last_id = 0, 0
+    start = next_frame = time.perf_counter()
+    while time.perf_counter() - start < args.seconds:
+        if worker is not None:
+            t0 = time.perf_counter()
+            snapshot = worker.latest
+            reads.append(time.perf_counter() - t0)
+            if snapshot.frame_id != last_id:
+                last_id = snapshot.frame_id
+                frames += 1
+        t0 = time.perf_counter()
+        game_work(args.work)
+        work.append(time.perf_counter() - t0)
+        next_frame += 1 / 60
+        delay = next_frame - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    if worker is not None:
+        worker.stop()
+
+    work = np.array(work) * 1000
+    reads = np.array(reads or [0.0]) * 1e6
+    return np.percentile(work, 50), np.percentile(work, 99), frames / args.seconds, np.percentile(reads, 50), \
+        np.max(reads)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--infer-ms", type=float, default=12, help="GIL-holding time per hands.process call")
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--work", type=int, default=60000, help="pure-Python loop iterations per game frame")
+    parser.add_argument("--warmup", type=float, default=1.5)
+    args = parser.parse_args()
+
+    this = importlib.import_module("bench_vision_process")
+    print(f"60 Hz loop, {args.fps:.0f} fps camera {args.width}x{args.height}, inference {args.infer_ms:.0f} ms")
+    print(f"{'mode':<8} {'work p50':>9} {'work p99':>9} {'frames/s':>9} {'latest p50':>11} {'latest max':>11}")
+    for mode in ("none", "thread", "process"):
+        p50, p99, fps, r50, rmax = run(mode, args, this)
+        print(f"{mode:<8} {p50:7.2f}ms {p99:7.2f}ms {fps:9.1f} {r50:9.0f}us {rmax:9.0f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Voice-to-jump latency: legacy 1024-sample block RMS vs VoiceOnsetDetector.
+
+A synthetic recording (background noise + shouts of random length and loudness) is fed
+through both paths in simulated time; the game is assumed to read audio once per
+60 Hz frame.  Latency is measured from shout start to the first frame that jumps.
+
+    python benchmarks/bench_voice_latency.py --shouts 200 --hop 128
+"""
+import argparse
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+from sound_jumper.voice import VoiceOnsetDetector
+
+SAMPLE_RATE = 44100
+FRAME_DT = 1 / 60
+VOLUME_THRESHOLD = 0.001
+VOLUME_SENSITIVITY = 4000
+
+
+def make_signal(rng, shouts):
+    starts, t = [], 0.5
+    for _ in range(shouts):
+        starts.append(t)
+        t += rng.uniform(0.6, 1.2)
+    total = int((t + 0.5) * SAMPLE_RATE)
+    sig = rng.normal(0, 0.0003, total).astype(np.float32)
+    for s in starts:
+        dur = rng.uniform(0.03, 0.3)
+        n = int(dur * SAMPLE_RATE)
+        i0 = int(s * SAMPLE_RATE)
+        tt = np.arange(n) / SAMPLE_RATE
+        env = np.minimum(1.0, tt / 0.005) * np.minimum(1.0, (dur - tt) / 0.01)
+        voice = np.sin(2 * np.pi * rng.uniform(150, 400) * tt) + 0.3 * rng.normal(0, 1, n)
+        sig[i0:i0 + n] += (rng.uniform(0.004, 0.03) * env * voice).astype(np.float32)
+    return sig, np.array(starts)
+
+
+def jump_frames(available_at, starts, window=0.35):
+    """For each shout, latency until the first game frame that sees a jump trigger after it."""
+    lat = []
+    for s in starts:
+        hits = available_at[(available_at >= s) & (available_at < s + window)]
+        if len(hits):
+            frame = math.ceil(hits[0] / FRAME_DT) * FRAME_DT
+            lat.append(frame - s)
+        else:
+            lat.append(np.nan)
+    return np.array(lat)
+
+
+def legacy(sig, starts, block=1024):
+    avail = []
+    for i in range(0, len(sig) - block + 1, block):
+        rms = math.sqrt(float(np.mean(sig[i:i + block].astype(np.float64) ** 2)))
+        block_end = (i + block) / SAMPLE_RATE
+        if (rms - VOLUME_THRESHOLD) * VOLUME_SENSITIVITY > 1.0:
+            # 游戏在下一帧读到该块的 RMS，但下一块到来之前只保留这一份
+            next_frame = math.ceil(block_end / FRAME_DT) * FRAME_DT
+            if next_frame < block_end + block / SAMPLE_RATE:
+                avail.append(block_end)
+    return jump_frames(np.array(avail), starts)
+
+
+def onset(sig, starts, hop):
+    det = VoiceOnsetDetector(SAMPLE_RATE, hop=hop, window=2 * hop, level_threshold=VOLUME_THRESHOLD)
+    avail = []
+    for i in range(0, len(sig) - hop + 1, hop):
+        t_end = (i + hop) / SAMPLE_RATE
+        det.process(sig[i:i + hop], t_end)
+        for ev in det.events.pop_all():
+            if (ev["level"] - VOLUME_THRESHOLD) * VOLUME_SENSITIVITY > 1.0:
+                avail.append(t_end)
+    return jump_frames(np.array(avail), starts)
+
+
+def report(name, lat):
+    ok = lat[~np.isnan(lat)] * 1000
+    print(f"{name:<22} detected {len(ok)}/{len(lat)}   latency mean {ok.mean():6.1f} ms   "
+          f"p50 {np.percentile(ok, 50):6.1f}   p95 {np.percentile(ok, 95):6.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shouts", type=int, default=200)
+    parser.add_argument("--hop", type=int, default=128)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sig, starts = make_signal(np.random.default_rng(args.seed), args.shouts)
+    report("legacy block RMS", legacy(sig, starts))
+    report(f"onset hop={args.hop}", onset(sig, starts, args.hop))
+
+
+if __name__ == "__main__":
+    main()
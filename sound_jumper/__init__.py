@@ -0,0 +1 @@
+"""Support modules shared by ``sound_jumper_prototype.py`` and ``src/backup_script.py``."""
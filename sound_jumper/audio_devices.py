@@ -0,0 +1,221 @@
+"""Background audio input device manager.
+
+Opening/closing a PortAudio stream can take hundreds of milliseconds on some USB
+interfaces, and ``sd.query_devices()`` only reflects the devices present when
+PortAudio was initialised.  All of that runs on a worker thread here.  Even
+``import sounddevice`` (which loads PortAudio) happens on that thread.  The
+render loop owns ``selected`` and ``devices``: the worker hands each scan back
+through a queue, and ``update()`` applies it on the main thread.
+
+Devices are only re-enumerated on request (a hot-plug event or the user asking)
+or after the open stream fails.  Seeing new devices means re-initialising
+PortAudio, which interrupts capture briefly, so it is never done on a timer.
+
+Switching opens and starts the new stream first, then stops the old one and only
+then lets the new stream's callback through, so the audio callback never runs on
+two streams at once (the voice rings have exactly one writer).  If the new device
+will not open, capture stays on the old one (or falls back to the system default),
+``error`` says why, and ``update()`` moves the selection back.
+"""
+import queue
+import threading
+
+sd = None   # sounddevice 在工作线程里才导入（加载 PortAudio 较慢，不挡住第一帧）
+
+
+class AudioDeviceManager:
+    def __init__(self, callback, samplerate, blocksize, channels=1):
+        self.callback = callback
+        self.samplerate = samplerate
+        self.blocksize = blocksize
+        self.channels = channels
+
+        self.devices = []          # 输入设备列表（只由主线程整体替换）
+        self.selected = 0          # UI 选中的位置（只由主线程修改）
+        self.active_name = None    # 正在采集的设备名
+        self.scanned = False
+        self.error = None
+
+        self._target = None        # 主线程想要采集的设备；工作线程只读
+        self._results = queue.SimpleQueue()   # 工作线程 -> 主线程：("devices", 列表) / ("failed", 设备)
+        self._known = []           # 工作线程最近一次枚举的结果
+        self._failed = None        # 打不开的设备；重新枚举之前不再重试
+        self._failed_name = None   # 主线程：打不开、也没有可退回的设备时，不再显示“切换中”
+        self._initialized = False  # PortAudio 已初始化过，之后的枚举要先重新初始化
+        self._stream = None
+        self._stream_device = None
+        self._live = None
+        self._rescan = True
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="audio-devices", daemon=True)
+
+    # ---------- render-loop side ----------
+    def start(self):
+        self._thread.start()
+        return self
+
+    def select(self, position):
+        self.selected = position
+        devices = self.devices
+        self._target = devices[position % len(devices)] if devices else None
+        self._wake.set()
+
+    def step(self, delta):
+        devices = self.devices
+        if devices:
+            self.select((self.selected + delta) % len(devices))
+
+    def update(self):
+        """Apply finished scans and failed switches from the worker.  A scan keeps the selection
+        on the same device by name; a device that would not open puts the selection back on
+        the one still capturing.  Call once per frame from the render loop."""
+        while True:
+            try:
+                kind, value = self._results.get_nowait()
+            except queue.Empty:
+                return
+            if kind == "devices":
+                keep = self.selected_name()
+                names = [d["name"] for d in value]
+                if keep in names:
+                    position = names.index(keep)
+                else:
+                    position = min(self.selected, max(len(value) - 1, 0))
+                self.devices = value
+                self.scanned = True
+                self._failed_name = None
+                self.select(position)
+            elif value["name"] == self.selected_name():
+                names = [d["name"] for d in self.devices]
+                if self.active_name in names:
+                    self.select(names.index(self.active_name))
+                else:
+                    self._failed_name = value["name"]
+
+    def request_rescan(self):
+        """Re-enumerate devices, e.g. after a hot-plug event; briefly interrupts capture."""
+        self._rescan = True
+        self._wake.set()
+
+    def selected_name(self):
+        devices = self.devices
+        if not devices:
+            return None
+        return devices[self.selected % len(devices)]["name"]
+
+    @property
+    def switching(self):
+        name = self.selected_name()
+        return name is not None and name != self.active_name and name != self._failed_name
+
+    def close(self, timeout=2.0):
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        self._close_stream()
+
+    # ---------- worker ----------
+    def _run(self):
+        global sd
+        if sd is None:
+            try:
+                import sounddevice as sd
+            except Exception as e:
+                self.error = f"{e}"
+                print(f"音频错误: {e}")
+                self._results.put(("devices", []))
+                return
+        while not self._stop.is_set():
+            if self._rescan:
+                self._rescan = False
+                self._scan()
+            self._sync()
+            self._wake.wait()
+            self._wake.clear()
+
+    def _scan(self):
+        if self._initialized and hasattr(sd, "_terminate"):
+            # PortAudio 只在初始化时枚举设备：重新初始化才能看到热插拔的麦克风，
+            # 这会使已打开的流失效，所以先关掉，_sync 会按名字重新打开
+            self._close_stream()
+            try:
+                sd._terminate()
+                sd._initialize()
+            except Exception as e:
+                self.error = f"{e}"
+        self._initialized = True
+        try:
+            devices = [d for d in sd.query_devices() if d["max_input_channels"] > 0]
+        except Exception as e:
+            self.error = f"{e}"
+            devices = []
+        self._known = devices
+        self._failed = None
+        self._results.put(("devices", devices))
+
+    def _sync(self):
+        target = self._target
+        # 重新枚举后设备编号可能变了：等主线程按名字换好目标再开流
+        if target is None or target not in self._known or target == self._failed:
+            return
+        if self._stream is not None and self._stream_device == target["index"]:
+            return
+        if self._open(target) or self._stream is not None:
+            return
+        # 没有旧流可以继续用：退回系统默认输入设备
+        try:
+            default = sd.default.device[0]
+        except Exception:
+            default = None
+        error = self.error
+        for device in self._known:
+            if device["index"] == default and device != target:
+                self._open(device)
+                break
+        self.error = error        # 退回成功也要让界面看到选中的设备为什么没打开
+
+    def _open(self, device):
+        token = object()
+
+        def gated_callback(indata, frames, time_info, status):
+            if self._live is token:
+                self.callback(indata, frames, time_info, status)
+
+        def finished():
+            # 不是我们关掉的（设备被拔掉、驱动出错）：重新初始化 PortAudio，再按名字重开
+            if self._live is token:
+                self.request_rescan()
+
+        try:
+            stream = sd.InputStream(channels=self.channels, samplerate=self.samplerate, blocksize=self.blocksize,
+                                    callback=gated_callback, finished_callback=finished, device=device["index"])
+            stream.start()
+        except Exception as e:
+            self.error = f"{device['name']}: {e}"
+            print(f"音频错误: {e}")
+            self._failed = device
+            self._results.put(("failed", device))
+            return False
+        # 新流已预热；停掉旧流（stop 会等待其回调结束）后再放行新流的回调
+        self._close_stream()
+        self._stream = stream
+        self._stream_device = device["index"]
+        self._live = token
+        self.active_name = device["name"]
+        self.error = None
+        print(f"音频流已在设备上启动: {device['name']}")
+        return True
+
+    def _close_stream(self):
+        stream = self._stream
+        self._stream = None
+        self._stream_device = None
+        self._live = None
+        self.active_name = None
+        if stream is not None:
+            try:
+                stream.stop()
+                stream.close()
+            except Exception:
+                pass
@@ -0,0 +1,177 @@
+"""Camera discovery: concurrent probing, capture properties and a cached device profile.
+
+Opening a ``cv2.VideoCapture`` and reading its first frame can take a second
+per device, and a network stream with a wrong URL can block far longer.  Every
+candidate (camera index or stream URL) is probed on its own thread here and
+all of them share one deadline; probes still running past it are abandoned and
+release their device when they eventually return.  The best camera that
+answered (resolution, then frame rate, then candidate order) wins.
+
+The winner's profile is saved in the user cache.  On the next launch that
+device alone is tried first, so a known kiosk opens its camera without probing
+the others.
+"""
+import json
+import os
+import threading
+import time
+
+import cv2
+
+from .paths import cache_dir
+
+PROFILE_FILE = "camera_profile.json"
+
+
+def fourcc_name(code):
+    code = int(code)
+    return "".join(chr((code >> 8 * i) & 0xFF) for i in range(4)).strip("\0 ")
+
+
+def open_capture(source, width=None, height=None, fps=None, fourcc="MJPG", buffer_size=1, timeout=None):
+    """``cv2.VideoCapture`` for an index or a stream URL with the capture properties applied.
+
+    MJPG lets USB cameras deliver 720p/1080p at full rate, and a one-frame buffer
+    keeps ``read()`` from returning stale frames when the game falls behind.
+    Size, rate and format only apply to local cameras; ``timeout`` only to URLs.
+    """
+    if isinstance(source, str):
+        params = []
+        if timeout and hasattr(cv2, "CAP_PROP_OPEN_TIMEOUT_MSEC"):
+            ms = int(timeout * 1000)
+            params = [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, ms, cv2.CAP_PROP_READ_TIMEOUT_MSEC, ms]
+        cap = cv2.VideoCapture(source, cv2.CAP_FFMPEG, params) if params else cv2.VideoCapture(source)
+    else:
+        cap = cv2.VideoCapture(source)
+        if cap.isOpened():
+            # FOURCC 要在设置分辨率之前，部分驱动只在 MJPG 下提供高分辨率
+            if fourcc:
+                cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+            if width:
+                cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            if height:
+                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            if fps:
+                cap.set(cv2.CAP_PROP_FPS, fps)
+    if cap.isOpened() and buffer_size:
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+    return cap
+
+
+class CameraProbe:
+    """An opened, configured capture that delivered a frame."""
+    __slots__ = ("source", "cap", "width", "height", "fps", "fourcc", "seconds")
+
+    def __init__(self, source, cap, width, height, fps, fourcc, seconds):
+        self.source = source
+        self.cap = cap
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.fourcc = fourcc
+        self.seconds = seconds      # 打开并读到第一帧用了多久
+
+    @property
+    def frame_shape(self):
+        return (self.height, self.width, 3)
+
+    def profile(self):
+        return {"source": self.source, "width": self.width, "height": self.height, "fps": self.fps,
+                "fourcc": self.fourcc}
+
+    def __repr__(self):
+        return (f"{self.source!r} {self.width}x{self.height} @ {self.fps:g} fps {self.fourcc} "
+                f"({self.seconds * 1000:.0f} ms)")
+
+
+def probe_camera(source, timeout=None, **settings):
+    """Open ``source``, apply ``settings`` and read one frame; a ``CameraProbe`` or None."""
+    t0 = time.perf_counter()
+    cap = open_capture(source, timeout=timeout, **settings)
+    if cap.isOpened():
+        ok, frame = cap.read()
+        if ok and frame is not None:
+            h, w = frame.shape[:2]
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            return CameraProbe(source, cap, w, h, fps if fps == fps and fps > 0 else 0.0,
+                               fourcc_name(cap.get(cv2.CAP_PROP_FOURCC)), time.perf_counter() - t0)
+    cap.release()
+    return None
+
+
+def discover_cameras(sources, timeout=3.0, **settings):
+    """Probe every source concurrently and return the best ``CameraProbe`` (others released), or None."""
+    sources = list(sources)
+    results = {}
+    lock = threading.Lock()
+    finished = threading.Event()
+    abandoned = []
+
+    def run(position, source):
+        try:
+            probe = probe_camera(source, timeout, **settings)
+        except Exception as e:
+            print(f"摄像头 {source!r} 探测出错: {e}")
+            probe = None
+        with lock:
+            if abandoned:
+                # 超时后才返回：没人要了，释放设备
+                if probe is not None:
+                    probe.cap.release()
+                return
+            results[position] = probe
+            if len(results) == len(sources):
+                finished.set()
+
+    # 守护线程而不是线程池：卡住的探测（比如连不上的网络地址）不会拖住程序退出
+    for position, source in enumerate(sources):
+        threading.Thread(target=run, args=(position, source), name=f"camera-probe-{source}", daemon=True).start()
+    finished.wait(timeout)
+    with lock:
+        abandoned.append(True)
+        found = [(position, probe) for position, probe in results.items() if probe is not None]
+    if not found:
+        return None
+
+    wanted = (settings.get("width") or 0) * (settings.get("height") or 0)
+
+    def score(item):
+        position, probe = item
+        area = probe.width * probe.height
+        return min(area, wanted) if wanted else area, probe.fps, -position
+
+    best = max(found, key=score)[1]
+    for _, probe in found:
+        if probe is not best:
+            probe.cap.release()
+    return best
+
+
+def load_profile():
+    try:
+        with open(os.path.join(cache_dir(), PROFILE_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_profile(probe):
+    try:
+        with open(os.path.join(cache_dir(), PROFILE_FILE), "w") as f:
+            json.dump(probe.profile(), f)
+    except OSError as e:
+        print(f"摄像头配置保存失败: {e}")
+
+
+def find_camera(sources, timeout=3.0, use_cache=True, **settings):
+    """Open the cached camera if it is still among ``sources`` and answers, else discover and cache the winner."""
+    sources = list(sources)
+    profile = load_profile() if use_cache else None
+    probe = None
+    if profile is not None and profile.get("source") in sources:
+        probe = discover_cameras([profile["source"]], timeout, **settings)
+    if probe is None:
+        probe = discover_cameras(sources, timeout, **settings)
+    if probe is not None and use_cache and probe.profile() != profile:
+        save_profile(probe)
+    return probe
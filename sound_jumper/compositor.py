@@ -0,0 +1,54 @@
+"""Camera background compositing into preallocated buffers.
+
+The old path allocated a full-screen array in ``cv2.resize``, another in
+``cv2.addWeighted``, copied it again with ``tobytes()`` and wrapped that in a
+fresh Surface every frame.  Here every OpenCV call writes into a buffer that
+lives as long as the compositor, and ``surface`` is a pygame Surface sharing
+that buffer's memory, so nothing is allocated or copied per frame.
+"""
+import cv2
+import numpy as np
+import pygame
+
+
+class BackgroundCompositor:
+    """Blends camera frames with the game background at ``scale`` x screen resolution."""
+
+    def __init__(self, screen_size, scale=1.0, game_bg=None, camera_weight=0.7, background_weight=0.3,
+                 smooth=False):
+        self.screen_size = tuple(screen_size)
+        self.size = (max(1, int(screen_size[0] * scale)), max(1, int(screen_size[1] * scale)))
+        self.camera_weight = camera_weight
+        self.background_weight = background_weight
+        self.smooth = smooth
+
+        w, h = self.size
+        self.buffer = np.zeros((h, w, 3), np.uint8)
+        if game_bg is not None:
+            self.game_bg = cv2.resize(game_bg, self.size, interpolation=cv2.INTER_AREA)
+            self._resized = np.empty_like(self.buffer)
+        else:
+            self.game_bg = None
+            self._resized = self.buffer
+        # Surface 与 self.buffer 共用同一块内存，写 buffer 即更新 Surface
+        self.surface = pygame.image.frombuffer(self.buffer, self.size, "RGB")
+        self._scaled = None
+        if self.size != self.screen_size:
+            self._scaled = pygame.Surface(self.screen_size, 0, self.surface)
+
+    def update(self, frame):
+        """Composite one BGR camera frame in place."""
+        cv2.resize(frame, self.size, dst=self._resized, interpolation=cv2.INTER_LINEAR)
+        if self.game_bg is not None:
+            cv2.addWeighted(self._resized, self.camera_weight, self.game_bg, self.background_weight, 0,
+                            dst=self.buffer)
+
+    def blit_to(self, screen):
+        if self._scaled is None:
+            screen.blit(self.surface, (0, 0))
+            return
+        if self.smooth:
+            pygame.transform.smoothscale(self.surface, self.screen_size, self._scaled)
+        else:
+            pygame.transform.scale(self.surface, self.screen_size, self._scaled)
+        screen.blit(self._scaled, (0, 0))
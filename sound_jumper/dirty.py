@@ -0,0 +1,75 @@
+"""Dirty-rectangle presentation for frames drawn over a static background.
+
+Without a camera the backdrop never changes, yet every frame used to fill the
+screen, alpha-blend a full-screen dim layer over it and flip the whole
+surface.  Here the dimmed backdrop is composited once.  Each frame only the
+areas drawn on the previous frame are restored from it, every draw call's
+rect is passed to ``add``, and ``present`` hands just those rects (old and
+new) to ``pygame.display.update``.
+
+While ``active`` is False (a camera background changes every frame) the caller
+draws its own background and ``present`` is a plain ``flip``.
+"""
+import pygame
+
+
+class DirtyRenderer:
+    def __init__(self, screen, background):
+        self.screen = screen
+        self.background = background
+        self.bounds = screen.get_rect()
+        self.active = False
+        self.dirty_area = 0        # 上一帧更新的像素数（重叠部分按多次计）
+        self._previous = []
+        self._current = []
+        self._full = True
+
+    def set_active(self, active):
+        if active != self.active:
+            self.active = active
+            self._full = True
+
+    def invalidate(self):
+        """Redraw and present the whole screen on the next frame (window exposed, mode switch...)."""
+        self._full = True
+
+    def begin(self):
+        """Erase last frame's drawing by restoring the background under it."""
+        self._current = []
+        if not self.active:
+            return
+        if self._full:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for rect in self._previous:
+                self.screen.blit(self.background, rect, rect)
+
+    def add(self, rect):
+        """Track a rect returned by ``blit`` / ``pygame.draw.*``; returns it unchanged."""
+        if rect is not None and self.active:
+            clipped = rect.clip(self.bounds)
+            if clipped.w and clipped.h:
+                self._current.append(clipped)
+        return rect
+
+    def extend(self, rects):
+        """``add`` for every rect returned by ``Surface.blits``."""
+        if rects and self.active:
+            bounds, current = self.bounds, self._current
+            for rect in rects:
+                clipped = rect.clip(bounds)
+                if clipped.w and clipped.h:
+                    current.append(clipped)
+
+    def present(self):
+        if not self.active or self._full:
+            pygame.display.flip()
+            self._full = False
+            self.dirty_area = self.bounds.w * self.bounds.h
+        else:
+            rects = self._previous + self._current
+            if rects:
+                pygame.display.update(rects)
+            self.dirty_area = sum(r.w * r.h for r in rects)
+        self._previous = self._current
+        self._current = []
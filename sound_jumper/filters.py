@@ -0,0 +1,125 @@
+"""Smoothing / prediction filters for a tracked landmark coordinate.
+
+Every filter takes timestamped measurements with ``update(t, x)`` and answers
+``predict(t)`` for any later time: that's how the game asks where the hand
+will be when the frame it is about to draw reaches the screen, rather than
+where the camera saw it one pipeline delay ago.  ``reset()`` forgets the track
+(hand lost).
+
+* ``PassThrough``   - last measurement, no smoothing (the old behaviour)
+* ``OneEuroFilter`` - speed-adaptive low-pass (Casiez et al. 2012): heavy
+  smoothing while the hand is still, little lag while it moves
+* ``KalmanFilter``  - constant-velocity Kalman filter
+"""
+import math
+
+
+class LandmarkFilter:
+    def __init__(self, max_horizon=0.2, still_speed=0.3):
+        self.max_horizon = max_horizon  # 最多向前预测多少秒
+        self.still_speed = still_speed  # 低于这个速度（屏幕宽/秒）时预测逐渐关闭，手静止时不放大抖动
+        self.reset()
+
+    def reset(self):
+        self.t = None
+        self.x = None
+        self.v = 0.0
+
+    @property
+    def ready(self):
+        return self.t is not None
+
+    def update(self, t, x):
+        raise NotImplementedError
+
+    def predict(self, t):
+        if self.t is None:
+            return None
+        v = self.v
+        if self.still_speed:
+            v *= v * v / (v * v + self.still_speed * self.still_speed)
+        return self.x + v * max(0.0, min(t - self.t, self.max_horizon))
+
+
+class PassThrough(LandmarkFilter):
+    def predict(self, t):
+        return self.x
+
+    def update(self, t, x):
+        self.t, self.x = t, x
+        return x
+
+
+def _smoothing(cutoff, dt):
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter(LandmarkFilter):
+    """``min_cutoff`` (Hz) sets jitter at rest; ``beta`` how fast the cutoff opens up with speed
+    (coordinates are normalised 0~1, so speeds are in screen widths per second)."""
+
+    def __init__(self, min_cutoff=1.0, beta=30.0, d_cutoff=3.0, max_horizon=0.2, still_speed=0.3):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        super().__init__(max_horizon, still_speed)
+
+    def update(self, t, x):
+        if self.t is None:
+            self.t, self.x, self.v = t, x, 0.0
+            return x
+        if t <= self.t:
+            return self.x
+        dt = t - self.t
+        dx = (x - self.x) / dt
+        self.v += _smoothing(self.d_cutoff, dt) * (dx - self.v)
+        cutoff = self.min_cutoff + self.beta * abs(self.v)
+        self.x += _smoothing(cutoff, dt) * (x - self.x)
+        self.t = t
+        return self.x
+
+
+class KalmanFilter(LandmarkFilter):
+    """State (x, v).  ``accel_noise`` is the white-acceleration density (units/s^2) and
+    ``measurement_noise`` the landmark's standard deviation."""
+
+    def __init__(self, accel_noise=4.0, measurement_noise=0.003, max_horizon=0.2, still_speed=0.3):
+        self.q = accel_noise ** 2
+        self.r = measurement_noise ** 2
+        super().__init__(max_horizon, still_speed)
+
+    def reset(self):
+        super().reset()
+        self.p = None
+
+    def update(self, t, x):
+        if self.t is None:
+            self.t, self.x, self.v = t, x, 0.0
+            self.p = [[self.r, 0.0], [0.0, 1.0]]   # 初始速度未知
+            return x
+        dt = max(t - self.t, 1e-6)
+        (p00, p01), (p10, p11) = self.p
+        q = self.q
+        # 预测: x += v*dt, P = F P F^T + Q
+        px = self.x + self.v * dt
+        p00, p01, p10, p11 = (p00 + dt * (p01 + p10) + dt * dt * p11 + q * dt ** 3 / 3,
+                              p01 + dt * p11 + q * dt ** 2 / 2,
+                              p10 + dt * p11 + q * dt ** 2 / 2,
+                              p11 + q * dt)
+        # 更新（只观测 x）
+        s = p00 + self.r
+        k0, k1 = p00 / s, p10 / s
+        innovation = x - px
+        self.x = px + k0 * innovation
+        self.v += k1 * innovation
+        self.p = [[(1 - k0) * p00, (1 - k0) * p01], [p10 - k1 * p00, p11 - k1 * p01]]
+        self.t = t
+        return self.x
+
+
+FILTERS = {"none": PassThrough, "one_euro": OneEuroFilter, "kalman": KalmanFilter}
+
+
+def make_filter(kind="kalman", **kwargs):
+    return FILTERS[kind](**kwargs)
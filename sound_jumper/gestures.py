@@ -0,0 +1,125 @@
+"""Skill-hand gesture classification on landmark arrays.
+
+``classify_hand`` reads the live hand's landmark fields directly in plain
+Python: for one hand of 21 points that is several times cheaper than building
+an array and running a dozen tiny NumPy operations.  ``classify_points`` runs
+the same tests on ``(..., 21, 3)`` arrays, with every finger at once, for
+offline evaluation of whole batches.
+
+A finger counts as extended when its tip is clearly farther from the wrist than
+its PIP joint, and the thumb when it is nearly straight (CMC-to-tip distance
+close to the length of its three segments).  Both tests only use distances, so
+they hold for a tilted hand and for either handedness; they replace the two
+scripts' diverging ``count_extended_fingers`` (thumb tip vs landmark 2 on x in
+one, vs landmark 3 on y in the other).
+
+``GestureDebouncer`` turns the per-frame labels into a stable one with a
+majority vote over the last few detections, so a single misread frame can no
+longer fire SHIELD or BLAST.
+"""
+import math
+
+import numpy as np
+
+GESTURES = ("NONE", "UNKNOWN", "PALM", "FIST", "VICTORY")
+NONE, UNKNOWN, PALM, FIST, VICTORY = range(len(GESTURES))
+GESTURE_CODES = {name: i for i, name in enumerate(GESTURES)}
+
+WRIST = 0
+TIPS = [4, 8, 12, 16, 20]
+PIPS = [3, 6, 10, 14, 18]
+THUMB = [1, 2, 3, 4]           # CMC, MCP, IP, TIP
+_JOINTS = TIPS + PIPS
+FINGER_RATIO = 1.1             # 指尖到手腕要比 PIP 远这么多倍才算伸直
+THUMB_STRAIGHTNESS = 0.86      # 拇指 CMC 到指尖的直线距离 / 三节长度之和
+
+
+def landmarks_to_array(hand_landmarks):
+    """``(21, 3)`` float32 array of a MediaPipe hand's normalised (x, y, z)."""
+    return np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark], np.float32)
+
+
+def finger_extension(points, finger_ratio=FINGER_RATIO, thumb_straightness=THUMB_STRAIGHTNESS):
+    """Extended flags (thumb, index, middle, ring, pinky) for ``(..., 21, 3)`` landmarks."""
+    xy = points[..., :2]
+    d = xy[..., _JOINTS, :] - xy[..., WRIST:WRIST + 1, :]
+    d2 = (d * d).sum(axis=-1)                       # 指尖 / PIP 到手腕距离的平方
+    extended = d2[..., :5] > d2[..., 5:] * (finger_ratio * finger_ratio)
+
+    thumb = xy[..., THUMB, :]
+    seg = thumb[..., 1:, :] - thumb[..., :-1, :]
+    path = np.sqrt((seg * seg).sum(axis=-1)).sum(axis=-1)
+    chord = seg.sum(axis=-2)
+    extended[..., 0] = np.sqrt((chord * chord).sum(axis=-1)) > path * thumb_straightness
+    return extended
+
+
+def classify_extension(extended):
+    """Gesture codes for ``(..., 5)`` extension flags."""
+    count = extended.sum(axis=-1)
+    victory = extended[..., 1] & extended[..., 2] & ~(extended[..., 3] | extended[..., 4])
+    return np.where(count >= 4, PALM, np.where(count <= 1, FIST, np.where(victory, VICTORY, UNKNOWN)))
+
+
+def classify_points(points):
+    """Gesture codes for ``(..., 21, 3)`` landmarks."""
+    return classify_extension(finger_extension(points))
+
+
+def classify_hand(hand_landmarks, finger_ratio=FINGER_RATIO, thumb_straightness=THUMB_STRAIGHTNESS):
+    """Per-frame label ("PALM", "FIST", "VICTORY" or "UNKNOWN") of one MediaPipe hand; the same
+    tests as ``classify_points``, on the landmark fields directly."""
+    lm = hand_landmarks.landmark
+    wrist = lm[WRIST]
+    wx, wy = wrist.x, wrist.y
+    ratio2 = finger_ratio * finger_ratio
+    extended = []
+    for tip, pip in zip(TIPS, PIPS):
+        t, p = lm[tip], lm[pip]
+        extended.append((t.x - wx) ** 2 + (t.y - wy) ** 2 > ((p.x - wx) ** 2 + (p.y - wy) ** 2) * ratio2)
+    cmc, mcp, ip, tip = (lm[i] for i in THUMB)
+    path = (math.hypot(mcp.x - cmc.x, mcp.y - cmc.y) + math.hypot(ip.x - mcp.x, ip.y - mcp.y)
+            + math.hypot(tip.x - ip.x, tip.y - ip.y))
+    extended[0] = math.hypot(tip.x - cmc.x, tip.y - cmc.y) > path * thumb_straightness
+
+    count = sum(extended)
+    if count >= 4:
+        return "PALM"
+    if count <= 1:
+        return "FIST"
+    if extended[1] and extended[2] and not (extended[3] or extended[4]):
+        return "VICTORY"
+    return "UNKNOWN"
+
+
+class GestureDebouncer:
+    """Majority vote with hysteresis over the last ``window`` per-frame labels.
+
+    The output switches to a new label once it has ``enter_votes`` votes in the window,
+    and only if the current label has dropped below ``stay_votes``.
+    """
+
+    def __init__(self, window=4, enter_votes=3, stay_votes=2):
+        self.window = window
+        self.enter_votes = enter_votes
+        self.stay_votes = stay_votes
+        self.reset()
+
+    def reset(self):
+        self._codes = np.full(self.window, NONE, np.intp)
+        self._i = 0
+        self.stable = NONE
+
+    @property
+    def label(self):
+        return GESTURES[self.stable]
+
+    def update(self, label):
+        """Push this frame's label (``"NONE"`` = no gesture hand) and return the debounced label."""
+        self._codes[self._i % self.window] = GESTURE_CODES[label]
+        self._i += 1
+        votes = np.bincount(self._codes, minlength=len(GESTURES))
+        best = int(np.argmax(votes))
+        if best != self.stable and votes[best] >= self.enter_votes and votes[self.stable] < self.stay_votes:
+            self.stable = best
+        return GESTURES[self.stable]
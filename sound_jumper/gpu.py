@@ -0,0 +1,117 @@
+"""Optional hardware-composited presentation through ``pygame._sdl2.video``.
+
+On the software path the whole screen is a CPU surface.  With a camera, every
+frame is resized and blended with the game background by OpenCV, blitted full
+screen, dimmed with a full-screen alpha blit and flipped.  At 4K that fill
+rate is most of the frame.
+
+``GpuRenderer`` moves all of that to an SDL ``Renderer``:
+
+* each camera frame is uploaded once, as is, into a streaming texture.  The
+  GPU scales it and blends it over the game background texture
+  (``camera_weight``).
+* the dim layer is one blended ``fill_rect``.
+* the game still draws sprites and HUD with ordinary pygame calls, onto
+  ``screen``: a transparent surface at the *logical* resolution.  Only the
+  rects drawn this frame and last frame are cleared and uploaded into the
+  overlay texture, which is drawn on top.
+
+The renderer scales the logical resolution to the window.  A 4K kiosk can
+therefore run the game, and its CPU drawing, at 1080p.
+
+It keeps ``DirtyRenderer``'s interface (``begin``/``add``/``extend``/
+``present``), so the game loop does not care which one it has.  ``active`` is
+always True: the game never draws its own background.
+"""
+import os
+
+import pygame
+from pygame._sdl2.video import Renderer, Texture, Window
+
+from .dirty import DirtyRenderer
+
+BLEND = 1          # SDL_BLENDMODE_BLEND
+# 与 BackgroundCompositor 一致：OpenCV 的 BGR 数据按 "RGB" 交给 pygame，两种后端画面完全一样
+FRAME_FORMAT = "RGB"
+
+
+class GpuRenderer(DirtyRenderer):
+    def __init__(self, logical_size, window_size=None, title="", fullscreen=True, vsync=True,
+                 clear_color=(20, 20, 30), dim_alpha=100, camera_weight=0.7):
+        os.environ.setdefault("SDL_RENDER_SCALE_QUALITY", "1")   # 逻辑分辨率放大时用线性插值
+        self.logical_size = tuple(logical_size)
+        self.window = Window(title, size=tuple(window_size or logical_size), fullscreen_desktop=fullscreen)
+        self.renderer = Renderer(self.window, vsync=vsync)
+        self.renderer.logical_size = self.logical_size
+        self.clear_color = clear_color
+        self.dim_alpha = dim_alpha
+        self.camera_weight = camera_weight
+
+        super().__init__(pygame.Surface(self.logical_size, pygame.SRCALPHA), None)
+        self.active = True
+        self._overlay = Texture(self.renderer, self.logical_size, streaming=True)
+        self._overlay.blend_mode = BLEND
+        self._background = None
+        self._camera = None
+        self._camera_ready = False
+
+    def set_active(self, active):
+        pass
+
+    def set_background(self, image):
+        """Game background (OpenCV image or Surface) that the camera frame is blended over; None clears it."""
+        if image is None:
+            self._background = None
+            return
+        if not isinstance(image, pygame.Surface):
+            image = pygame.image.frombuffer(image, image.shape[1::-1], FRAME_FORMAT)
+        self._background = Texture.from_surface(self.renderer, image)
+
+    def set_camera_frame(self, frame):
+        """Upload one camera frame (OpenCV image); it is scaled to the screen by the GPU."""
+        h, w = frame.shape[:2]
+        if self._camera is None or (self._camera.width, self._camera.height) != (w, h):
+            self._camera = Texture(self.renderer, (w, h), streaming=True)
+        # frombuffer 只是包一层，不复制；update 把这一帧直接拷进纹理
+        self._camera.update(pygame.image.frombuffer(frame, (w, h), FRAME_FORMAT))
+        self._camera_ready = True
+
+    def begin(self):
+        self._current = []
+        if self._full:
+            self.screen.fill((0, 0, 0, 0))
+        else:
+            for rect in self._previous:
+                self.screen.fill((0, 0, 0, 0), rect)
+
+    def present(self):
+        overlay, screen = self._overlay, self.screen
+        if self._full:
+            overlay.update(screen)
+            self._full = False
+            self.dirty_area = self.bounds.w * self.bounds.h
+        else:
+            rects = self._previous + self._current
+            for rect in rects:
+                overlay.update(screen.subsurface(rect), rect)
+            self.dirty_area = sum(r.w * r.h for r in rects)
+        self._previous = self._current
+        self._current = []
+
+        r = self.renderer
+        r.draw_color = (*self.clear_color, 255)
+        r.clear()
+        if self._camera_ready:
+            if self._background is not None:
+                self._background.draw(dstrect=self.bounds)
+                self._camera.blend_mode = BLEND
+                self._camera.alpha = int(self.camera_weight * 255)
+            self._camera.draw(dstrect=self.bounds)
+        r.draw_blend_mode = BLEND
+        r.draw_color = (0, 0, 0, self.dim_alpha)
+        r.fill_rect(self.bounds)
+        overlay.draw(dstrect=self.bounds)
+        r.present()
+
+    def close(self):
+        self.window.destroy()
@@ -0,0 +1,138 @@
+"""Cached HUD rendering: text surfaces and skill panels are rendered once and reused."""
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+
+class TextCache:
+    """LRU cache of ``font.render`` results keyed by (font, text, color)."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surf = self._entries.get(key)
+        if surf is not None:
+            self._entries.move_to_end(key)
+            return surf
+        surf = font.render(text, True, color)
+        self._entries[key] = surf
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return surf
+
+
+class CachedText:
+    """A single label that is only re-rendered when its text changes (e.g. the score)."""
+
+    def __init__(self, font, color):
+        self.font = font
+        self.color = color
+        self._text = None
+        self._surface = None
+
+    def get(self, text):
+        if text != self._text:
+            self._text = text
+            self._surface = self.font.render(text, True, self.color)
+        return self._surface
+
+
+class SkillPanel:
+    """Pre-composited skill box: background, border, name and cooldown/READY label.
+
+    The panel is rebuilt only when the label changes, i.e. every 0.1 s of cooldown.
+    """
+
+    def __init__(self, font, name, color, size=(220, 50), text_y=15, name_x=10, label_x=160):
+        self.font = font
+        self.color = color
+        self.size = size
+        self.text_y = text_y
+        self.label_x = label_x
+        self.name_x = name_x
+        self._name_surf = font.render(name, True, color)
+        self._label = None
+        self._surface = None
+
+    def get(self, remaining):
+        label = f"{remaining:.1f}s" if remaining > 0 else "READY"
+        if label != self._label:
+            self._label = label
+            self._surface = self._build(label, remaining > 0)
+        return self._surface
+
+    def _build(self, label, cooling_down):
+        label_surf = self.font.render(label, True, (150, 150, 150) if cooling_down else (255, 255, 255))
+        w, h = self.size
+        # 文字可能超出面板宽度，Surface 按内容放宽，但背景框仍是 size 大小
+        surf = pygame.Surface((max(w, self.label_x + label_surf.get_width()), h), pygame.SRCALPHA)
+        box = pygame.Rect(0, 0, w, h)
+        surf.fill((30, 30, 40, 100 if cooling_down else 255), box)
+        pygame.draw.rect(surf, self.color, box, 2)
+        surf.blit(self._name_surf, (self.name_x, self.text_y))
+        surf.blit(label_surf, (self.label_x, self.text_y))
+        return surf
+
+
+class ProfilerOverlay:
+    """Per-stage p50/p95/p99 table plus a frame-time graph for a ``FrameProfiler``.
+
+    The table is re-rendered ``refresh`` times per second, not every frame; the graph is
+    a single ``draw.lines`` call over the rolling frame times.
+    """
+
+    def __init__(self, profiler, font, pos=(20, 20), refresh=0.25, graph_size=(360, 90), budget_ms=1000 / 60):
+        self.profiler = profiler
+        self.font = font
+        self.pos = pos
+        self.refresh = refresh
+        self.graph_size = graph_size
+        self.budget_ms = budget_ms
+        self.visible = False
+        self._table = None
+        self._next_refresh = 0.0
+
+    def toggle(self):
+        self.visible = not self.visible
+        self._next_refresh = 0.0
+
+    def draw(self, screen, now):
+        """Draw the overlay; returns the screen area it covers (None while hidden)."""
+        if not self.visible:
+            return None
+        if now >= self._next_refresh:
+            self._next_refresh = now + self.refresh
+            self._table = self._build_table()
+        x, y = self.pos
+        table = screen.blit(self._table, (x, y))
+        return table.union(self._draw_graph(screen, x, y + self._table.get_height() + 6))
+
+    def _build_table(self):
+        lines = ["stage            p50    p95    p99 ms"]
+        for name, (p50, p95, p99) in self.profiler.percentiles().items():
+            lines.append(f"{name[:14]:<14} {p50:6.2f} {p95:6.2f} {p99:6.2f}")
+        rendered = [self.font.render(line, True, (220, 255, 220)) for line in lines]
+        line_h = self.font.get_linesize()
+        w = max(self.graph_size[0], max(s.get_width() for s in rendered) + 12)
+        surf = pygame.Surface((w, line_h * len(rendered) + 8), pygame.SRCALPHA)
+        surf.fill((0, 0, 0, 170))
+        for i, s in enumerate(rendered):
+            surf.blit(s, (6, 4 + i * line_h))
+        return surf
+
+    def _draw_graph(self, screen, x, y):
+        w, h = self.graph_size
+        area = pygame.draw.rect(screen, (0, 0, 0), (x, y, w, h))
+        scale = h / (self.budget_ms * 3)   # 纵轴上限 = 3 倍帧预算
+        budget_y = y + h - int(self.budget_ms * scale)
+        pygame.draw.line(screen, (90, 90, 90), (x, budget_y), (x + w - 1, budget_y))
+        times = self.profiler.frame_times()[-w:]
+        if len(times) >= 2:
+            xs = x + w - len(times) + np.arange(len(times))
+            ys = y + h - 1 - np.minimum(times * scale, h - 1).astype(np.int64)
+            pygame.draw.lines(screen, (0, 255, 120), False, np.column_stack((xs, ys)).tolist())
+        return area
@@ -0,0 +1,198 @@
+"""Seeded, chunked level generation into pooled buffers.
+
+The level is cut into horizontal chunks ``chunk_height`` pixels tall (one
+screen by default) and generated a whole chunk at a time from the level's own
+random stream, so the same seed always produces the same terrain no matter
+when or on which thread a chunk is made.  Positions are level coordinates:
+the y a platform has while the scroll is 0, decreasing upwards.
+
+Each chunk is written into a ``LevelChunk`` with fixed-size NumPy buffers taken
+from the generator's pool.  Once the world has copied a chunk into its own
+columns (which only grow, never shrink) the chunk goes back to the pool, so in
+a long game neither generating nor culling terrain allocates (the world culls
+through preallocated masks and compaction buffers).
+
+``ChunkPrefetcher`` runs a generator on a background thread and keeps a few
+chunks queued ahead of the one the game needs next, so taking a chunk in the
+physics step is a queue pop.  Both expose ``reset``/``next_chunk``/``release``
+and hand out the same chunks for the same seed.
+"""
+import threading
+from collections import deque
+
+import numpy as np
+
+from .world import BOUNCY
+
+MIN_PLATFORM_W = 60
+MAX_PLATFORM_W = 220
+SHRINK_SCROLL = 8000      # 滚动到这里平台缩到最窄
+BOUNCY_CHANCE = 0.25
+HAZARD_CHANCE = 0.45      # 每块一次；和旧的逐帧生成时屏幕上的平均障碍数相当
+FIRST_GAP = (80, 140)     # 第一屏平台间距更密
+GAP = (100, 180)
+
+
+def platform_width(scroll):
+    shrink = max(0, min(1, scroll / SHRINK_SCROLL))
+    return int(MAX_PLATFORM_W - (MAX_PLATFORM_W - MIN_PLATFORM_W) * shrink)
+
+
+class LevelChunk:
+    """One chunk of terrain in level coordinates; only the first ``n`` platform slots are used."""
+
+    def __init__(self, capacity):
+        self.index = -1
+        self.top = 0.0            # 块上沿的关卡 y，下一块从这里接着往上
+        self.n = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.w = np.zeros(capacity)
+        self.flags = np.zeros(capacity, np.uint8)
+        self.hazard = False
+        self.hazard_x = self.hazard_y = self.hazard_vx = 0.0
+
+
+class ChunkGenerator:
+    """Turns a seed into a reproducible sequence of ``LevelChunk``s, starting at level y ``start_y``."""
+
+    def __init__(self, width, height, hazard_speed, chunk_height=None, pool_size=4):
+        self.width = width
+        self.height = height
+        self.hazard_speed = hazard_speed
+        self.chunk_height = chunk_height or height
+        self.capacity = self.chunk_height // FIRST_GAP[0] + 2
+        self._pool = [LevelChunk(self.capacity) for _ in range(pool_size)]
+        self._u = np.zeros(self.capacity)
+        self._mask = np.zeros(self.capacity, bool)
+        self.rng = None
+        self.index = 0
+        self.cursor = 0.0         # 下一个平台的关卡 y
+        self.top = 0.0            # 已生成部分的上沿
+
+    def reset(self, seed, start_y):
+        self.rng = np.random.Generator(np.random.PCG64(seed))
+        self.index = 0
+        self.cursor = self.top = float(start_y)
+
+    def next_chunk(self):
+        """Generate the chunk above everything generated so far into a pooled buffer."""
+        chunk = self._pool.pop() if self._pool else LevelChunk(self.capacity)
+        rng, u = self.rng, self._u
+        bottom = self.top
+        top = bottom - self.chunk_height
+        lo, hi = FIRST_GAP if self.index == 0 else GAP
+
+        # 每块固定消耗同样多的随机数，块内用了几个平台都不影响后面的块
+        gaps = rng.random(out=u)
+        gaps *= hi - lo + 1
+        np.floor(gaps, out=gaps)
+        gaps += lo
+        y = chunk.y                # 先放各平台到 cursor 的距离，递增
+        y[0] = 0
+        np.cumsum(gaps[:-1], out=y[1:])
+        n = int(np.searchsorted(y, self.cursor - top, side="left"))
+        next_cursor = self.cursor - (y[n - 1] + gaps[n - 1]) if n else self.cursor
+        np.subtract(self.cursor, y, out=y)
+
+        # 宽度按平台出现时的大致滚动量收窄（平台进入屏幕顶部时 scroll ≈ -y - height）
+        w = chunk.w
+        np.negative(y, out=w)
+        w -= self.height
+        np.clip(w, 0, SHRINK_SCROLL, out=w)
+        w *= -(MAX_PLATFORM_W - MIN_PLATFORM_W) / SHRINK_SCROLL
+        w += MAX_PLATFORM_W
+        np.trunc(w, out=w)
+
+        x = chunk.x
+        rng.random(out=x)
+        np.subtract(self.width + 1, w, out=u)
+        x *= u
+        np.floor(x, out=x)
+
+        rng.random(out=u)
+        np.less(u, BOUNCY_CHANCE, out=self._mask)
+        np.copyto(chunk.flags, self._mask)
+        chunk.flags *= BOUNCY
+
+        # 第一块正好在开局下落的路径上，不放障碍；随机数照样抽，后面的块不受影响
+        chunk.hazard = rng.random() < HAZARD_CHANCE and self.index > 0
+        chunk.hazard_x = float(int(rng.random() * (self.width + 1)))
+        chunk.hazard_y = bottom - (100 + int(rng.random() * 201))
+        chunk.hazard_vx = self.hazard_speed if rng.random() < 0.5 else -self.hazard_speed
+
+        chunk.index = self.index
+        chunk.n = n
+        chunk.top = top
+        self.index += 1
+        self.cursor = next_cursor
+        self.top = top
+        return chunk
+
+    def release(self, chunk):
+        """Hand a chunk back to the pool once its contents have been copied out."""
+        self._pool.append(chunk)
+
+
+class ChunkPrefetcher:
+    """Keeps ``lookahead`` chunks of ``generator`` ready on a background thread."""
+
+    def __init__(self, generator, lookahead=3):
+        self.generator = generator
+        self.lookahead = lookahead
+        self.stalls = 0            # next_chunk 不得不等生成线程的次数
+        self._ready = deque()
+        self._cond = threading.Condition()
+        self._generating = threading.Lock()   # 生成中不能 reset 生成器
+        self._epoch = 0
+        self._closed = False
+        self._thread = None
+
+    def reset(self, seed, start_y):
+        with self._generating, self._cond:
+            self._epoch += 1
+            while self._ready:
+                self.generator.release(self._ready.popleft())
+            self.generator.reset(seed, start_y)
+            self._cond.notify_all()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="level-prefetch", daemon=True)
+            self._thread.start()
+
+    def next_chunk(self):
+        with self._cond:
+            if not self._ready:
+                self.stalls += 1
+            while not self._ready:
+                self._cond.wait()
+            chunk = self._ready.popleft()
+            self._cond.notify_all()
+        return chunk
+
+    def release(self, chunk):
+        # 池是个 list，append/pop 在 GIL 下是原子的，不必和生成线程抢锁
+        self.generator.release(chunk)
+
+    def close(self, timeout=1.0):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed and len(self._ready) >= self.lookahead:
+                    self._cond.wait()
+                if self._closed:
+                    return
+            with self._generating:
+                epoch = self._epoch
+                chunk = self.generator.next_chunk()
+            with self._cond:
+                if epoch == self._epoch:
+                    self._ready.append(chunk)
+                    self._cond.notify_all()
+                else:
+                    self.generator.release(chunk)
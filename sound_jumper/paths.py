@@ -0,0 +1,9 @@
+"""Per-user cache location for data that is expensive to rebuild at startup."""
+import os
+
+
+def cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    path = os.path.join(base, "sound_jumper")
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,31 @@
+"""Vertical bucket grid over platform slots for the landing check."""
+import numpy as np
+
+
+class PlatformIndex:
+    """Maps screen bands of a platform's top to its slot in ``World.platforms``.
+
+    Only landable (not falling) platforms are indexed.  The index is rebuilt with a
+    handful of vectorised calls whenever the world changes shape (scroll, spawn); the
+    landing query is then two ``searchsorted`` calls plus a check of the few slots
+    around the player's feet.
+    """
+
+    def __init__(self, band_height=64):
+        self.band_height = band_height
+        self._keys = np.zeros(0, np.int64)
+        self._ids = np.zeros(0, np.intp)
+
+    def rebuild(self, tops, landable):
+        ids = np.flatnonzero(landable)
+        keys = np.floor_divide(tops[ids], self.band_height).astype(np.int64)
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._ids = ids[order]
+
+    def candidates(self, top_min, top_max):
+        """Slots (ascending) of platforms whose top may lie in [top_min, top_max]."""
+        bh = self.band_height
+        lo = np.searchsorted(self._keys, int(top_min // bh), "left")
+        hi = np.searchsorted(self._keys, int(top_max // bh), "right")
+        return np.sort(self._ids[lo:hi])
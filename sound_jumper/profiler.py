@@ -0,0 +1,145 @@
+"""Per-stage frame timing with rolling percentiles and trace export.
+
+The main loop calls ``begin_frame()`` and then ``lap(stage)`` at the end of each
+section: the time since the previous lap is charged to that stage.  Worker threads
+time their own stages with ``record(stage, start, end)``.  Every stage keeps the
+last ``history`` durations in a NumPy ring for p50/p95/p99, and every span also
+goes into a bounded event log that can be written out as CSV, JSON or a Chrome
+trace (``chrome://tracing`` / Perfetto).  One-off numbers such as time to first
+frame are kept in ``metrics`` and written to the JSON summary.
+
+Each stage has one writing thread, and ``deque.append`` is atomic, so recording
+takes no lock.
+"""
+import csv
+import json
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+
+class StageStats:
+    """Rolling window of one stage's durations (seconds)."""
+
+    def __init__(self, name, history):
+        self.name = name
+        self.samples = np.zeros(history)
+        self.count = 0
+
+    def add(self, duration):
+        self.samples[self.count % len(self.samples)] = duration
+        self.count += 1
+
+    def window(self):
+        return self.samples[:min(self.count, len(self.samples))]
+
+    def last(self):
+        return self.samples[(self.count - 1) % len(self.samples)] if self.count else 0.0
+
+
+class FrameProfiler:
+    FRAME = "frame"
+
+    def __init__(self, history=600, max_events=200000, clock=time.perf_counter):
+        self.history = history
+        self.clock = clock
+        self.t0 = clock()
+        self.stages = {}                      # 按首次出现的顺序
+        self.events = deque(maxlen=max_events)  # (stage, start, duration, thread id)
+        self.thread_names = {}
+        self.metrics = {}                     # 一次性的数值指标，例如首帧耗时（毫秒）
+        self._lock = threading.Lock()
+        self._frame_start = None
+        self._last = None
+
+    def stage(self, name):
+        stats = self.stages.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self.stages.setdefault(name, StageStats(name, self.history))
+        return stats
+
+    def record(self, name, start, end):
+        tid = threading.get_ident()
+        if tid not in self.thread_names:
+            self.thread_names[tid] = threading.current_thread().name
+        self.stage(name).add(end - start)
+        self.events.append((name, start, end - start, tid))
+
+    def metric(self, name, value):
+        """Record a one-off value (e.g. ``time_to_first_frame_ms``) exported alongside the stages."""
+        self.metrics[name] = value
+
+    # ---------- main-loop laps ----------
+    def begin_frame(self):
+        now = self.clock()
+        if self._frame_start is not None:
+            self.record(self.FRAME, self._frame_start, now)
+        self._frame_start = self._last = now
+
+    def lap(self, name):
+        now = self.clock()
+        self.record(name, self._last, now)
+        self._last = now
+
+    # ---------- queries ----------
+    def percentiles(self, qs=(50, 95, 99)):
+        """{stage: array of percentiles in milliseconds} over the rolling window."""
+        out = {}
+        for name, stats in list(self.stages.items()):
+            window = stats.window()
+            if len(window):
+                out[name] = np.percentile(window, qs) * 1000.0
+        return out
+
+    def frame_times(self):
+        """Frame durations (ms), oldest first."""
+        stats = self.stages.get(self.FRAME)
+        if stats is None or not stats.count:
+            return np.zeros(0)
+        n = len(stats.samples)
+        if stats.count <= n:
+            return stats.samples[:stats.count] * 1000.0
+        i = stats.count % n
+        return np.concatenate((stats.samples[i:], stats.samples[:i])) * 1000.0
+
+    # ---------- export ----------
+    def export_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["stage", "thread", "start_ms", "duration_ms"])
+            for name, start, dur, tid in list(self.events):
+                writer.writerow([name, self.thread_names.get(tid, tid), f"{(start - self.t0) * 1000:.3f}",
+                                 f"{dur * 1000:.3f}"])
+
+    def summary(self):
+        stats = {}
+        for name, pct in self.percentiles().items():
+            window = self.stages[name].window()
+            stats[name] = {"count": self.stages[name].count, "mean_ms": float(window.mean() * 1000),
+                           "p50_ms": float(pct[0]), "p95_ms": float(pct[1]), "p99_ms": float(pct[2]),
+                           "max_ms": float(window.max() * 1000)}
+        return stats
+
+    def export_json(self, path):
+        with open(path, "w") as f:
+            json.dump({"window": self.history, "metrics": self.metrics, "stages": self.summary()}, f, indent=2)
+
+    def export_chrome_trace(self, path):
+        events = [{"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}}
+                  for tid, name in self.thread_names.items()]
+        for name, start, dur, tid in list(self.events):
+            events.append({"name": name, "ph": "X", "pid": 1, "tid": tid,
+                           "ts": round((start - self.t0) * 1e6, 1), "dur": round(dur * 1e6, 1)})
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def export_all(self, prefix):
+        """Write ``prefix``.csv, ``prefix``.json and ``prefix``.trace.json; returns the paths."""
+        paths = (prefix + ".csv", prefix + ".json", prefix + ".trace.json")
+        self.export_csv(paths[0])
+        self.export_json(paths[1])
+        self.export_chrome_trace(paths[2])
+        return paths
@@ -0,0 +1,194 @@
+"""Input recordings: what the simulation was fed, tick by tick.
+
+A recording is a small header followed by fixed-size little-endian records, so
+the whole file can be ``np.memmap``-ed and sliced like a column store::
+
+    b"SJREC\\n\\0\\0"   magic (8 bytes)
+    uint32          length of the JSON header that follows
+    JSON            {"version", "dtype", "width", "height", "camera", "tick_rate", ...},
+                    space-padded so the records start on a 64-byte boundary
+    RECORD_DTYPE[]  one record per event, oldest first
+
+Inputs are captured at the ``Simulation.step`` boundary (after the voice onset
+buffer, vision and keyboard have been turned into one tick's inputs), which is
+what makes a replay bit-exact: same seed, same inputs, same game.
+
+The game loop only fills a slot in an ``SpscRing``; a writer thread drains the
+ring to disk every ``flush_interval`` seconds.
+"""
+import json
+import os
+import struct
+import threading
+import time
+
+import numpy as np
+
+from .ring import SpscRing
+from .sim import SKILLS, TRACE_DTYPE
+
+MAGIC = b"SJREC\n\0\0"
+VERSION = 5               # 2: 分块关卡生成；3: 扫掠碰撞；4: 第一块不放障碍、落地后按放回的位置测障碍；5: 起始平台按标志（而不是槽位）免于塌落。版本不同，同样的输入回放出的是另一局
+ALIGN = 64
+
+# kind      voice         hand_x                 move / skill         value
+# TICK      voice level   hand target (NaN=无)   keyboard / skill+1   -
+# RESET     sensitivity   -                      -                    seed
+# END       -             -                      -                    score
+TICK, RESET, END = 0, 1, 2
+RECORD_DTYPE = np.dtype([("t", "<f8"), ("kind", "u1"), ("move", "i1"), ("skill", "u1"),
+                         ("voice", "<f8"), ("hand_x", "<f8"), ("value", "<u4")])
+
+
+class RecordingWriter:
+    """Appends records from the game loop; all file I/O happens on a background thread."""
+
+    def __init__(self, path, capacity=1 << 14, flush_interval=0.25, **meta):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.t0 = time.perf_counter()
+        self.written = 0
+        self._ring = SpscRing(capacity, RECORD_DTYPE)
+        self._skill_codes = {name: i + 1 for i, name in enumerate(SKILLS)}
+
+        header = dict(meta, version=VERSION, dtype=RECORD_DTYPE.descr, created=time.time())
+        body = json.dumps(header).encode("utf-8")
+        pad = -(len(MAGIC) + 4 + len(body)) % ALIGN
+        self._file = open(path, "wb")
+        self._file.write(MAGIC + struct.pack("<I", len(body) + pad) + body + b" " * pad)
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="recording-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def dropped(self):
+        return self._ring.dropped
+
+    # ---------- game-loop side ----------
+    def _slot(self, kind, t):
+        rec = self._ring.slot()
+        if rec is not None:
+            rec["t"] = (time.perf_counter() if t is None else t) - self.t0
+            rec["kind"] = kind
+        return rec
+
+    def tick(self, voice, hand_x, move, skill, t=None):
+        rec = self._slot(TICK, t)
+        if rec is None:
+            return
+        rec["voice"] = voice
+        rec["hand_x"] = np.nan if hand_x is None else hand_x
+        rec["move"] = move
+        rec["skill"] = self._skill_codes[skill] if skill else 0
+        self._ring.commit()
+
+    def reset(self, seed, sensitivity, t=None):
+        rec = self._slot(RESET, t)
+        if rec is None:
+            return
+        rec["voice"] = sensitivity
+        rec["value"] = seed
+        self._ring.commit()
+
+    def end(self, score, t=None):
+        rec = self._slot(END, t)
+        if rec is None:
+            return
+        rec["value"] = score
+        self._ring.commit()
+
+    def close(self, timeout=2.0):
+        self._stop.set()
+        self._thread.join(timeout)
+        self._drain()
+        self._file.close()
+        if self.dropped:
+            print(f"录制缓冲溢出，丢失 {self.dropped} 条记录")
+
+    # ---------- writer thread ----------
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self._drain()
+
+    def _drain(self):
+        records = self._ring.pop_all()
+        if len(records):
+            self._file.write(records.tobytes())
+            self._file.flush()
+            self.written += len(records)
+
+
+def read_header(path):
+    """(metadata dict, byte offset of the first record)."""
+    with open(path, "rb") as f:
+        magic = f.read(len(MAGIC))
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a Sound Jumper recording")
+        (length,) = struct.unpack("<I", f.read(4))
+        meta = json.loads(f.read(length).decode("utf-8"))
+    if meta.get("version") != VERSION:
+        raise ValueError(f"{path}: unsupported recording version {meta.get('version')}")
+    return meta, len(MAGIC) + 4 + length
+
+
+def open_recording(path):
+    """Memory-map a recording; returns (metadata, RECORD_DTYPE array).  A truncated tail is ignored."""
+    meta, offset = read_header(path)
+    count = (os.path.getsize(path) - offset) // RECORD_DTYPE.itemsize
+    if count == 0:
+        return meta, np.zeros(0, RECORD_DTYPE)
+    return meta, np.memmap(path, RECORD_DTYPE, "r", offset=offset, shape=(count,))
+
+
+class ReplaySource:
+    """Stands in for the microphone, camera and keyboard by replaying a recording."""
+
+    def __init__(self, path):
+        self.path = path
+        self.meta, self.records = open_recording(path)
+        self.pos = 0
+
+    @property
+    def done(self):
+        return self.pos >= len(self.records)
+
+    def peek_kind(self):
+        return None if self.done else int(self.records["kind"][self.pos])
+
+    def next_reset(self):
+        """(seed, sensitivity) of the next game, skipping to it; None at the end of the recording."""
+        while not self.done:
+            rec = self.records[self.pos]
+            self.pos += 1
+            if rec["kind"] == RESET:
+                return int(rec["value"]), float(rec["voice"])
+        return None
+
+    def next_tick(self):
+        """Inputs for the next tick as ``Simulation.step`` arguments, or None when the game's input ends."""
+        if self.peek_kind() != TICK:
+            if self.peek_kind() == END:
+                self.pos += 1
+            return None
+        rec = self.records[self.pos]
+        self.pos += 1
+        hand_x = float(rec["hand_x"])
+        skill = int(rec["skill"])
+        return float(rec["voice"]), None if hand_x != hand_x else hand_x, int(rec["move"]), \
+            SKILLS[skill - 1] if skill else None
+
+    def games(self):
+        """Yield (seed, sensitivity, TRACE_DTYPE inputs, recorded score or None) for every game."""
+        kinds = np.asarray(self.records["kind"])
+        starts = np.flatnonzero(kinds == RESET)
+        bounds = np.append(starts, len(kinds))
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            rec = self.records[start]
+            body = self.records[start + 1:stop]
+            ticks = body[body["kind"] == TICK]
+            trace = np.zeros(len(ticks), TRACE_DTYPE)
+            for name in TRACE_DTYPE.names:
+                trace[name] = ticks[name]
+            ends = body["value"][body["kind"] == END]
+            yield int(rec["value"]), float(rec["voice"]), trace, int(ends[0]) if len(ends) else None
@@ -0,0 +1,62 @@
+"""Single-producer / single-consumer ring buffer over a preallocated NumPy record array.
+
+The producer (e.g. the PortAudio callback) only writes records and advances ``_write``;
+the consumer (the game loop) only reads and advances ``_read``.  Each index is owned
+by exactly one side and published with a single attribute store, so no lock is needed.
+"""
+import numpy as np
+
+
+class SpscRing:
+    def __init__(self, capacity, dtype):
+        if capacity & (capacity - 1):
+            raise ValueError("capacity must be a power of two")
+        self.capacity = capacity
+        self._mask = capacity - 1
+        self._buf = np.zeros(capacity, dtype)
+        self._write = 0
+        self._read = 0
+        self.dropped = 0
+
+    # ---------- producer side ----------
+    def slot(self):
+        """Record to fill in place for the next push, or None if the ring is full."""
+        if self._write - self._read >= self.capacity:
+            self.dropped += 1
+            return None
+        return self._buf[self._write & self._mask]
+
+    def commit(self):
+        self._write += 1
+
+    def push(self, *values):
+        rec = self.slot()
+        if rec is None:
+            return False
+        self._buf[self._write & self._mask] = values
+        self.commit()
+        return True
+
+    # ---------- consumer side ----------
+    def __len__(self):
+        return self._write - self._read
+
+    def pop_all(self):
+        """Copy out every pending record (oldest first) and mark them consumed."""
+        r, w = self._read, self._write
+        if r == w:
+            return self._buf[:0]
+        lo, hi = r & self._mask, w & self._mask
+        if lo < hi:
+            out = self._buf[lo:hi].copy()
+        else:
+            out = np.concatenate((self._buf[lo:], self._buf[:hi]))
+        self._read = w
+        return out
+
+    def latest(self):
+        """Most recently committed record (copy) without consuming anything, or None."""
+        w = self._write
+        if w == 0:
+            return None
+        return self._buf[(w - 1) & self._mask].copy()
@@ -0,0 +1,245 @@
+"""Headless, seeded game simulation.
+
+Physics, level generation and skills for one game, advanced one fixed tick at a
+time.  Nothing here touches pygame, the camera or the microphone: the caller
+feeds each tick's inputs (voice level, hand target x, keyboard direction,
+requested skill) and reads the state back for drawing.  All randomness comes
+from ``Simulation.rng`` (terrain from a level seed drawn from it, see
+``level``) and all timing from the tick counter, so the same seed and the same
+input trace always produce the same game.
+"""
+import random
+
+import numpy as np
+
+from .level import ChunkGenerator, ChunkPrefetcher, platform_width
+from .world import BOUNCY, START, World
+
+SKILLS = ("RESCUE", "SHIELD", "BLAST")
+
+# 一个 tick 的输入；hand_x 为 NaN 表示这个 tick 没有新的手部位置，skill 为 SKILLS 下标 + 1（0 = 无）
+TRACE_DTYPE = np.dtype([("voice", np.float64), ("hand_x", np.float64), ("move", np.int8), ("skill", np.uint8)])
+
+
+def hand_to_screen_x(hand_cx, screen_width, player_w):
+    """Player target x for a normalised palm x, centred and kept on screen."""
+    return max(0, min(screen_width - player_w, hand_cx * screen_width - player_w / 2))
+
+
+class SimConfig:
+    """Tunables of the prototype's rules; every speed is per tick."""
+
+    def __init__(self, width, height, player_w=40, player_h=40, gravity=1.5, platform_fall_speed=20,
+                 platform_height=15, hazard_size=15, hazard_speed=10, volume_threshold=0.001,
+                 volume_sensitivity=4000, bounce_multiplier=2.0, keyboard_move_speed=15, camera=False,
+                 tick_rate=60, level_lookahead=0, max_fall_speed=40):
+        self.width = width
+        self.height = height
+        self.player_w = player_w
+        self.player_h = player_h
+        self.gravity = gravity
+        self.platform_fall_speed = platform_fall_speed
+        self.platform_height = platform_height
+        self.hazard_size = hazard_size
+        self.hazard_speed = hazard_speed
+        self.volume_threshold = volume_threshold
+        self.volume_sensitivity = volume_sensitivity
+        self.bounce_multiplier = bounce_multiplier
+        self.keyboard_move_speed = keyboard_move_speed
+        self.camera = camera          # False: 键盘模式，hand_target_x 跟随 keyboard_target_x
+        self.tick_rate = tick_rate
+        self.max_fall_speed = max_fall_speed   # 碰撞是扫掠检测，调高也不会穿过平台
+        self.level_lookahead = level_lookahead   # >0: 后台线程提前生成这么多块地形（0 = 在 step 里同步生成）
+        self.skills = {"RESCUE": 5.0, "SHIELD": 8.0, "BLAST": 10.0}  # 冷却时间（秒）
+        self.shield_duration = 3.0
+
+
+class Simulation:
+    """One game of Sound Jumper, from the initial drop to game over."""
+
+    def __init__(self, config, seed=None):
+        self.config = config
+        self.dt = 1.0 / config.tick_rate
+        self.rng = random.Random(seed)
+        self.world = World(config.width, config.height, config.platform_height, config.hazard_size)
+        self.level = ChunkGenerator(config.width, config.height, config.hazard_speed)
+        if config.level_lookahead:
+            self.level = ChunkPrefetcher(self.level, config.level_lookahead)
+        self.sensitivity = config.volume_sensitivity
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng.seed(seed)
+        cfg = self.config
+        self.tick = 0
+        self.time = 0.0
+        self.player_x = cfg.width // 2 - cfg.player_w // 2
+        self.player_y = -50
+        self.prev_player_x, self.prev_player_y = self.player_x, self.player_y
+        self.velocity_y = 0
+        self.is_jumping = False
+        self.initial_drop = True
+        self.hand_target_x = cfg.width // 2
+        self.keyboard_target_x = cfg.width // 2 - cfg.player_w // 2
+        self.scroll = 0
+        self.score = 0
+        self.game_over = False
+        self.voice_jumped = False     # 本 tick 是否因声音起跳（调用方据此清掉缓存的起音）
+        self.last_use = {name: -float("inf") for name in SKILLS}
+        self.shield_active_end = 0.0
+        self.shockwave_radius = 0
+        self.generate_initial_platforms()
+
+    # ---------- level generation ----------
+    def get_platform_width(self, y, scroll):
+        return platform_width(scroll)
+
+    def generate_initial_platforms(self):
+        cfg, world = self.config, self.world
+        world.clear()
+        start_plat_w = 220
+        world.add_platform(cfg.width // 2 - start_plat_w // 2, cfg.height - 150, start_plat_w, True, start=True)
+        self.level_top = cfg.height - 300    # 已放进世界的地形上沿（关卡坐标）
+        self.level.reset(self.rng.getrandbits(64), self.level_top)
+        self.generate_platforms_above()
+
+    def generate_platforms_above(self):
+        """Add whole chunks until the generated terrain reaches a screen above the top edge."""
+        level = self.level
+        while self.level_top + self.scroll > -self.config.height:
+            chunk = level.next_chunk()
+            self.world.add_chunk(chunk, self.scroll)
+            self.level_top = chunk.top
+            level.release(chunk)
+
+    def close(self):
+        """Stop the level prefetch thread, if there is one."""
+        if isinstance(self.level, ChunkPrefetcher):
+            self.level.close()
+
+    # ---------- skills ----------
+    def cooldown_remaining(self, name):
+        return max(0.0, self.config.skills[name] - (self.time - self.last_use[name]))
+
+    @property
+    def shield_active(self):
+        return self.time < self.shield_active_end
+
+    def use_skill(self, name):
+        """Trigger ``name`` if it is off cooldown; returns whether it fired."""
+        if self.game_over or self.time - self.last_use[name] <= self.config.skills[name]:
+            return False
+        cfg = self.config
+        if name == "RESCUE":
+            spawn_y = min(cfg.height - 50, self.player_y + 100)
+            plat_w = self.get_platform_width(spawn_y, self.scroll)
+            self.world.add_platform(int(self.player_x + cfg.player_w / 2 - plat_w / 2), spawn_y, plat_w, True)
+        elif name == "SHIELD":
+            self.shield_active_end = self.time + cfg.shield_duration
+        elif name == "BLAST":
+            self.world.clear_hazards()
+            self.shockwave_radius = 1
+        self.last_use[name] = self.time
+        return True
+
+    # ---------- tick ----------
+    def step(self, voice_level=0.0, hand_target_x=None, move=0, skill=None):
+        """Advance one tick.  ``move`` is the keyboard direction (-1/0/1) used without a camera,
+        ``hand_target_x`` the latest hand position (None = unchanged), ``skill`` a name from SKILLS."""
+        cfg, world = self.config, self.world
+        self.prev_player_x, self.prev_player_y = self.player_x, self.player_y
+        world.save_previous()
+        self.voice_jumped = False
+        if self.game_over:
+            return
+
+        if not cfg.camera and move:
+            self.keyboard_target_x = max(0, min(cfg.width - cfg.player_w,
+                                                self.keyboard_target_x + move * cfg.keyboard_move_speed))
+        if hand_target_x is not None:
+            self.hand_target_x = hand_target_x
+        if self.initial_drop:
+            self.hand_target_x = cfg.width // 2 - cfg.player_w // 2
+            self.keyboard_target_x = cfg.width // 2 - cfg.player_w // 2
+        if not cfg.camera:
+            self.hand_target_x = self.keyboard_target_x
+
+        if skill is not None:
+            self.use_skill(skill)
+
+        self.player_x += (self.hand_target_x - self.player_x) * 0.2
+        jump_force = 0.0
+        if voice_level > cfg.volume_threshold:
+            raw_force = (voice_level - cfg.volume_threshold) * self.sensitivity
+            jump_force = min(25, raw_force)
+
+        self.player_y += self.velocity_y
+        if len(world.hazards): world.move_hazards()
+        # 本 tick 玩家从 prev 扫到当前位置，平台与障碍都按整段位移检测，再快也不会穿过去
+        prev_left, prev_top = int(self.prev_player_x), int(self.prev_player_y)
+        left, top = int(self.player_x), int(self.player_y)
+        dx, dy = left - prev_left, top - prev_top
+        standing_on_platform = None; is_on_bouncy_platform = False
+
+        if self.velocity_y >= 0:
+            self.velocity_y = min(self.velocity_y, cfg.max_fall_speed)
+            i = world.find_landing(prev_left, prev_top + cfg.player_h, cfg.player_w, dx, dy)
+            if i >= 0:
+                standing_on_platform = float(world.platforms.y[i])
+                flags = world.platforms.flags[i]
+                is_on_bouncy_platform = bool(flags & BOUNCY)
+                if not flags & (BOUNCY | START) and self.rng.random() < 0.3:
+                    world.mark_falling(i)
+            if standing_on_platform is not None:
+                self.player_y = standing_on_platform - cfg.player_h; self.velocity_y = 0; self.is_jumping = False
+            else: self.velocity_y += cfg.gravity
+        else: self.velocity_y += cfg.gravity
+
+        base_jump = -(10 + jump_force)
+        if self.initial_drop and standing_on_platform is not None:
+            self.initial_drop = False; self.velocity_y = -20; self.is_jumping = True
+        elif standing_on_platform is not None and jump_force > 1.0 and not self.is_jumping:
+            self.velocity_y = base_jump * cfg.bounce_multiplier if is_on_bouncy_platform else base_jump
+            self.is_jumping = True; self.voice_jumped = True
+        if standing_on_platform is not None and is_on_bouncy_platform and not self.is_jumping and jump_force < 1.0:
+            self.velocity_y = -15; self.is_jumping = True
+
+        if len(world.hazards):
+            # 落地时玩家被放回平台上沿：按放回后的位置扫掠，不算平台下面的那段路
+            dy = int(self.player_y) - prev_top
+            hits = world.hazard_hits(prev_left, prev_top, cfg.player_w, cfg.player_h, dx, dy)
+            if hits.any():
+                if self.shield_active:
+                    world.remove_hazards(hits); self.score += 50 * int(hits.sum())
+                else: self.game_over = True
+
+        if not self.initial_drop and self.player_y < cfg.height / 2.5:
+            scroll_amt = (cfg.height / 2.5) - self.player_y
+            self.player_y += scroll_amt; self.scroll += scroll_amt
+            world.scroll(scroll_amt, cfg.platform_fall_speed)
+            self.generate_platforms_above()
+
+        self.score = int(self.scroll / 10)
+        if self.player_y > cfg.height: self.game_over = True
+
+        if self.shockwave_radius > 0:
+            self.shockwave_radius += 30
+            if self.shockwave_radius > cfg.width: self.shockwave_radius = 0
+
+        self.tick += 1
+        self.time = self.tick * self.dt
+
+
+def run_trace(sim, trace, stop_on_game_over=True):
+    """Feed a TRACE_DTYPE array to ``sim`` one record per tick; returns the number of ticks run."""
+    voice = trace["voice"].tolist()
+    hand_x = trace["hand_x"].tolist()
+    move = trace["move"].tolist()
+    skill = trace["skill"].tolist()
+    for t in range(len(voice)):
+        x = hand_x[t]
+        sim.step(voice[t], None if x != x else x, move[t], SKILLS[skill[t] - 1] if skill[t] else None)
+        if stop_on_game_over and sim.game_over:
+            return t + 1
+    return len(voice)
@@ -0,0 +1,92 @@
+"""Sprite sheet -> pre-baked animation atlas.
+
+Every variant the game draws (scaled to the player size, mirrored for facing left,
+``convert_alpha``'d for the display format) is produced once at load time, so drawing
+a frame is a single blit.  The processed strip is also written to the user cache and
+reused on the next launch as long as the source sheet and parameters are unchanged.
+"""
+import hashlib
+import os
+
+import pygame
+
+from .paths import cache_dir
+
+ATLAS_VERSION = 1
+
+
+class SpriteAtlas:
+    def __init__(self, frames, mirrored):
+        self.frames = frames
+        self.mirrored = mirrored
+
+    def __len__(self):
+        return len(self.frames)
+
+    def frame(self, index, facing_left=False):
+        return (self.mirrored if facing_left else self.frames)[index]
+
+
+def _slice_sheet(sheet, fw, fh):
+    sw, sh = sheet.get_size()
+    frames = []
+    for r in range(max(1, sh // fh)):
+        for c in range(max(1, sw // fw)):
+            frames.append(sheet.subsurface((c * fw, r * fh, fw, fh)))
+    return frames
+
+
+def _cache_file(path, fw, fh, size, smooth):
+    st = os.stat(path)
+    key = f"{ATLAS_VERSION}|{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}|{fw}x{fh}|{size}|{smooth}"
+    return os.path.join(cache_dir(), "atlas_" + hashlib.sha1(key.encode()).hexdigest()[:16] + ".png")
+
+
+def _from_strip(strip, size):
+    # 缓存文件第一行是原始朝向，第二行是镜像
+    w, h = size
+    count = strip.get_width() // w
+    frames = [strip.subsurface((i * w, 0, w, h)) for i in range(count)]
+    mirrored = [strip.subsurface((i * w, h, w, h)) for i in range(count)]
+    return SpriteAtlas(frames, mirrored)
+
+
+def load_sprite_atlas(path, frame_w, frame_h, size=None, smooth=True, use_cache=True):
+    """Load ``path`` as a grid of ``frame_w`` x ``frame_h`` frames scaled to ``size``.
+
+    Must be called after ``pygame.display.set_mode``.  Returns None if the sheet cannot be read.
+    """
+    size = tuple(size) if size else (frame_w, frame_h)
+    cache_file = None
+    if use_cache:
+        try:
+            cache_file = _cache_file(path, frame_w, frame_h, size, smooth)
+            if os.path.exists(cache_file):
+                return _from_strip(pygame.image.load(cache_file).convert_alpha(), size)
+        except (OSError, pygame.error):
+            cache_file = None
+
+    try:
+        sheet = pygame.image.load(path).convert_alpha()
+    except (OSError, pygame.error):
+        return None
+    frames = _slice_sheet(sheet, frame_w, frame_h)
+    if not frames:
+        return None
+
+    scale = pygame.transform.smoothscale if smooth else pygame.transform.scale
+    strip = pygame.Surface((size[0] * len(frames), size[1] * 2), pygame.SRCALPHA)
+    for i, frame in enumerate(frames):
+        if frame.get_size() != size:
+            frame = scale(frame, size)
+        # 目标全透明，用 MAX 混合等于原样拷贝像素（普通 alpha 混合会让半透明边缘变暗）
+        strip.blit(frame, (i * size[0], 0), special_flags=pygame.BLEND_RGBA_MAX)
+        strip.blit(pygame.transform.flip(frame, True, False), (i * size[0], size[1]), special_flags=pygame.BLEND_RGBA_MAX)
+    strip = strip.convert_alpha()
+
+    if cache_file:
+        try:
+            pygame.image.save(strip, cache_file)
+        except (OSError, pygame.error):
+            pass
+    return _from_strip(strip, size)
@@ -0,0 +1,67 @@
+"""Staged startup: slow initialisation runs on background threads while the game already draws.
+
+Heavy imports (mediapipe, cv2), model loading, camera probing and asset loading
+are submitted as named tasks and run concurrently.  A task can wait for
+another with ``wait(name)``.  The render loop never blocks on them; it checks
+``done(name)`` once per frame and wires each piece in as it arrives.  Every task's
+span is recorded in the ``FrameProfiler`` as ``startup.<name>``, so it lines up
+with the first frames in the exported trace.
+
+A task that raises is reported once and yields None.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class StartupTasks:
+    def __init__(self, profiler=None, max_workers=8):
+        # 任务之间可以互相 wait，线程数要不少于任务数，否则可能互相等死
+        self.profiler = profiler
+        self.timings = {}      # name -> (start, end)，perf_counter 时间
+        self.errors = {}       # name -> 异常
+        self._futures = {}
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="startup")
+
+    @property
+    def names(self):
+        return list(self._futures)
+
+    def submit(self, name, fn, *args):
+        def run():
+            t0 = time.perf_counter()
+            try:
+                return fn(*args)
+            except Exception as e:
+                self.errors[name] = e
+                print(f"启动任务 {name} 出错: {e}")
+                return None
+            finally:
+                t1 = time.perf_counter()
+                self.timings[name] = (t0, t1)
+                if self.profiler is not None:
+                    self.profiler.record("startup." + name, t0, t1)
+
+        self._futures[name] = self._pool.submit(run)
+        return self
+
+    def done(self, *names):
+        """True once every named task (all of them if none given) has finished; unknown names count as done."""
+        futures = [self._futures.get(n) for n in names] if names else self._futures.values()
+        return all(f is None or f.done() for f in futures)
+
+    def pending(self):
+        return [n for n, f in self._futures.items() if not f.done()]
+
+    def result(self, name):
+        """Result of a finished task (None if it failed or is still running)."""
+        future = self._futures.get(name)
+        return future.result() if future is not None and future.done() else None
+
+    def wait(self, name, timeout=None):
+        """Block until ``name`` finishes and return its result; for use inside other tasks."""
+        future = self._futures.get(name)
+        return future.result(timeout) if future is not None else None
+
+    def shutdown(self, wait=False):
+        """Stop accepting tasks; with ``wait`` block until the running ones finish."""
+        self._pool.shutdown(wait=wait)
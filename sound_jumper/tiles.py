@@ -0,0 +1,69 @@
+"""Pre-rendered platform tiles and hazard sprite, drawn with one ``Surface.blits`` per layer.
+
+Drawing every platform with ``pygame.draw.rect`` (picking its colour on the
+way) and every hazard with ``pygame.draw.circle`` costs a Python-level draw
+call each.  Here each platform kind (normal, bouncy, falling) and width gets
+its own tile, rendered in the display format the first time it is needed, and
+the hazard circle is baked once.  A frame then builds one (surface, position)
+list per layer and hands it to ``blits``.  The pixels are the same as the
+primitives'.
+"""
+import pygame
+
+from .world import BOUNCY, FALLING
+
+PLATFORM_COLORS = {"normal": (180, 180, 100), "bouncy": (255, 165, 0), "falling": (80, 80, 80)}
+HAZARD_COLOR = (255, 50, 50)
+COLORKEY = (255, 0, 255)
+
+
+def platform_kind(flags):
+    return "falling" if flags & FALLING else ("bouncy" if flags & BOUNCY else "normal")
+
+
+class TileSet:
+    """Tiles are created lazily, so build it any time but draw only after ``set_mode``."""
+
+    def __init__(self, platform_height, hazard_size, colors=None, hazard_color=HAZARD_COLOR):
+        self.platform_height = platform_height
+        self.hazard_size = hazard_size
+        self.colors = dict(PLATFORM_COLORS, **(colors or {}))
+        self.hazard_color = hazard_color
+        self._tiles = {}          # (flags 的种类, 宽度) -> Surface
+        self._hazard = None
+
+    def platform(self, width, flags):
+        kind = platform_kind(flags)
+        key = (kind, width)
+        tile = self._tiles.get(key)
+        if tile is None:
+            tile = pygame.Surface((width, self.platform_height)).convert()
+            tile.fill(self.colors[kind])
+            self._tiles[key] = tile
+        return tile
+
+    @property
+    def hazard(self):
+        if self._hazard is None:
+            # 用 colorkey 而不是逐像素 alpha：圆没有半透明边，colorkey 的 blit 快得多
+            r = self.hazard_size // 2
+            sprite = pygame.Surface((2 * r + 1, 2 * r + 1)).convert()
+            sprite.fill(COLORKEY)
+            pygame.draw.circle(sprite, self.hazard_color, (r, r), r)
+            sprite.set_colorkey(COLORKEY, pygame.RLEACCEL)
+            self._hazard = sprite
+        return self._hazard
+
+    def platform_batch(self, xs, ys, ws, flags):
+        """``blits`` sequence for platforms at (already interpolated) ``xs``/``ys``."""
+        tiles, platform = self._tiles, self.platform
+        batch = []
+        for x, y, w, f in zip(xs.tolist(), ys.tolist(), ws.tolist(), flags.tolist()):
+            w = int(w)
+            tile = tiles.get((platform_kind(f), w)) or platform(w, f)
+            batch.append((tile, (int(x), int(y))))
+        return batch
+
+    def hazard_batch(self, xs, ys):
+        sprite = self.hazard
+        return [(sprite, (int(x), int(y))) for x, y in zip(xs.tolist(), ys.tolist())]
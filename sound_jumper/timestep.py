@@ -0,0 +1,38 @@
+"""Fixed-timestep accumulator for a variable-rate render loop.
+
+Gameplay constants are tuned per 60 Hz tick (``gravity``, ``* 0.2`` steering, hazard
+speed...), so the simulation always advances in ticks of exactly ``1 / tick_rate``
+seconds and the renderer draws between the last two ticks using ``alpha``.
+"""
+import time
+
+
+class FixedTimestep:
+    def __init__(self, tick_rate=60, max_steps=5, clock=time.perf_counter):
+        self.dt = 1.0 / tick_rate
+        self.max_steps = max_steps  # 卡顿之后最多补几步，防止越补越慢
+        self.clock = clock
+        self.accumulator = 0.0
+        self._last = None
+
+    def reset(self):
+        self.accumulator = 0.0
+        self._last = None
+
+    def advance(self):
+        """Return how many ticks to simulate for the time elapsed since the last call."""
+        now = self.clock()
+        if self._last is None:
+            self._last = now
+            return 1
+        elapsed = min(now - self._last, self.max_steps * self.dt)
+        self._last = now
+        self.accumulator += elapsed
+        steps = int(self.accumulator / self.dt)
+        self.accumulator -= steps * self.dt
+        return steps
+
+    @property
+    def alpha(self):
+        """Interpolation factor between the previous and the current tick, in [0, 1)."""
+        return min(1.0, self.accumulator / self.dt)
@@ -0,0 +1,243 @@
+"""Camera capture + MediaPipe hand tracking on a background thread.
+
+The render loop never touches ``cap`` or ``hands``; it reads ``VisionWorker.latest``
+once per frame and only acts on a snapshot whose ``frame_id`` it has not seen yet.
+
+With a ``VisionScheduler`` the worker runs ``hands.process`` on a downscaled copy
+of the frame, and only on every Nth camera frame; the moving hand is
+extrapolated in between.  The scheduler trades resolution and rate against a
+per-frame inference budget as it goes.
+"""
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from .sim import hand_to_screen_x
+
+
+class VisionSnapshot:
+    """One processed camera frame as published by the worker."""
+    __slots__ = ("frame_id", "timestamp", "frame", "hand_cx", "hand_target_x", "gesture", "detected")
+
+    def __init__(self, frame_id=0, timestamp=0.0, frame=None, hand_cx=None, hand_target_x=None, gesture="NONE",
+                 detected=False):
+        self.frame_id = frame_id
+        self.timestamp = timestamp          # 画面从摄像头读到的时间（perf_counter），滤波/预测以它为准
+        self.frame = frame                  # 镜像后的 BGR 画面（已画好标注）
+        self.hand_cx = hand_cx              # 移动手的掌心 x (0~1)，本帧未检测到则为 None
+        self.hand_target_x = hand_target_x  # 换算到屏幕坐标的目标 x，本帧未检测到则为 None
+        self.gesture = gesture
+        self.detected = detected            # False = 本帧跳过了推理，hand_cx 是外推值
+
+
+class VisionScheduler:
+    """Chooses, per camera frame, whether to run hand detection and at what width.
+
+    ``budget_ms`` is the inference time allowed per camera frame, amortised over the
+    skipped frames.  Over budget, the inference width is lowered first (down to
+    ``min_width``) and then detection is skipped on more frames (up to
+    ``max_every_n``).  Well under budget, the same steps are undone in reverse.
+    """
+
+    def __init__(self, inference_width=320, min_width=192, max_width=640, every_n=1, max_every_n=4,
+                 budget_ms=8.0, adapt=True, adapt_interval=15, max_extrapolation=0.15, velocity_smoothing=0.5):
+        self.inference_width = inference_width
+        self.min_width = min_width
+        self.max_width = max_width
+        self.every_n = every_n
+        self.max_every_n = max_every_n
+        self.budget = budget_ms / 1000.0
+        self.adapt = adapt
+        self.adapt_interval = adapt_interval
+        self.max_extrapolation = max_extrapolation  # 最多外推多少秒，超过后停在原地
+        self.velocity_smoothing = velocity_smoothing
+        self.inference_time = None    # hands.process 耗时的指数滑动平均（秒）
+
+        self._since_detect = 0
+        self._samples = 0
+        self._small = None
+        self._rgb = None
+        self._track_t = None
+        self._track_x = None
+        self._velocity = 0.0
+
+    # ---------- scheduling ----------
+    def should_detect(self):
+        self._since_detect += 1
+        if self._since_detect >= self.every_n:
+            self._since_detect = 0
+            return True
+        return False
+
+    def prepare(self, image):
+        """Downscaled RGB copy of a BGR frame for inference, written into reused buffers."""
+        h, w = image.shape[:2]
+        if w > self.inference_width:
+            size = (self.inference_width, max(1, round(h * self.inference_width / w)))
+            if self._small is None or self._small.shape[:2] != (size[1], size[0]):
+                self._small = np.empty((size[1], size[0], 3), np.uint8)
+            cv2.resize(image, size, dst=self._small, interpolation=cv2.INTER_AREA)
+            image = self._small
+        if self._rgb is None or self._rgb.shape != image.shape:
+            self._rgb = np.empty_like(image)
+        # MediaPipe 输出归一化坐标，缩小后的结果可直接用于原图
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self._rgb)
+
+    def report(self, seconds):
+        """Feed back how long one ``hands.process`` call took."""
+        if self.inference_time is None:
+            self.inference_time = seconds
+        else:
+            self.inference_time += (seconds - self.inference_time) * 0.1
+        self._samples += 1
+        if self.adapt and self._samples >= self.adapt_interval:
+            self._samples = 0
+            self._adjust()
+
+    def _adjust(self):
+        cost = self.inference_time / self.every_n
+        if cost > self.budget:
+            if self.inference_width > self.min_width:
+                self.inference_width = max(self.min_width, int(self.inference_width * 0.8))
+            elif self.every_n < self.max_every_n:
+                self.every_n += 1
+        elif cost < self.budget * 0.45:
+            # 少跳一帧最多让开销翻倍，0.45 倍预算以下才放宽，避免来回抖动
+            if self.every_n > 1:
+                self.every_n -= 1
+            elif self.inference_width < self.max_width:
+                self.inference_width = min(self.max_width, int(self.inference_width * 1.25))
+
+    # ---------- hand track ----------
+    def observe(self, t, cx):
+        """Record a detection result (``cx`` None = hand not found)."""
+        if cx is None:
+            self._track_t = self._track_x = None
+            self._velocity = 0.0
+            return
+        if self._track_t is not None and 0 < t - self._track_t < 0.5:
+            v = (cx - self._track_x) / (t - self._track_t)
+            self._velocity += (v - self._velocity) * self.velocity_smoothing
+        else:
+            self._velocity = 0.0
+        self._track_t, self._track_x = t, cx
+
+    def predict(self, t):
+        """Extrapolated hand x (0~1) at time ``t``, or None when there is no track."""
+        if self._track_t is None:
+            return None
+        dt = min(t - self._track_t, self.max_extrapolation)
+        return max(0.0, min(1.0, self._track_x + self._velocity * dt))
+
+
+class VisionWorker:
+    """Owns the capture device and the ``mp_hands.Hands`` instance."""
+
+    def __init__(self, cap, hands, classify_gesture, screen_width, player_w, mark_gesture_hand=False,
+                 profiler=None, scheduler=None, debouncer=None):
+        self.cap = cap
+        self.hands = hands
+        self.classify_gesture = classify_gesture
+        self.screen_width = screen_width
+        self.player_w = player_w
+        self.mark_gesture_hand = mark_gesture_hand
+        self.profiler = profiler    # FrameProfiler：记录 cap.read / hands.process 耗时
+        self.scheduler = scheduler  # VisionScheduler；None = 每帧以原分辨率推理
+        self.debouncer = debouncer  # GestureDebouncer；None = 直接使用单帧手势
+        self.latest = VisionSnapshot()
+        self._hand_cy = 0.5
+        self._gesture = "NONE"
+        self._gesture_pos = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="vision-worker", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+        if self.cap is not None:
+            self.cap.release()
+        self.hands.close()
+
+    def poll(self, frame_id):
+        """Read and process one camera frame; None if the read failed."""
+        t0 = time.perf_counter()
+        success, image = self.cap.read()
+        if self.profiler is not None:
+            self.profiler.record("cap.read", t0, time.perf_counter())
+        if not success:
+            return None
+        return self._process(frame_id, image)
+
+    def _run(self):
+        frame_id = 0
+        while not self._stop.is_set():
+            snapshot = self.poll(frame_id + 1)
+            if snapshot is None:
+                time.sleep(0.01)
+                continue
+            frame_id = snapshot.frame_id
+            self.latest = snapshot
+
+    def _detect(self, image, now):
+        sched = self.scheduler
+        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB) if sched is None else sched.prepare(image)
+        t0 = time.perf_counter()
+        results = self.hands.process(image_rgb)
+        t1 = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.record("hands.process", t0, t1)
+
+        hand_cx = None
+        self._gesture = "NONE"
+        self._gesture_pos = None
+        if results.multi_hand_landmarks and results.multi_handedness:
+            for idx, hand_landmarks in enumerate(results.multi_hand_landmarks):
+                # cv2.flip 之后 MediaPipe 的 "Left" 是用户的右手 (屏幕右侧) -> 移动；"Right" -> 技能手势
+                label = results.multi_handedness[idx].classification[0].label
+                cx = hand_landmarks.landmark[9].x
+                cy = hand_landmarks.landmark[9].y
+                if label == "Left":
+                    hand_cx = cx
+                    self._hand_cy = cy
+                elif label == "Right":
+                    self._gesture = self.classify_gesture(hand_landmarks)
+                    self._gesture_pos = (cx, cy)
+        if self.debouncer is not None:
+            # 没有技能手的帧也投 "NONE" 票，手放下后手势会在几帧内退出
+            self._gesture = self.debouncer.update(self._gesture)
+        if sched is not None:
+            sched.report(t1 - t0)
+            sched.observe(now, hand_cx)
+        return hand_cx
+
+    def _process(self, frame_id, image):
+        now = time.perf_counter()
+        image = cv2.flip(image, 1)  # 镜像翻转
+        h, w = image.shape[:2]
+
+        sched = self.scheduler
+        detected = sched is None or sched.should_detect()
+        if detected:
+            hand_cx = self._detect(image, now)
+        else:
+            # 跳过推理的帧：沿用上次的手势，移动手按速度外推
+            hand_cx = sched.predict(now)
+
+        hand_target_x = None
+        if hand_cx is not None:
+            hand_target_x = hand_to_screen_x(hand_cx, self.screen_width, self.player_w)
+            cv2.circle(image, (int(hand_cx * w), int(self._hand_cy * h)), 15, (0, 255, 0), -1)
+        if self._gesture_pos is not None:
+            gx, gy = int(self._gesture_pos[0] * w), int(self._gesture_pos[1] * h)
+            cv2.putText(image, self._gesture, (gx - 40, gy - 40), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 3)
+            if self.mark_gesture_hand:
+                cv2.circle(image, (gx, gy), 15, (0, 255, 255), -1)
+
+        return VisionSnapshot(frame_id, now, image, hand_cx, hand_target_x, self._gesture, detected)
@@ -0,0 +1,231 @@
+"""Camera capture + MediaPipe hand tracking in a separate process.
+
+A drop-in for ``VisionWorker`` (same ``start()`` / ``latest`` / ``stop()``) for
+machines where inference on a thread would compete with the pygame loop for
+the GIL.  The child process owns the capture device and the ``Hands``
+instance and runs the very same ``VisionWorker.poll`` per frame.  Results are
+written into a ``multiprocessing.shared_memory`` ring of preallocated image
+slots plus a small per-slot record (hand x, gesture, timings), so frames are
+never pickled.
+
+Each slot is guarded by a sequence number (odd while the child is writing it);
+the game copies the newest slot out and drops the copy if the number changed
+underneath it.
+"""
+import multiprocessing
+import sys
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from .gestures import GESTURE_CODES, GESTURES, UNKNOWN
+from .vision import VisionSnapshot, VisionWorker
+
+META_DTYPE = np.dtype([
+    ("seq", "<u8"),
+    ("frame_id", "<i8"),
+    ("timestamp", "<f8"),
+    ("hand_cx", "<f8"),          # NaN = 未检测到移动手
+    ("hand_target_x", "<f8"),
+    ("gesture", "u1"),
+    ("detected", "u1"),
+    ("read_start", "<f8"),       # cap.read / hands.process 的起止时间（perf_counter，0 = 本帧没有）
+    ("read_end", "<f8"),
+    ("infer_start", "<f8"),
+    ("infer_end", "<f8"),
+], align=True)
+
+
+def _align(n, to=64):
+    return (n + to - 1) // to * to
+
+
+class SharedFrameRing:
+    """``slots`` BGR frames of ``shape`` plus one ``META_DTYPE`` record each, in one shared block.
+
+    Created by the game (``name=None``) and attached to by name in the child.
+    One writer, one reader: the writer fills slot ``frame_id % slots`` and then
+    publishes ``frame_id``; the reader only ever looks at the newest frame.
+    """
+
+    def __init__(self, shape, slots=4, name=None):
+        self.shape = tuple(shape)
+        self.slots = slots
+        meta_offset = 64
+        frames_offset = _align(meta_offset + slots * META_DTYPE.itemsize)
+        frame_bytes = _align(int(np.prod(self.shape)))
+        create = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=create,
+                                              size=frames_offset + slots * frame_bytes if create else 0)
+        buf = self.shm.buf
+        self._latest = np.ndarray((1,), np.int64, buf, 0)
+        self.meta = np.ndarray((slots,), META_DTYPE, buf, meta_offset)
+        self._seq = self.meta["seq"]
+        self.frames = [np.ndarray(self.shape, np.uint8, buf, frames_offset + i * frame_bytes) for i in range(slots)]
+        if create:
+            self._latest[0] = 0
+            self.meta[:] = np.zeros(slots, META_DTYPE)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    # ---------- writer (vision process) ----------
+    def write(self, snapshot, times):
+        i = snapshot.frame_id % self.slots
+        seq = int(self._seq[i])
+        self._seq[i] = seq + 1                  # 奇数：正在写
+        frame = self.frames[i]
+        if snapshot.frame.shape == frame.shape:
+            np.copyto(frame, snapshot.frame)
+        else:
+            # 摄像头实际分辨率与探测时不同：缩放到槽的尺寸
+            cv2.resize(snapshot.frame, (self.shape[1], self.shape[0]), dst=frame)
+        read = times.get("cap.read", (0.0, 0.0))
+        infer = times.get("hands.process", (0.0, 0.0))
+        self.meta[i] = (seq + 1, snapshot.frame_id, snapshot.timestamp,
+                        np.nan if snapshot.hand_cx is None else snapshot.hand_cx,
+                        np.nan if snapshot.hand_target_x is None else snapshot.hand_target_x,
+                        GESTURE_CODES.get(snapshot.gesture, UNKNOWN), snapshot.detected,
+                        read[0], read[1], infer[0], infer[1])
+        self._seq[i] = seq + 2
+        self._latest[0] = snapshot.frame_id
+
+    # ---------- reader (game) ----------
+    def read(self, last_frame_id):
+        """``(frame copy, meta record)`` of the newest frame if it is newer than ``last_frame_id``, else None."""
+        frame_id = int(self._latest[0])
+        if frame_id == last_frame_id or frame_id == 0:
+            return None
+        i = frame_id % self.slots
+        seq = int(self._seq[i])
+        if seq & 1:
+            return None
+        frame = self.frames[i].copy()
+        meta = self.meta[i].copy()
+        if int(self._seq[i]) != seq or meta["frame_id"] != frame_id:
+            return None                         # 读的时候被覆盖了，下一帧再取
+        return frame, meta
+
+    def close(self):
+        self._latest = self.meta = self._seq = self.frames = None
+        self.shm.close()
+
+
+class _LastTimes(dict):
+    """Profiler stand-in for the child: keeps the latest (start, end) of each stage."""
+
+    def record(self, name, start, end):
+        self[name] = (start, end)
+
+
+def _vision_main(ring_name, shape, slots, stop, open_capture, open_hands, classify_gesture, screen_width,
+                 player_w, mark_gesture_hand, scheduler, debouncer):
+    ring = SharedFrameRing(shape, slots, name=ring_name)
+    times = _LastTimes()
+    worker = VisionWorker(open_capture(), open_hands(), classify_gesture, screen_width, player_w,
+                          mark_gesture_hand=mark_gesture_hand, profiler=times, scheduler=scheduler,
+                          debouncer=debouncer)
+    parent = multiprocessing.parent_process()
+    frame_id = 0
+    try:
+        while not stop.is_set():
+            times.clear()
+            snapshot = worker.poll(frame_id + 1)
+            if snapshot is None:
+                if parent is not None and not parent.is_alive():
+                    break
+                time.sleep(0.01)
+                continue
+            frame_id = snapshot.frame_id
+            ring.write(snapshot, times)
+            if frame_id % 30 == 0 and parent is not None and not parent.is_alive():
+                break                           # 游戏进程异常退出，不要一直占着摄像头
+    except KeyboardInterrupt:
+        pass
+    finally:
+        worker.stop()
+        ring.close()
+
+
+def mediapipe_hands(**options):
+    """``mp.solutions.hands.Hands(**options)``; picklable as ``functools.partial(mediapipe_hands, ...)``
+    without importing mediapipe in the game process."""
+    import mediapipe as mp
+    return mp.solutions.hands.Hands(**options)
+
+
+def _start_without_main(process):
+    # 游戏脚本没有 if __name__ == "__main__" 保护，spawn 出的子进程若重新执行它会再开一个游戏；
+    # 去掉 __main__.__file__ 后 multiprocessing 不会在子进程里导入主脚本
+    main = sys.modules["__main__"]
+    main_file = main.__dict__.pop("__file__", None)
+    try:
+        process.start()
+    finally:
+        if main_file is not None:
+            main.__file__ = main_file
+
+
+class VisionProcess:
+    """``VisionWorker`` running in its own process.
+
+    ``open_capture`` and ``open_hands`` are picklable callables (e.g.
+    ``functools.partial(cv2.VideoCapture, 0)``) that create the capture device
+    and the ``Hands`` instance inside the child; ``frame_shape`` sizes the ring
+    slots.  ``scheduler`` and ``debouncer`` are copied into the child.
+    """
+
+    def __init__(self, open_capture, open_hands, classify_gesture, screen_width, player_w, frame_shape,
+                 mark_gesture_hand=False, profiler=None, scheduler=None, debouncer=None, slots=4):
+        self.profiler = profiler    # 子进程回传的 cap.read / hands.process 耗时记在这里
+        self._ring = SharedFrameRing(frame_shape, slots)
+        self._latest = VisionSnapshot()
+        ctx = multiprocessing.get_context("spawn")
+        self._stop = ctx.Event()
+        self._process = ctx.Process(
+            target=_vision_main, name="vision-process", daemon=True,
+            args=(self._ring.name, self._ring.shape, slots, self._stop, open_capture, open_hands, classify_gesture,
+                  screen_width, player_w, mark_gesture_hand, scheduler, debouncer))
+
+    def start(self):
+        _start_without_main(self._process)
+        return self
+
+    @property
+    def latest(self):
+        if self._ring is None:
+            return self._latest
+        got = self._ring.read(self._latest.frame_id)
+        if got is None:
+            return self._latest
+        frame, m = got
+        hand_cx = float(m["hand_cx"])
+        hand_target_x = float(m["hand_target_x"])
+        self._latest = VisionSnapshot(int(m["frame_id"]), float(m["timestamp"]), frame,
+                                      None if hand_cx != hand_cx else hand_cx,
+                                      None if hand_target_x != hand_target_x else hand_target_x,
+                                      GESTURES[m["gesture"]], bool(m["detected"]))
+        if self.profiler is not None:
+            # perf_counter 是系统级单调时钟，子进程的时间戳可以直接放进同一条时间线
+            if m["read_end"]:
+                self.profiler.record("cap.read", float(m["read_start"]), float(m["read_end"]))
+            if m["infer_end"]:
+                self.profiler.record("hands.process", float(m["infer_start"]), float(m["infer_end"]))
+        return self._latest
+
+    def stop(self, timeout=2.0):
+        """Stop the child (which releases the camera and ``Hands``) and free the shared memory."""
+        if self._ring is None:
+            return
+        self._stop.set()
+        if self._process.is_alive():
+            self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join(1.0)
+        self._ring.close()
+        self._ring.shm.unlink()
+        self._ring = None
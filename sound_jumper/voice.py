@@ -0,0 +1,166 @@
+"""Streaming voice features and onset-based jump detection.
+
+The old path reduced every 1024-sample block (~23 ms) to one RMS value that the game
+sampled once per frame, so a short shout between two reads could be lost.  Here the
+audio is analysed in small hops; each hop updates an envelope follower and a
+peak-hold level, and spectral flux over a sliding window detects onsets.  Every hop's
+features and every onset are published as timestamped records on ``SpscRing``s, so
+the game sees all of them without taking a lock.
+
+Everything reachable from ``process_block`` runs on the PortAudio callback thread and
+works only in buffers allocated in ``__init__``: the mono mix/gain is written into a
+scratch array, the analysis window is assembled from a ring of hop slots, and the
+spectrum is a real DFT done as two ``np.dot(..., out=)`` calls against precomputed
+cos/sin tables (``np.fft.rfft`` would allocate its output on every hop).
+"""
+import math
+
+import numpy as np
+
+from .ring import SpscRing
+
+EVENT_DTYPE = np.dtype([("t", "f8"), ("level", "f4"), ("flux", "f4")])
+FEATURE_DTYPE = np.dtype([("t", "f8"), ("rms", "f4"), ("envelope", "f4"), ("peak", "f4"), ("flux", "f4")])
+
+
+class VoiceOnsetDetector:
+    def __init__(self, sample_rate=44100, hop=128, window=256, level_threshold=0.001,
+                 attack_ms=2.0, release_ms=120.0, hold_ms=60.0, flux_ratio=2.5, flux_floor=0.5,
+                 refractory_ms=150.0, strength_hops=0, event_capacity=256, feature_capacity=1024,
+                 max_block=4096):
+        self.sample_rate = sample_rate
+        self.hop = hop
+        self.window = window
+        self.level_threshold = level_threshold
+        self.flux_ratio = flux_ratio
+        self.flux_floor = flux_floor
+        hop_s = hop / sample_rate
+        self._attack = math.exp(-hop_s / (attack_ms / 1000.0))
+        self._release = math.exp(-hop_s / (release_ms / 1000.0))
+        self._hold_hops = max(1, int(round(hold_ms / 1000.0 / hop_s)))
+        self._refractory_hops = max(1, int(round(refractory_ms / 1000.0 / hop_s)))
+        self._flux_avg = math.exp(-hop_s / 0.5)  # 约 0.5 s 的 flux 背景均值
+        self.strength_hops = strength_hops
+
+        if window % hop:
+            raise ValueError("window must be a multiple of hop")
+        self._slots = np.zeros((window // hop, hop), np.float32)   # 最近 window/hop 个 hop 的采样
+        self._slot_pos = 0
+        self._hann = np.hanning(window).astype(np.float32)
+        self._windowed = np.zeros(window, np.float32)
+        self._pending = np.zeros(hop, np.float32)       # 不足一个 hop 的剩余采样
+        self._pending_n = 0
+        self._mono = np.zeros(max_block, np.float32)
+
+        bins = window // 2 + 1
+        phase = 2 * np.pi * np.outer(np.arange(bins), np.arange(window)) / window
+        self._cos = np.cos(phase).astype(np.float32)
+        self._sin = np.sin(phase).astype(np.float32)
+        self._re = np.zeros(bins, np.float32)
+        self._im = np.zeros(bins, np.float32)
+        self._log_mag = np.zeros(bins, np.float32)
+        self._prev_log_mag = np.zeros(bins, np.float32)
+
+        self.envelope = 0.0     # 包络跟随 (RMS 单位)
+        self.peak = 0.0         # 峰值保持 (RMS 单位)
+        self.flux = 0.0
+        self._flux_mean = 0.0
+        self._hold_left = 0
+        self._since_onset = 1 << 30
+        self._armed_t = None
+        self._armed_level = 0.0
+        self._armed_flux = 0.0
+        self._armed_left = 0
+
+        self.events = SpscRing(event_capacity, EVENT_DTYPE)
+        self.features = SpscRing(feature_capacity, FEATURE_DTYPE)
+
+    @property
+    def hop_seconds(self):
+        return self.hop / self.sample_rate
+
+    def process_block(self, indata, gain, t_end):
+        """Audio-callback entry point: mix ``indata`` (frames x channels) to mono, apply
+        ``gain`` and analyse it, without locks or per-call allocation."""
+        n = len(indata)
+        if n > len(self._mono):
+            self._mono = np.zeros(n, np.float32)  # 只会在第一次遇到更大的块时发生
+        mono = self._mono[:n]
+        if indata.ndim > 1 and indata.shape[1] > 1:
+            np.mean(indata, axis=1, out=mono)
+        else:
+            np.copyto(mono, indata[:, 0] if indata.ndim > 1 else indata, casting="unsafe")
+        if gain != 1.0:
+            np.multiply(mono, gain, out=mono)
+        self.process(mono, t_end)
+
+    def process(self, samples, t_end):
+        """Feed mono samples whose last sample was captured at ``t_end`` (perf_counter seconds)."""
+        n = len(samples)
+        i = 0
+        while i < n:
+            take = min(self.hop - self._pending_n, n - i)
+            self._pending[self._pending_n:self._pending_n + take] = samples[i:i + take]
+            self._pending_n += take
+            i += take
+            if self._pending_n == self.hop:
+                self._pending_n = 0
+                self._process_hop(self._pending, t_end - (n - i) / self.sample_rate)
+
+    def _process_hop(self, hop_samples, t):
+        hop = self.hop
+        slots = self._slots
+        k = len(slots)
+        slots[self._slot_pos] = hop_samples
+        self._slot_pos = (self._slot_pos + 1) % k
+        for j in range(k):  # 按时间顺序拼窗并同时乘 Hann 窗
+            np.multiply(slots[(self._slot_pos + j) % k], self._hann[j * hop:(j + 1) * hop],
+                        out=self._windowed[j * hop:(j + 1) * hop])
+
+        rms = math.sqrt(float(np.dot(hop_samples, hop_samples)) / self.hop)
+        coef = self._attack if rms > self.envelope else self._release
+        self.envelope = rms + (self.envelope - rms) * coef
+        if rms >= self.peak:
+            self.peak = rms
+            self._hold_left = self._hold_hops
+        elif self._hold_left > 0:
+            self._hold_left -= 1
+        else:
+            self.peak = max(rms, self.peak * self._release)
+
+        # spectral flux: 对数幅度谱只计正向增量
+        np.dot(self._cos, self._windowed, out=self._re)
+        np.dot(self._sin, self._windowed, out=self._im)
+        np.multiply(self._re, self._re, out=self._re)
+        np.multiply(self._im, self._im, out=self._im)
+        np.add(self._re, self._im, out=self._log_mag)
+        np.sqrt(self._log_mag, out=self._log_mag)
+        np.multiply(self._log_mag, 100.0, out=self._log_mag)
+        np.log1p(self._log_mag, out=self._log_mag)
+        np.subtract(self._log_mag, self._prev_log_mag, out=self._prev_log_mag)
+        np.maximum(self._prev_log_mag, 0.0, out=self._prev_log_mag)
+        flux = float(self._prev_log_mag.sum())
+        self._prev_log_mag, self._log_mag = self._log_mag, self._prev_log_mag
+        self.flux = flux
+
+        self._since_onset += 1
+        if self._armed_t is not None:
+            self._armed_level = max(self._armed_level, rms)
+            self._armed_left -= 1
+            if self._armed_left <= 0:
+                self.events.push(self._armed_t, self._armed_level, self._armed_flux)
+                self._armed_t = None
+        elif (self._since_onset >= self._refractory_hops and rms > self.level_threshold
+              and flux > self.flux_floor and flux > self._flux_mean * self.flux_ratio):
+            # 检测到起音：再看 strength_hops 个 hop 取最大电平作为这次喊声的强度
+            self._since_onset = 0
+            self._armed_t = t - self.hop_seconds
+            self._armed_level = rms
+            self._armed_flux = flux
+            self._armed_left = self.strength_hops
+            if self._armed_left <= 0:
+                self.events.push(self._armed_t, self._armed_level, self._armed_flux)
+                self._armed_t = None
+
+        self._flux_mean = flux + (self._flux_mean - flux) * self._flux_avg
+        self.features.push(t, rms, self.envelope, self.peak, flux)
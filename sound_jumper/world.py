@@ -0,0 +1,244 @@
+"""Struct-of-arrays world state for platforms and hazards.
+
+Every entity is a slot in a set of parallel NumPy columns.  Scrolling, falling,
+culling, hazard motion/bounce and (swept) collision are whole-array operations, and dead
+slots are removed by compacting the columns in place (order is preserved, so
+slot 0 is still the oldest surviving platform).
+"""
+import numpy as np
+
+from .collision import sweep
+from .platform_index import PlatformIndex
+
+# platform flags
+BOUNCY = 1
+FALLING = 2
+BROKEN = 4
+START = 8      # 开局的起始平台：永远不会塌（压缩后它不一定还在槽 0）
+
+
+class EntityArrays:
+    """Parallel NumPy columns with amortised growth; ``arrays.x`` is a view of the live slots."""
+    FIELDS = ()
+
+    def __init__(self, capacity=64):
+        self.n = 0
+        self._cols = {name: np.zeros(capacity, dtype) for name, dtype in self.FIELDS}
+        self._make_scratch(capacity)
+
+    def _make_scratch(self, capacity):
+        # compact 用的预分配缓冲，剔除时不分配新数组
+        self._pos = np.zeros(capacity, np.intp)
+        self._pos_rev = np.zeros(capacity, np.intp)
+        self._order_rev = np.arange(capacity - 1, -1, -1, dtype=np.intp)   # capacity-1 .. 0
+        self._gather = np.zeros(capacity + 1, np.intp)
+        self._scratch = {np.dtype(dtype): np.zeros(capacity, dtype) for _, dtype in self.FIELDS}
+
+    def __getattr__(self, name):
+        cols = self.__dict__.get("_cols")
+        if cols is not None and name in cols:
+            return cols[name][:self.n]
+        raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        # ``arrays.y += d`` works in place on the view and then assigns it back; skip that write
+        cols = self.__dict__.get("_cols")
+        if cols is not None and name in cols:
+            col = cols[name]
+            if not (isinstance(value, np.ndarray) and value.base is col):
+                col[:self.n] = value
+            return
+        object.__setattr__(self, name, value)
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def capacity(self):
+        return len(next(iter(self._cols.values())))
+
+    def reserve(self, count):
+        if self.n + count <= self.capacity:
+            return
+        new_cap = max(self.capacity * 2, self.n + count)
+        for name, col in self._cols.items():
+            grown = np.zeros(new_cap, col.dtype)
+            grown[:self.n] = col[:self.n]
+            self._cols[name] = grown
+        self._make_scratch(new_cap)
+
+    def append(self, **values):
+        self.reserve(1)
+        i = self.n
+        for name, value in values.items():
+            self._cols[name][i] = value
+        self.n += 1
+        return i
+
+    def extend(self, **columns):
+        count = len(next(iter(columns.values())))
+        self.reserve(count)
+        for name, values in columns.items():
+            self._cols[name][self.n:self.n + count] = values
+        self.n += count
+
+    def compact(self, keep):
+        """Drop every slot where ``keep`` is False, preserving order, without allocating."""
+        n = self.n
+        k = int(np.count_nonzero(keep))
+        if k == n:
+            return
+        # 保留的第 j 个槽位 i 满足 cumsum(keep)[i] == j + 1；把每个 i 写到 gather[cumsum[i]]，
+        # 倒着写，同一位置最后写入的就是那个保留的槽位（开头被丢弃的都落在废弃的 0 号位置）
+        pos, pos_rev = self._pos[:n], self._pos_rev[:n]
+        np.copyto(pos, keep)
+        np.cumsum(pos, out=pos)
+        np.copyto(pos_rev, pos[::-1])
+        gather = self._gather
+        np.put(gather, pos_rev, self._order_rev[len(self._order_rev) - n:], mode="clip")
+        gather = gather[1:k + 1]
+        for col in self._cols.values():
+            scratch = self._scratch[col.dtype][:k]
+            np.take(col[:n], gather, out=scratch, mode="clip")
+            col[:k] = scratch
+        self.n = k
+
+    def clear(self):
+        self.n = 0
+
+
+# px/py hold the position at the previous simulation tick, for render interpolation
+class PlatformArrays(EntityArrays):
+    FIELDS = (("x", np.float64), ("y", np.float64), ("w", np.float64), ("h", np.float64), ("flags", np.uint8),
+              ("px", np.float64), ("py", np.float64))
+
+
+class HazardArrays(EntityArrays):
+    FIELDS = (("x", np.float64), ("y", np.float64), ("w", np.float64), ("h", np.float64), ("vx", np.float64),
+              ("px", np.float64), ("py", np.float64))
+
+
+class World:
+    """Platforms and hazards for one game, in screen coordinates."""
+
+    def __init__(self, width, height, platform_height=15, hazard_size=15, band_height=64, cull_below=200):
+        self.width = width
+        self.height = height
+        self.platform_height = platform_height
+        self.hazard_size = hazard_size
+        self.cull_below = cull_below  # 低于屏幕底部这么多像素的平台已经不可能再被踩到
+        self.platforms = PlatformArrays()
+        self.hazards = HazardArrays()
+        self.index = PlatformIndex(band_height)
+        self._index_dirty = True
+        self._buffers = {}
+
+    def clear(self):
+        self.platforms.clear()
+        self.hazards.clear()
+        self._index_dirty = True
+
+    def _buffer(self, name, n, dtype):
+        """Reusable scratch array of length ``n``; grows by doubling, so per-tick masks do not allocate."""
+        buf = self._buffers.get(name)
+        if buf is None or len(buf) < n:
+            buf = self._buffers[name] = np.zeros(max(64, 2 * n), dtype)
+        return buf[:n]
+
+    # ---------- creation ----------
+    def add_platform(self, x, y, w, bouncy=False, start=False):
+        self._index_dirty = True
+        flags = (BOUNCY if bouncy else 0) | (START if start else 0)
+        return self.platforms.append(x=x, y=y, w=w, h=self.platform_height, flags=flags,
+                                     px=x, py=y)
+
+    def add_hazard(self, x, y, vx):
+        return self.hazards.append(x=x, y=y, w=self.hazard_size, h=self.hazard_size, vx=vx, px=x, py=y)
+
+    def add_chunk(self, chunk, scroll):
+        """Copy a ``level.LevelChunk`` in, shifted from level coordinates to the screen by ``scroll``."""
+        n = chunk.n
+        if n:
+            p = self.platforms
+            start = p.n
+            p.extend(x=chunk.x[:n], y=chunk.y[:n], w=chunk.w[:n], flags=chunk.flags[:n], px=chunk.x[:n],
+                     py=chunk.y[:n], h=self.platform_height)
+            p.y[start:] += scroll
+            p.py[start:] += scroll
+            self._index_dirty = True
+        if chunk.hazard:
+            y = chunk.hazard_y + scroll
+            self.add_hazard(chunk.hazard_x, y, chunk.hazard_vx)
+
+    # ---------- per-step updates ----------
+    def save_previous(self):
+        """Remember current positions; call at the start of every simulation tick."""
+        for arrays in (self.platforms, self.hazards):
+            arrays.px[:] = arrays.x
+            arrays.py[:] = arrays.y
+
+    def scroll(self, amount, fall_speed):
+        """Shift the world down by ``amount`` (falling platforms by ``fall_speed``) and cull what
+        has dropped out below.  Terrain above the top edge is kept: it was generated ahead."""
+        limit = self.height + self.cull_below
+        p = self.platforms
+        bits = np.bitwise_and(p.flags, FALLING, out=self._buffer("bits", p.n, np.uint8))
+        mask = np.not_equal(bits, 0, out=self._buffer("mask", p.n, bool))
+        np.add(p.y, fall_speed, out=p.y, where=mask)     # 正在掉落的平台按自己的速度走
+        np.add(p.y, amount, out=p.y, where=np.logical_not(mask, out=mask))
+        p.compact(np.less(p.y, limit, out=mask))
+
+        h = self.hazards
+        h.y += amount
+        h.compact(np.less(h.y, limit, out=self._buffer("mask", h.n, bool)))
+
+        self._index_dirty = True
+
+    def move_hazards(self):
+        h = self.hazards
+        h.x += h.vx
+        out = (h.x < 0) | (h.x + h.w > self.width)
+        h.vx[out] *= -1
+
+    def mark_falling(self, i):
+        self.platforms.flags[i] |= FALLING | BROKEN
+
+    def clear_hazards(self):
+        self.hazards.clear()
+
+    def remove_hazards(self, mask):
+        self.hazards.compact(~mask)
+
+    # ---------- queries ----------
+    @staticmethod
+    def interpolate(arrays, alpha):
+        """Render positions between the previous and the current tick."""
+        return arrays.px + (arrays.x - arrays.px) * alpha, arrays.py + (arrays.y - arrays.py) * alpha
+
+    def find_landing(self, left, bottom, width, dx, dy, tolerance=20):
+        """Platform the player's feet reach first while moving by (dx, dy) from ``left``/``bottom``
+        (ties in slot order), or -1.  Feet that start up to ``tolerance`` px below a top still land."""
+        if self._index_dirty:
+            p = self.platforms
+            self.index.rebuild(p.y, (p.flags & FALLING) == 0)
+            self._index_dirty = False
+        cand = self.index.candidates(bottom - tolerance - 1, bottom + max(dy, 0))
+        if len(cand) == 0:
+            return -1
+        p = self.platforms
+        # 脚底是一条 tolerance 高的窄条，平台只看上沿（高度 0）
+        toi = sweep(left, bottom - tolerance, width, tolerance, dx, dy, p.x[cand], p.y[cand], p.w[cand], 0.0)
+        toi[(p.flags[cand] & FALLING) != 0] = np.inf
+        first = np.argmin(toi)
+        return int(cand[first]) if toi[first] <= 1 else -1
+
+    def hazard_hits(self, left, top, width, height, dx, dy):
+        """Boolean mask of hazards the player rect touches while moving by (dx, dy), each hazard
+        sweeping from its position at the start of the tick to the current one."""
+        h = self.hazards
+        # 先按竖直方向粗筛：大多数 tick 没有障碍在玩家这一段高度附近，省掉完整的扫掠计算
+        y0, y1 = min(top, top + dy), max(top, top + dy) + height
+        near = (np.minimum(h.y, h.py) < y1) & (np.maximum(h.y, h.py) + h.h > y0)
+        if not near.any():
+            return near
+        return near & (sweep(left, top, width, height, dx, dy, h.px, h.py, h.w, h.h, h.x - h.px, h.y - h.py) <= 1)
@@ -1,12 +1,43 @@
+import time
+STARTUP_T0 = time.perf_counter()   # 首帧耗时从这里算起
 import pygame
 import numpy as np
-import sounddevice as sd
-import threading
-import time
 import random
-import cv2
-import mediapipe as mp
 import os
+import functools
+
+from sound_jumper.audio_devices import AudioDeviceManager
+from sound_jumper.dirty import DirtyRenderer
+from sound_jumper.filters import make_filter
+from sound_jumper.gestures import GestureDebouncer, classify_hand
+from sound_jumper.hud import CachedText, ProfilerOverlay, SkillPanel, TextCache
+from sound_jumper.paths import cache_dir
+from sound_jumper.profiler import FrameProfiler
+from sound_jumper.recording import RecordingWriter, ReplaySource
+from sound_jumper.sim import SimConfig, Simulation, hand_to_screen_x
+from sound_jumper.startup import StartupTasks
+from sound_jumper.sprites import load_sprite_atlas
+from sound_jumper.tiles import TileSet
+from sound_jumper.timestep import FixedTimestep
+from sound_jumper.voice import VoiceOnsetDetector
+from sound_jumper.world import World
+
+# 录制 / 回放：SOUND_JUMPER_RECORD=文件 记录每个 tick 的输入；
+# SOUND_JUMPER_REPLAY=文件 用录像代替麦克风、摄像头和键盘（SOUND_JUMPER_REPLAY_SPEED=N 倍速）
+RECORD_PATH = os.environ.get("SOUND_JUMPER_RECORD")
+REPLAY_PATH = os.environ.get("SOUND_JUMPER_REPLAY")
+REPLAY_SPEED = max(1, int(os.environ.get("SOUND_JUMPER_REPLAY_SPEED", "1")))
+# 性能分析：F3 显示/隐藏各阶段耗时，F4 导出；SOUND_JUMPER_PROFILE=路径前缀 则退出时自动导出
+PROFILE_PREFIX = os.environ.get("SOUND_JUMPER_PROFILE")
+# SOUND_JUMPER_LANDMARK_TRACE=文件.npy 退出时保存手部检测轨迹（供 benchmarks/bench_hand_filter.py 使用）
+LANDMARK_TRACE_PATH = os.environ.get("SOUND_JUMPER_LANDMARK_TRACE")
+# SOUND_JUMPER_VISION_PROCESS=1 摄像头与手部识别放到独立进程（画面经共享内存传回），占满第二个核心
+VISION_PROCESS = os.environ.get("SOUND_JUMPER_VISION_PROCESS") == "1"
+# SOUND_JUMPER_GPU=1 摄像头背景、变暗和缩放交给 SDL Renderer（pygame._sdl2）在显卡上合成；
+# SOUND_JUMPER_LOGICAL_SIZE=1920x1080 让游戏按这个逻辑分辨率绘制，再由显卡放大到屏幕
+GPU_RENDERER = os.environ.get("SOUND_JUMPER_GPU") == "1"
+LOGICAL_SIZE = os.environ.get("SOUND_JUMPER_LOGICAL_SIZE")
+replay = ReplaySource(REPLAY_PATH) if REPLAY_PATH else None
 
 # ---------- 1. 初始化 & 屏幕设置 ----------
 pygame.init()
@@ -14,78 +45,76 @@ pygame.mixer.init()
 
 info = pygame.display.Info()
 WIDTH, HEIGHT = info.current_w, info.current_h
-screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
-pygame.display.set_caption("Sound Jumper - Space Edition")
+display_flags = pygame.FULLSCREEN
+if GPU_RENDERER and LOGICAL_SIZE:
+    WIDTH, HEIGHT = (int(v) for v in LOGICAL_SIZE.split("x"))
+if replay is not None and (replay.meta["width"], replay.meta["height"]) != (WIDTH, HEIGHT):
+    # 回放必须使用录制时的分辨率，否则关卡生成与碰撞结果不同
+    WIDTH, HEIGHT = replay.meta["width"], replay.meta["height"]
+    display_flags = 0
+gpu = None
+if GPU_RENDERER:
+    from sound_jumper.gpu import GpuRenderer
+    # convert() / convert_alpha() 需要一个显示模式：开一个隐藏的 1x1 窗口只提供像素格式
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    fullscreen = display_flags == pygame.FULLSCREEN
+    gpu = GpuRenderer((WIDTH, HEIGHT), (info.current_w, info.current_h) if fullscreen else (WIDTH, HEIGHT),
+                      "Sound Jumper - Space Edition", fullscreen=fullscreen)
+    screen = gpu.screen
+else:
+    screen = pygame.display.set_mode((WIDTH, HEIGHT), display_flags)
+    pygame.display.set_caption("Sound Jumper - Space Edition")
+
+# 主循环每一段（以及视觉线程的 cap.read / hands.process、后台启动任务）的耗时
+profiler = FrameProfiler()
+
+# 分阶段启动：mediapipe / cv2 的导入、手部模型、摄像头探测、角色与背景图都在后台线程并发加载，
+# 开始界面立刻出现；各部分完成后由主循环里的 apply_startup() 接入，全部就绪前不能开始游戏
+startup = StartupTasks(profiler)
 
 # ---------- 2. 音频处理 ----------
 SAMPLE_RATE = 44100
-FRAME_SIZE = 1024
-volume_rms = 0.0
+FRAME_SIZE = 128            # 每个 hop 约 2.9 ms，越小延迟越低
+VOICE_JUMP_BUFFER = 0.2     # 起音事件在这段时间内没被用掉就作废（秒）
 input_gain = 1.0
-lock = threading.Lock()
 
+# 实时音频线程：不加锁、不分配内存，只把特征和起音事件写进环形缓冲
 def audio_callback(indata, frames, time_info, status):
-    global volume_rms
     if status: pass
-    mono = np.mean(indata, axis=1) if indata.ndim > 1 else indata
-    with lock: g = input_gain
-    mono = mono * g
-    rms = np.sqrt(np.mean(mono.astype(np.float64)**2))
-    with lock: volume_rms = rms
-
-def start_audio_stream(device=None):
-    try:
-        stream = sd.InputStream(
-            channels=1,
-            samplerate=SAMPLE_RATE,
-            blocksize=FRAME_SIZE,
-            callback=audio_callback,
-            device=device
-        )
-        stream.start()
-        print(f"音频流已在设备上启动: {sd.query_devices(device)['name'] if device is not None else 'Default'}")
-        return stream
-    except Exception as e:
-        print(f"音频错误: {e}")
-        return None
+    voice.process_block(indata, input_gain, time.perf_counter())
 
 # ---------- 3. MediaPipe 手势识别 ----------
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(
+HANDS_OPTIONS = dict(
     static_image_mode=False,
     max_num_hands=2,
     min_detection_confidence=0.5,
     min_tracking_confidence=0.5
 )
-
-CAMERA_INDEX = 0
-cap = None
-camera_available = False
-try:
-    cap = cv2.VideoCapture(CAMERA_INDEX)
-    if cap.isOpened():
-        ret, frame = cap.read()
-        if ret:
-            camera_available = True
-            print("摄像头已启动")
-        else: cap.release(); cap = None
-except: pass
-
-def count_extended_fingers(hand_landmarks):
-    TIPS = [4, 8, 12, 16, 20]
-    PIPS = [2, 6, 10, 14, 18]
-    extended = [0, 0, 0, 0, 0]
-    for i in range(1, 5):
-        if hand_landmarks.landmark[TIPS[i]].y < hand_landmarks.landmark[PIPS[i]].y:
-            extended[i] = 1
-    if hand_landmarks.landmark[TIPS[0]].x < hand_landmarks.landmark[PIPS[0]].x:
-        extended[0] = 1
-    count = sum(extended)
-    if count >= 4: return "PALM"
-    if count <= 1: return "FIST"
-    if extended[1] and extended[2] and not extended[0] and not extended[3] and not extended[4]:
-        return "VICTORY"
-    return "UNKNOWN"
+# 候选摄像头（索引或网络地址）并发探测，按分辨率 / 帧率选最好的一个；
+# 选中的设备记在缓存目录里，下次启动直接打开它，不再逐个探测。
+# 默认和以前一样只用 0 号摄像头；SOUND_JUMPER_CAMERAS=0,1,rtsp://... 才会在多个设备里挑
+# （注意虚拟摄像头、采集卡也可能被选中）
+CAMERA_SOURCES = [int(s) if s.strip().isdigit() else s.strip()
+                  for s in os.environ.get("SOUND_JUMPER_CAMERAS", "0").split(",") if s.strip()]
+CAMERA_PROBE_TIMEOUT = 3.0
+CAPTURE_SETTINGS = dict(width=1280, height=720, fps=30, fourcc="MJPG", buffer_size=1)
+
+def load_hands():
+    import mediapipe as mp
+    return mp.solutions.hands.Hands(**HANDS_OPTIONS)
+
+def probe_camera():
+    """找到并打开摄像头，返回 CameraProbe；没有可用摄像头时返回 None"""
+    from sound_jumper.camera import find_camera
+    camera = find_camera(CAMERA_SOURCES, CAMERA_PROBE_TIMEOUT, **CAPTURE_SETTINGS)
+    if camera is not None: print(f"摄像头已启动: {camera}")
+    return camera
+
+# 回放时摄像头状态来自录像，不打开摄像头；进程模式下 Hands 由子进程自己加载
+camera_available = bool(replay.meta["camera"]) if replay is not None else False
+if replay is None:
+    startup.submit("camera", probe_camera)
+    if not VISION_PROCESS: startup.submit("hands", load_hands)
 
 # ---------- 4. 游戏变量 ----------
 clock = pygame.time.Clock()
@@ -93,9 +122,6 @@ FONT = pygame.font.SysFont(None, 30)
 BIG_FONT = pygame.font.SysFont(None, 60)
 
 player_w, player_h = 40, 40
-player_x = WIDTH//2 - player_w//2
-player_y = -50
-velocity_y = 0
 gravity = 1.5
 PLATFORM_FALL_SPEED = 20
 
@@ -103,37 +129,36 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 
 # ========== [加载 48x48 角色] ==========
 sprite_loaded = False
+sprite_atlas = None
 animation_frames = []
 current_frame_index = 0
 
-try:
+def load_character():
     image_path = os.path.join(script_dir, "character_sheet.png")
     if not os.path.exists(image_path):
         print(f"提示: 未找到 {image_path}，将使用默认方块。")
-    else:
-        sprite_sheet = pygame.image.load(image_path).convert_alpha()
-        sheet_width = sprite_sheet.get_width()
-        FRAME_W = 48
-        FRAME_H = 48
-        FRAME_COUNT = sheet_width // FRAME_W
-        print(f"角色加载成功：{sheet_width}x{sprite_sheet.get_height()}，包含 {FRAME_COUNT} 帧")
-
-        animation_frames = []
-        for i in range(FRAME_COUNT):
-            frame_surf = sprite_sheet.subsurface((i * FRAME_W, 0, FRAME_W, FRAME_H))
-            scaled_frame = pygame.transform.scale(frame_surf, (48, 48))
-            animation_frames.append(scaled_frame)
-
-        if len(animation_frames) > 0:
-            sprite_loaded = True
-except Exception as e:
-    print(f"角色加载出错: {e}")
-    sprite_loaded = False
+        return None
+    FRAME_W = 48
+    FRAME_H = 48
+    # 缩放、镜像、convert_alpha 都在加载时做完（并缓存到磁盘），绘制时只需 blit
+    atlas = load_sprite_atlas(image_path, FRAME_W, FRAME_H, (48, 48), smooth=False)
+    if atlas is not None and len(atlas) > 0:
+        print(f"角色加载成功：包含 {len(atlas)} 帧")
+        return atlas
+    return None
 
 # ========== [新增：加载背景图片] ==========
-game_bg_image = None
-try:
-    bg_filename = "bg.jpg" 
+CAMERA_WEIGHT = 0.7 
+BACKGROUND_WEIGHT = 0.3
+BG_COMPOSITE_SCALE = 1.0  # <1.0 时以较低分辨率合成背景，再由 SDL 放大到全屏
+background_compositor = None
+
+def load_background():
+    """读取背景图并建好摄像头画面的合成缓冲"""
+    import cv2
+    from sound_jumper.compositor import BackgroundCompositor
+    game_bg_image = None
+    bg_filename = "bg.jpg"
     bg_path = os.path.join(script_dir, bg_filename)
     if os.path.exists(bg_path):
         loaded_bg = cv2.imread(bg_path)
@@ -144,11 +169,12 @@ try:
             print("背景图片读取失败。")
     else:
         print(f"提示: 未找到背景图片 {bg_filename}")
-except Exception as e:
-    print(f"背景加载出错: {e}")
+    if GPU_RENDERER:
+        return game_bg_image   # 显卡混合摄像头画面，不需要 CPU 合成缓冲
+    return BackgroundCompositor((WIDTH, HEIGHT), BG_COMPOSITE_SCALE, game_bg_image, CAMERA_WEIGHT, BACKGROUND_WEIGHT)
 
-CAMERA_WEIGHT = 0.7 
-BACKGROUND_WEIGHT = 0.3
+startup.submit("character", load_character)
+startup.submit("background", load_background)
 # ========================================
 
 VOLUME_THRESHOLD = 0.001
@@ -157,363 +183,438 @@ BOUNCE_MULTIPLIER = 2.0
 volume_sensitivity_adjusted = VOLUME_SENSITIVITY
 
 skills = {
-    "RESCUE": {"cooldown": 5.0, "last_use": 0, "color": (255, 165, 0), "name": "Rescue (V-Sign/1)"},
-    "SHIELD": {"cooldown": 8.0, "last_use": 0, "color": (255, 215, 0), "name": "Shield (Fist/2)"},
-    "BLAST":  {"cooldown": 10.0, "last_use": 0, "color": (0, 255, 255), "name": "Blast (Palm/3)"}
+    "RESCUE": {"color": (255, 165, 0), "name": "Rescue (V-Sign/1)"},
+    "SHIELD": {"color": (255, 215, 0), "name": "Shield (Fist/2)"},
+    "BLAST":  {"color": (0, 255, 255), "name": "Blast (Palm/3)"}
 }
-shield_active_end = 0.0
-shockwave_radius = 0
+GESTURE_SKILLS = {"VICTORY": "RESCUE", "FIST": "SHIELD", "PALM": "BLAST"}
+KEY_SKILLS = {pygame.K_1: "RESCUE", pygame.K_2: "SHIELD", pygame.K_3: "BLAST"}
 
-keyboard_target_x = WIDTH // 2
 keyboard_move_speed = 15
 
-platforms = []
-hazards = []
 PLATFORM_HEIGHT = 15
 HAZARD_SIZE, HAZARD_SPEED = 15, 10
+TICK_RATE = 60   # 物理模拟频率（所有速度/重力都按每 tick 计）
+LEVEL_LOOKAHEAD = 3   # 后台线程提前备好的地形块数（每块一屏高）
+
+# 物理、关卡生成与技能都在 sound_jumper.sim 里（无 pygame 依赖，可无头运行和回放）；
+# 平台与障碍存放在 sim.world 的 NumPy 列数组里
+sim_config = SimConfig(WIDTH, HEIGHT, player_w, player_h, gravity, PLATFORM_FALL_SPEED, PLATFORM_HEIGHT,
+                       HAZARD_SIZE, HAZARD_SPEED, VOLUME_THRESHOLD, VOLUME_SENSITIVITY, BOUNCE_MULTIPLIER,
+                       keyboard_move_speed, camera_available, TICK_RATE, LEVEL_LOOKAHEAD)
+sim = Simulation(sim_config)
+world = sim.world
 
-# ----------- PLATFORM WIDTH FUNCTION -----------
-def get_platform_width(y, scroll):
-    min_width = 60
-    max_width = 220
-    shrink_factor = max(0, min(1, scroll / 8000))
-    width = int(max_width - (max_width - min_width) * shrink_factor)
-    return width
-
-def generate_initial_platforms():
-    global platforms
-    platforms.clear()
-    start_plat_w = 220
-    platforms.append((pygame.Rect(WIDTH // 2 - start_plat_w // 2, HEIGHT - 150, start_plat_w, 15), True, False, False))
-
-    y = HEIGHT - 300
-    while y > -HEIGHT:
-        plat_w = get_platform_width(y, 0)
-        x = random.randint(0, WIDTH - plat_w)
-        is_bouncing = random.random() < 0.25
-        platforms.append((pygame.Rect(x, y, plat_w, PLATFORM_HEIGHT), is_bouncing, False, False))
-        y -= random.randint(80, 140)
-
-def generate_hazard(highest_y):
-    x = random.randint(0, WIDTH)
-    y = highest_y - random.randint(100, 300)
-    vx = random.choice([-HAZARD_SPEED, HAZARD_SPEED])
-    hazards.append((pygame.Rect(x, y, HAZARD_SIZE, HAZARD_SIZE), vx))
-
-generate_initial_platforms()
-
-score = 0
-is_jumping = False
-scroll = 0
 game_state = "START"
-hand_target_x = WIDTH // 2
-initial_drop = True
+hand_target_x = None   # 视觉线程给出的最新目标，交给下一个 tick
+pending_skill = None
+
+# HUD 文字与技能面板缓存，避免每帧重新渲染文字、创建 Surface
+text_cache = TextCache()
+score_text = CachedText(BIG_FONT, (255, 255, 255))
+skill_panels = {key: SkillPanel(FONT, skill["name"], skill["color"]) for key, skill in skills.items()}
 
 dim_surface = pygame.Surface((WIDTH, HEIGHT))
 dim_surface.set_alpha(100)
 dim_surface.fill((0, 0, 0))
 
-# ----- [NEW] Sound Device Selection Setup -----
-try:
-    input_devices = [d for d in sd.query_devices() if d['max_input_channels'] > 0]
-    if not input_devices:
-        print("警告: 未找到任何音频输入设备！")
-except Exception as e:
-    input_devices = []
-    print(f"查询音频设备时出错: {e}")
+# 没有摄像头画面时背景是静止的：变暗后的背景只合成一次，每帧只擦除、重画并提交变化的区域
+# （4K 下整屏半透明混合和整屏 flip 是最大的开销）。mark() 登记每次绘制返回的矩形
+DIRTY_RENDERING = True
+static_background = pygame.Surface((WIDTH, HEIGHT))
+static_background.fill((20, 20, 30))
+static_background.blit(dim_surface, (0, 0))
+# GPU 模式下由 GpuRenderer 接管背景、变暗与提交（接口与 DirtyRenderer 相同）
+renderer = gpu if gpu is not None else DirtyRenderer(screen, static_background.convert())
+mark = renderer.add
+# 平台按种类和宽度预渲染成贴图、障碍烘成一张小图，每层一次 screen.blits
+tiles = TileSet(PLATFORM_HEIGHT, HAZARD_SIZE)
+
+# 包络 / 峰值保持 / spectral flux 起音检测；起音事件经无锁环形缓冲交给主循环
+voice = VoiceOnsetDetector(SAMPLE_RATE, hop=FRAME_SIZE, window=2 * FRAME_SIZE, level_threshold=VOLUME_THRESHOLD)
+pending_voice_level = 0.0
+pending_voice_time = 0.0
+
+# ----- Sound Device Selection Setup -----
+# 设备枚举、开流、切换都在后台线程完成，渲染循环从不等待音频设备
+audio_devices = AudioDeviceManager(audio_callback, SAMPLE_RATE, FRAME_SIZE).start() if replay is None else None
+audio_devices_changed = False   # SDL 报告了输入设备热插拔，待重新枚举
+
+def capture_device_names():
+    """SDL 看到的输入设备名（拿不到时为 None）"""
+    try:
+        from pygame._sdl2 import audio as sdl_audio
+        return frozenset(sdl_audio.get_audio_device_names(True))
+    except Exception:
+        return None
 
-selected_device_index = 0
+capture_devices = capture_device_names()
 
 def get_selected_device_name():
-    if input_devices and selected_device_index < len(input_devices):
-        name = input_devices[selected_device_index]['name']
-        return (name[:40] + '...') if len(name) > 43 else name
-    else:
-        return "No Input Device Found"
-
-# Start initial audio stream
-audio_stream = start_audio_stream(input_devices[selected_device_index]['index'] if input_devices else None)
+    if audio_devices is None:
+        return "Replay: " + os.path.basename(REPLAY_PATH)
+    name = audio_devices.selected_name()
+    if name is None:
+        return "Scanning..." if not audio_devices.scanned else "No Input Device Found"
+    name = (name[:40] + '...') if len(name) > 43 else name
+    return name + " (switching...)" if audio_devices.switching else name
 # ---------------------------------------------
 
+profiler_overlay = ProfilerOverlay(profiler, pygame.font.SysFont("monospace", 16))
+
+def export_profile(prefix=None):
+    if prefix is None:
+        prefix = os.path.join(cache_dir(), "profile-" + time.strftime("%Y%m%d-%H%M%S"))
+    for path in profiler.export_all(prefix): print(f"性能数据已导出: {path}")
+
+# 摄像头读取与手势识别在后台线程（或 VISION_PROCESS 时的独立进程）中进行，主循环只读取最新结果。
+# 推理在缩小后的画面上进行，并按耗时预算自动决定每几帧检测一次，中间帧外推手的位置
+VISION_INFERENCE_WIDTH = 320
+VISION_BUDGET_MS = 8.0      # 平摊到每个摄像头帧的 hands.process 耗时上限
+vision_worker = None
+
+def start_vision():
+    """摄像头和手部模型都就绪后启动视觉线程（或进程）；没有摄像头时返回 None，不等模型加载完"""
+    camera = startup.wait("camera")
+    if camera is None:
+        return None
+    from sound_jumper.vision import VisionScheduler, VisionWorker
+    vision_scheduler = VisionScheduler(VISION_INFERENCE_WIDTH, budget_ms=VISION_BUDGET_MS)
+    if VISION_PROCESS:
+        # 子进程按探测结果自己打开摄像头和 Hands，这里的探测用完即释放
+        from sound_jumper.camera import open_capture
+        from sound_jumper.vision_process import VisionProcess, mediapipe_hands
+        camera.cap.release()
+        return VisionProcess(functools.partial(open_capture, camera.source, **CAPTURE_SETTINGS),
+                             functools.partial(mediapipe_hands, **HANDS_OPTIONS), classify_hand, WIDTH, player_w,
+                             camera.frame_shape, profiler=profiler, scheduler=vision_scheduler,
+                             debouncer=GestureDebouncer()).start()
+    hands = startup.wait("hands")
+    if hands is None:
+        camera.cap.release()
+        return None
+    return VisionWorker(camera.cap, hands, classify_hand, WIDTH, player_w, profiler=profiler, scheduler=vision_scheduler,
+                        debouncer=GestureDebouncer()).start()
+
+if replay is None: startup.submit("vision", start_vision)
+last_vision_frame_id = 0
+bg_ready = False
+
+# 手部位置滤波："none" / "one_euro" / "kalman"。按画面的拍摄时间喂入检测结果，
+# 再预测到这一帧上屏的时刻，抵消摄像头管线和转向平滑带来的延迟
+HAND_FILTER = "kalman"
+HAND_PREDICT_AHEAD = 0.05   # 从当前时刻往后预测多少秒
+hand_filter = make_filter(HAND_FILTER)
+landmark_log = [] if LANDMARK_TRACE_PATH else None
+
+MAX_FPS = 144    # 渲染帧率上限，0 = 不限制
+sim_clock = FixedTimestep(TICK_RATE)
+current_rms = 0.0
+
+recorder = None
+replay_resume_at = 0.0
+
+# 后台启动任务 -> 游戏状态；摄像头与手部模型由 start_vision 合成一个 "vision" 结果
+STARTUP_LABELS = {"camera": "camera", "hands": "hand model", "character": "character", "background": "background"}
+startup_ready = False
+startup_applied = set()
+
+def adopt_startup():
+    """接入已经完成的后台启动任务（只接管结果，不产生别的副作用；退出时也用它回收资源）"""
+    global vision_worker, camera_available, background_compositor, sprite_atlas, animation_frames, sprite_loaded
+    for name in startup.names:
+        if name in startup_applied or not startup.done(name): continue
+        startup_applied.add(name)
+        result = startup.result(name)
+        if name == "character" and result is not None:
+            sprite_atlas, animation_frames, sprite_loaded = result, result.frames, True
+        elif name == "background":
+            if gpu is not None: gpu.set_background(result)   # 纹理只能在主线程创建
+            else: background_compositor = result
+        elif name == "vision":
+            vision_worker = result
+            camera_available = vision_worker is not None
+            sim_config.camera = camera_available
+
+def apply_startup():
+    """接入已完成的任务；全部完成时报告启动耗时、开始录制并返回 True（开始游戏也要等到这时）"""
+    global recorder
+    adopt_startup()
+    if not startup.done():
+        return False
+    profiler.metric("time_to_ready_ms", (time.perf_counter() - STARTUP_T0) * 1000)
+    print(f"启动完成: {profiler.metrics['time_to_ready_ms']:.0f} ms（" +
+          "，".join(f"{n} {(t1 - t0) * 1000:.0f} ms" for n, (t0, t1) in startup.timings.items()) + "）")
+    if RECORD_PATH:
+        recorder = RecordingWriter(RECORD_PATH, width=WIDTH, height=HEIGHT, camera=camera_available,
+                                   tick_rate=TICK_RATE)
+        print(f"正在录制输入到 {RECORD_PATH}")
+    return True
+
+def startup_status():
+    """加载中的提示文字"""
+    pending = [STARTUP_LABELS[n] for n in startup.pending() if n in STARTUP_LABELS] or ["hand tracking"]
+    return "Loading " + ", ".join(pending) + "..."
+
+first_frame = True
 running = True
 while running:
+    profiler.begin_frame()
+    if not startup_ready: startup_ready = apply_startup()
     # ------------------ 输入与背景处理 ------------------
-    bg_surface = None
     current_gesture = "NONE"
-
-    if camera_available and cap is not None:
-        success, image = cap.read()
-        if success:
-            image = cv2.flip(image, 1)
-            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            results = hands.process(image_rgb)
-            h, w, c = image.shape
-            if results.multi_hand_landmarks:
-                for idx, hand_landmarks in enumerate(results.multi_hand_landmarks):
-                    label = results.multi_handedness[idx].classification[0].label
-                    hand_cx = hand_landmarks.landmark[9].x
-                    if label == "Left":
-                        target_raw = hand_cx * WIDTH
-                        hand_target_x = max(0, min(WIDTH - player_w, target_raw - player_w/2))
-                        cv2.circle(image, (int(hand_cx*w), int(hand_landmarks.landmark[9].y*h)), 15, (0, 255, 0), -1)
-                    elif label == "Right":
-                        gesture = count_extended_fingers(hand_landmarks)
-                        current_gesture = gesture
-                        cv2.putText(image, gesture, (int(hand_cx*w)-40, int(hand_landmarks.landmark[9].y*h)-40),
-                                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 3)
-            final_bg_image = cv2.resize(image, (WIDTH, HEIGHT))
-            if game_bg_image is not None:
-                final_bg_image = cv2.addWeighted(final_bg_image, CAMERA_WEIGHT, game_bg_image, BACKGROUND_WEIGHT, 0)
-            bg_surface = pygame.image.frombuffer(final_bg_image.tobytes(), final_bg_image.shape[1::-1], "RGB")
-
-    keys = pygame.key.get_pressed()
-    if not camera_available:
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]: keyboard_target_x = max(0, keyboard_target_x - keyboard_move_speed)
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]: keyboard_target_x = min(WIDTH - player_w, keyboard_target_x + keyboard_move_speed)
-
-    if initial_drop:
-        hand_target_x = WIDTH // 2 - player_w // 2
-        keyboard_target_x = WIDTH // 2 - player_w // 2
-    if not camera_available:
-        hand_target_x = keyboard_target_x
+    new_game_seed = None
+    camera_frame = None
+
+    if vision_worker is not None:
+        snapshot = vision_worker.latest
+        if snapshot.frame_id != last_vision_frame_id:
+            last_vision_frame_id = snapshot.frame_id
+            current_gesture = snapshot.gesture
+            if snapshot.detected:
+                if snapshot.hand_cx is None: hand_filter.reset()
+                else: hand_filter.update(snapshot.timestamp, snapshot.hand_cx)
+                if landmark_log is not None:
+                    landmark_log.append((snapshot.timestamp, float("nan") if snapshot.hand_cx is None else snapshot.hand_cx,
+                                         time.perf_counter()))
+            camera_frame = snapshot.frame
+        if hand_filter.ready:
+            hand_target_x = hand_to_screen_x(hand_filter.predict(time.perf_counter() + HAND_PREDICT_AHEAD),
+                                             WIDTH, player_w)
+    profiler.lap("vision")
+
+    if camera_frame is not None and gpu is not None:
+        gpu.set_camera_frame(camera_frame)
+        bg_ready = True
+    elif camera_frame is not None and background_compositor is not None:
+        background_compositor.update(camera_frame)
+        bg_ready = True
+    profiler.lap("composite")
 
     # ------------------ 事件处理 ------------------
     for event in pygame.event.get():
         if event.type == pygame.QUIT: running = False
+        if event.type == pygame.VIDEOEXPOSE: renderer.invalidate()
+        if event.type in (pygame.AUDIODEVICEADDED, pygame.AUDIODEVICEREMOVED) and event.iscapture:
+            audio_devices_changed = True
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE: running = False
+            if event.key == pygame.K_F3: profiler_overlay.toggle(); continue
+            if event.key == pygame.K_F4: export_profile(); continue
 
-            if game_state == "PLAYING" and not camera_available:
-                now = time.time()
-                if event.key == pygame.K_1 and now - skills["RESCUE"]["last_use"] > skills["RESCUE"]["cooldown"]:
-                    spawn_y = min(HEIGHT-50, player_y + 100)
-                    plat_w = get_platform_width(spawn_y, scroll)
-                    platforms.append((pygame.Rect(int(player_x + player_w/2 - plat_w/2), spawn_y, plat_w, PLATFORM_HEIGHT), True, False, False))
-                    skills["RESCUE"]["last_use"] = now
-                elif event.key == pygame.K_2 and now - skills["SHIELD"]["last_use"] > skills["SHIELD"]["cooldown"]:
-                    shield_active_end = now + 3.0
-                    skills["SHIELD"]["last_use"] = now
-                elif event.key == pygame.K_3 and now - skills["BLAST"]["last_use"] > skills["BLAST"]["cooldown"]:
-                    hazards.clear(); shockwave_radius = 1; skills["BLAST"]["last_use"] = now
+            if game_state == "PLAYING" and not camera_available and event.key in KEY_SKILLS:
+                pending_skill = KEY_SKILLS[event.key]
 
             if game_state == "SETTINGS":
-                if event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
-                    velocity_y = 0; score = scroll = 0; is_jumping = False
-                    generate_initial_platforms(); hazards.clear()
-                    player_x = WIDTH // 2 - player_w // 2; player_y = -50
-                    keyboard_target_x = WIDTH // 2 - player_w // 2; initial_drop = True 
-                    for skill in skills.values(): skill['last_use'] = 0
-                    game_state = "PLAYING"
+                if (event.key == pygame.K_RETURN or event.key == pygame.K_SPACE) and replay is None and startup_ready:
+                    new_game_seed = random.getrandbits(32)
                 
-                # --- [NEW] Handle device selection with UP/DOWN keys ---
-                if event.key == pygame.K_UP:
-                    if input_devices:
-                        selected_device_index = (selected_device_index - 1) % len(input_devices)
-                        if audio_stream: audio_stream.stop(); audio_stream.close()
-                        audio_stream = start_audio_stream(input_devices[selected_device_index]['index'])
-                if event.key == pygame.K_DOWN:
-                    if input_devices:
-                        selected_device_index = (selected_device_index + 1) % len(input_devices)
-                        if audio_stream: audio_stream.stop(); audio_stream.close()
-                        audio_stream = start_audio_stream(input_devices[selected_device_index]['index'])
+                # --- Handle device selection with UP/DOWN keys (switch happens in the background) ---
+                if audio_devices is not None:
+                    if event.key == pygame.K_UP: audio_devices.step(-1)
+                    if event.key == pygame.K_DOWN: audio_devices.step(1)
+                    if event.key == pygame.K_r: audio_devices.request_rescan()
             
             elif game_state == "START": game_state = "SETTINGS"
             elif game_state == "GAME_OVER": game_state = "SETTINGS"
 
-    if game_state == "SETTINGS":
-        adjustment_speed = 25
-        if keys[pygame.K_LEFT]: volume_sensitivity_adjusted = max(500, volume_sensitivity_adjusted - adjustment_speed)
-        if keys[pygame.K_RIGHT]: volume_sensitivity_adjusted = min(8000, volume_sensitivity_adjusted + adjustment_speed)
-            
-    now = time.time()
-    if game_state == "PLAYING" and camera_available:
-        if current_gesture == "VICTORY" and now - skills["RESCUE"]["last_use"] > skills["RESCUE"]["cooldown"]:
-            spawn_y = min(HEIGHT-50, player_y + 100)
-            plat_w = get_platform_width(spawn_y, scroll)
-            platforms.append((pygame.Rect(int(player_x + player_w/2 - plat_w/2), spawn_y, plat_w, PLATFORM_HEIGHT), True, False, False))
-            skills["RESCUE"]["last_use"] = now
-        if current_gesture == "FIST" and now - skills["SHIELD"]["last_use"] > skills["SHIELD"]["cooldown"]:
-            shield_active_end = now + 3.0; skills["SHIELD"]["last_use"] = now
-        if current_gesture == "PALM" and now - skills["BLAST"]["last_use"] > skills["BLAST"]["cooldown"]:
-            hazards.clear(); shockwave_radius = 1; skills["BLAST"]["last_use"] = now
-
-    # ------------------ 物理更新 ------------------
-    if game_state == "PLAYING":
-        player_x += (hand_target_x - player_x) * 0.2
-        with lock: current_rms = volume_rms
-        jump_force = 0.0
-
-        if current_rms > VOLUME_THRESHOLD:
-            raw_force = (current_rms - VOLUME_THRESHOLD) * volume_sensitivity_adjusted
-            jump_force = min(25, raw_force)
-
-        player_y += velocity_y
-        player_rect = pygame.Rect(int(player_x), int(player_y), player_w, player_h)
-        standing_on_platform = None; is_on_bouncy_platform = False
-
-        if velocity_y >= 0:
-            velocity_y = min(velocity_y, 40)
-            for i, (plat_rect, is_bouncing, is_broken, is_falling) in enumerate(platforms):
-                if not is_falling and player_rect.colliderect(plat_rect) and abs(player_rect.bottom - plat_rect.top) < velocity_y + 20:
-                    standing_on_platform = plat_rect
-                    is_on_bouncy_platform = is_bouncing
-                    if not is_bouncing and i != 0 and random.random() < 0.3:
-                        platforms[i] = (plat_rect, is_bouncing, True, True)
+    # 麦克风热插拔后重新枚举（会短暂中断采集，所以游戏中先记下，离开游戏再做）
+    if audio_devices is not None:
+        if audio_devices_changed and game_state != "PLAYING":
+            audio_devices_changed = False
+            # SDL 启动时会为每个已有的设备各发一次 ADDED：第一次枚举之前、或设备集合没变时都不重新枚举
+            names = capture_device_names()
+            if audio_devices.scanned and (names is None or names != capture_devices):
+                capture_devices = names; audio_devices.request_rescan()
+        audio_devices.update()
+
+    # 回放：上一局结束后稍作停留，然后自动开始录像里的下一局
+    if replay is not None and startup_ready and game_state != "PLAYING" and time.perf_counter() >= replay_resume_at:
+        game = replay.next_reset()
+        if game is None:
+            print("回放结束"); running = False
+        else: new_game_seed, volume_sensitivity_adjusted = game
+
+    if new_game_seed is not None:
+        sim.sensitivity = volume_sensitivity_adjusted
+        sim.reset(new_game_seed)
+        hand_target_x = pending_skill = None
+        if recorder is not None: recorder.reset(new_game_seed, volume_sensitivity_adjusted)
+        game_state = "PLAYING"
+
+    if game_state == "PLAYING" and camera_available and current_gesture in GESTURE_SKILLS:
+        pending_skill = GESTURE_SKILLS[current_gesture]
+
+    # 取走这一帧之前的所有音频特征与起音事件，一个都不会漏
+    features = voice.features.pop_all()
+    # 音量条和跳跃力沿用原来按块算 RMS 的标定：取这一帧期间各 hop 的能量平均，而不是峰值保持
+    if len(features): current_rms = float(np.sqrt(np.mean(np.square(features["rms"], dtype=np.float64))))
+    for onset in voice.events.pop_all():
+        if onset["level"] >= pending_voice_level or onset["t"] - pending_voice_time > VOICE_JUMP_BUFFER:
+            pending_voice_level = float(onset["level"]); pending_voice_time = float(onset["t"])
+    profiler.lap("input")
+
+    # ------------------ 物理更新（固定步长） ------------------
+    # 模拟以 TICK_RATE 固定频率推进，与渲染帧率无关；每帧可能推进 0~N 步
+    keys = pygame.key.get_pressed()
+    for _ in range(sim_clock.advance() * (REPLAY_SPEED if replay is not None else 1)):
+        if game_state == "SETTINGS":
+            adjustment_speed = 25
+            if keys[pygame.K_LEFT]: volume_sensitivity_adjusted = max(500, volume_sensitivity_adjusted - adjustment_speed)
+            if keys[pygame.K_RIGHT]: volume_sensitivity_adjusted = min(8000, volume_sensitivity_adjusted + adjustment_speed)
+
+        if game_state == "PLAYING":
+            if replay is not None:
+                inputs = replay.next_tick()
+                if inputs is None:   # 录制在这一局中途停止
+                    game_state = "GAME_OVER"; replay_resume_at = time.perf_counter() + 1.0
                     break
-            if standing_on_platform:
-                player_y = standing_on_platform.top - player_h; velocity_y = 0; is_jumping = False
-            else: velocity_y += gravity
-        else: velocity_y += gravity
-
-        base_jump = -(10 + jump_force)
-        if initial_drop and standing_on_platform:
-            initial_drop = False; velocity_y = -20; is_jumping = True
-        elif standing_on_platform and jump_force > 1.0 and not is_jumping:
-            velocity_y = base_jump * BOUNCE_MULTIPLIER if is_on_bouncy_platform else base_jump
-            is_jumping = True
-        if standing_on_platform and is_on_bouncy_platform and not is_jumping and jump_force < 1.0:
-            velocity_y = -15; is_jumping = True
-
-        is_invincible = time.time() < shield_active_end
-        for hazard_rect, _ in hazards[:]:
-            if player_rect.colliderect(hazard_rect):
-                if is_invincible:
-                    hazards.remove((hazard_rect, _)); score += 50
-                else: game_state = "GAME_OVER"
-
-        if not initial_drop and player_y < HEIGHT / 2.5:
-            scroll_amt = (HEIGHT / 2.5) - player_y
-            player_y += scroll_amt; scroll += scroll_amt
-            new_plats = []
-            highest_y = HEIGHT
-            for r, b, br, f in platforms:
-                if f: r.y += PLATFORM_FALL_SPEED
-                else: r.y += scroll_amt
-                if r.bottom > 0:
-                    new_plats.append((r, b, br, f))
-                    if not f and r.y < highest_y: highest_y = r.y
-            platforms = new_plats
-            new_haz = []
-            for r, v in hazards:
-                r.y += scroll_amt
-                if r.bottom > 0: new_haz.append((r, v))
-            hazards = new_haz
-            if len(platforms) < 15 or highest_y > 0:
-                y = highest_y
-                while y > -HEIGHT:
-                    y -= random.randint(100, 180)
-                    plat_w = get_platform_width(y, scroll)
-                    x = random.randint(0, WIDTH - plat_w)
-                    is_b = random.random() < 0.25
-                    platforms.append((pygame.Rect(x, y, plat_w, PLATFORM_HEIGHT), is_b, False, False))
-                if random.random() < 0.6: generate_hazard(highest_y)
-
-        for i, (r, v) in enumerate(hazards):
-            r.x += v
-            if r.left < 0 or r.right > WIDTH: v = -v; hazards[i] = (r, v)
-        score = int(scroll / 10)
-        if player_y > HEIGHT: game_state = "GAME_OVER"
+                voice_level, hand_x, move, skill = inputs
+                current_rms = voice_level
+            else:
+                move = 0
+                if not camera_available:
+                    if keys[pygame.K_LEFT] or keys[pygame.K_a]: move -= 1
+                    if keys[pygame.K_RIGHT] or keys[pygame.K_d]: move += 1
+                voice_level = current_rms
+                if time.perf_counter() - pending_voice_time < VOICE_JUMP_BUFFER:
+                    voice_level = max(voice_level, pending_voice_level)
+                hand_x, skill = hand_target_x, pending_skill
+
+            sim.step(voice_level, hand_x, move, skill)
+            if recorder is not None: recorder.tick(voice_level, hand_x, move, skill)
+            hand_target_x = pending_skill = None
+            if sim.voice_jumped: pending_voice_level = 0.0
+            if sim.game_over:
+                game_state = "GAME_OVER"; replay_resume_at = time.perf_counter() + 1.0
+                if recorder is not None: recorder.end(sim.score)
+    profiler.lap("update")
 
     # ------------------ 绘制 ------------------
-    if bg_surface: screen.blit(bg_surface, (0, 0))
-    else: screen.fill((20, 20, 30))
-    screen.blit(dim_surface, (0, 0))
+    # 背景不变时（没有摄像头画面）只擦除并提交上一帧与这一帧画过的区域，见 DirtyRenderer
+    renderer.set_active(DIRTY_RENDERING and not bg_ready)
+    renderer.begin()
+    if not renderer.active:
+        if bg_ready: background_compositor.blit_to(screen)
+        else: screen.fill((20, 20, 30))
+        screen.blit(dim_surface, (0, 0))
 
     if game_state == "PLAYING":
-        for r, b, br, f in platforms:
-            color = (80,80,80) if f else ((255,165,0) if b else (180,180,100))
-            pygame.draw.rect(screen, color, r)
-        for r, v in hazards:
-            pygame.draw.circle(screen, (255, 50, 50), r.center, HAZARD_SIZE//2)
+        # 在上一 tick 与当前 tick 之间插值绘制
+        alpha = sim_clock.alpha
+        draw_x = sim.prev_player_x + (sim.player_x - sim.prev_player_x) * alpha
+        draw_y = sim.prev_player_y + (sim.player_y - sim.prev_player_y) * alpha
+        plats = world.platforms
+        plat_xs, plat_ys = World.interpolate(plats, alpha)
+        plat_batch = tiles.platform_batch(plat_xs, plat_ys, plats.w, plats.flags)
+        renderer.extend(screen.blits(plat_batch, doreturn=renderer.active))
+        haz_xs, haz_ys = World.interpolate(world.hazards, alpha)
+        renderer.extend(screen.blits(tiles.hazard_batch(haz_xs, haz_ys), doreturn=renderer.active))
 
         if sprite_loaded and len(animation_frames) > 0:
             total_frames = len(animation_frames)
-            if not is_jumping: current_frame_index = 0
+            if not sim.is_jumping: current_frame_index = 0
             else:
-                progress = max(0.0, min(1.0, (velocity_y + 15) / 30.0))
+                progress = max(0.0, min(1.0, (sim.velocity_y + 15) / 30.0))
                 air_count = total_frames - 1
                 if air_count > 0: current_frame_index = 1 + int(progress * (air_count - 1))
                 else: current_frame_index = 0
             if current_frame_index >= total_frames: current_frame_index = total_frames - 1
-            char_img = animation_frames[current_frame_index]
-            if hand_target_x < player_x - 5: char_img = pygame.transform.flip(char_img, True, False)
-            screen.blit(char_img, (int(player_x) - 4, int(player_y) - 4))
+            char_img = sprite_atlas.frame(current_frame_index, sim.hand_target_x < sim.player_x - 5)
+            mark(screen.blit(char_img, (int(draw_x) - 4, int(draw_y) - 4)))
         else:
-            pygame.draw.rect(screen, (200, 80, 120), (int(player_x), int(player_y), player_w, player_h))
+            mark(pygame.draw.rect(screen, (200, 80, 120), (int(draw_x), int(draw_y), player_w, player_h)))
 
-        if time.time() < shield_active_end:
-            pygame.draw.circle(screen, (255, 215, 0), (int(player_x + player_w/2), int(player_y + player_h/2)), 45, 3)
-        if shockwave_radius > 0:
-            shockwave_radius += 30
-            pygame.draw.circle(screen, (0, 255, 255), (WIDTH//2, HEIGHT//2), shockwave_radius, 10)
-            if shockwave_radius > WIDTH: shockwave_radius = 0
+        if sim.shield_active:
+            mark(pygame.draw.circle(screen, (255, 215, 0), (int(draw_x + player_w/2), int(draw_y + player_h/2)), 45, 3))
+        if sim.shockwave_radius > 0:
+            mark(pygame.draw.circle(screen, (0, 255, 255), (WIDTH//2, HEIGHT//2), sim.shockwave_radius, 10))
+
+        profiler.lap("draw")
 
         ui_y = HEIGHT // 2 - 100
-        for key, skill in skills.items():
-            remaining = max(0, skill["cooldown"] - (now - skill["last_use"]))
-            alpha = 100 if remaining > 0 else 255
-            bg_rect = pygame.Rect(20, ui_y, 220, 50); s = pygame.Surface((220, 50)); s.set_alpha(alpha); s.fill((30, 30, 40))
-            screen.blit(s, bg_rect); pygame.draw.rect(screen, skill["color"], bg_rect, 2)
-            text = FONT.render(skill["name"], True, skill["color"]); screen.blit(text, (30, ui_y + 15))
-            if remaining > 0:
-                time_text = FONT.render(f"{remaining:.1f}s", True, (150, 150, 150)); screen.blit(time_text, (180, ui_y + 15))
-            else:
-                ready_text = FONT.render("READY", True, (255, 255, 255)); screen.blit(ready_text, (180, ui_y + 15))
+        for key in skills:
+            remaining = sim.cooldown_remaining(key)
+            mark(screen.blit(skill_panels[key].get(remaining), (20, ui_y)))
             ui_y += 60
 
         if not camera_available:
-            no_cam_text = FONT.render("No Camera - Keyboard Mode", True, (255, 100, 100))
-            screen.blit(no_cam_text, (WIDTH//2 - no_cam_text.get_width()//2, 20))
+            no_cam_text = text_cache.render(FONT, "No Camera - Keyboard Mode", (255, 100, 100))
+            mark(screen.blit(no_cam_text, (WIDTH//2 - no_cam_text.get_width()//2, 20)))
 
         vol_h = int(min(1.0, current_rms/0.02) * 200)
-        pygame.draw.rect(screen, (50, 50, 50), (WIDTH-40, HEIGHT-250, 20, 200))
-        pygame.draw.rect(screen, (0, 255, 0), (WIDTH-40, HEIGHT-50-vol_h, 20, vol_h))
-        score_surf = BIG_FONT.render(str(score), True, (255, 255, 255))
-        screen.blit(score_surf, (WIDTH//2 - score_surf.get_width()//2, 50))
+        mark(pygame.draw.rect(screen, (50, 50, 50), (WIDTH-40, HEIGHT-250, 20, 200)))
+        mark(pygame.draw.rect(screen, (0, 255, 0), (WIDTH-40, HEIGHT-50-vol_h, 20, vol_h)))
+        score_surf = score_text.get(str(sim.score))
+        mark(screen.blit(score_surf, (WIDTH//2 - score_surf.get_width()//2, 50)))
 
     elif game_state == "START":
-        title = BIG_FONT.render("SOUND JUMPER", True, (255, 255, 255))
-        screen.blit(title, (WIDTH//2 - title.get_width()//2, HEIGHT//3))
+        title = text_cache.render(BIG_FONT, "SOUND JUMPER", (255, 255, 255))
+        mark(screen.blit(title, (WIDTH//2 - title.get_width()//2, HEIGHT//3)))
         instr = ["RIGHT HAND: Move", "LEFT HAND: Gestures", "VOICE: Jump", "Press Key to Continue"] if camera_available else ["NO CAMERA", "A/D: Move", "1/2/3: Skills", "VOICE: Jump", "Press Key to Continue"]
+        if not startup_ready and not startup.done("vision"): instr = ["Detecting camera...", "Press Key to Continue"]
         y = HEIGHT//2
         for line in instr:
-            t = FONT.render(line, True, (200, 200, 200)); screen.blit(t, (WIDTH//2 - t.get_width()//2, y)); y += 40
+            t = text_cache.render(FONT, line, (200, 200, 200)); mark(screen.blit(t, (WIDTH//2 - t.get_width()//2, y))); y += 40
 
     elif game_state == "SETTINGS":
-        title = BIG_FONT.render("SETTINGS", True, (255, 255, 255))
-        screen.blit(title, (WIDTH//2 - title.get_width()//2, HEIGHT//4))
+        title = text_cache.render(BIG_FONT, "SETTINGS", (255, 255, 255))
+        mark(screen.blit(title, (WIDTH//2 - title.get_width()//2, HEIGHT//4)))
         setting_y = HEIGHT//2 - 80
-        label = FONT.render(f"Voice Sensitivity: {int(volume_sensitivity_adjusted)}", True, (255, 255, 255))
-        screen.blit(label, (WIDTH//2 - label.get_width()//2, setting_y))
-        pygame.draw.rect(screen, (100,100,100), (WIDTH//2-200, setting_y+40, 400, 20))
+        label = text_cache.render(FONT, f"Voice Sensitivity: {int(volume_sensitivity_adjusted)}", (255, 255, 255))
+        mark(screen.blit(label, (WIDTH//2 - label.get_width()//2, setting_y)))
+        mark(pygame.draw.rect(screen, (100,100,100), (WIDTH//2-200, setting_y+40, 400, 20)))
         fill_w = int((volume_sensitivity_adjusted-500)/(8000-500)*400)
-        pygame.draw.rect(screen, (0,255,100), (WIDTH//2-200, setting_y+40, fill_w, 20))
+        mark(pygame.draw.rect(screen, (0,255,100), (WIDTH//2-200, setting_y+40, fill_w, 20)))
 
         # --- [NEW] Draw device selection UI ---
-        device_label = FONT.render("Input Device:", True, (255, 255, 255))
-        screen.blit(device_label, (WIDTH//2 - device_label.get_width()//2, setting_y + 80))
+        device_label = text_cache.render(FONT, "Input Device:", (255, 255, 255))
+        mark(screen.blit(device_label, (WIDTH//2 - device_label.get_width()//2, setting_y + 80)))
         device_name = get_selected_device_name()
-        device_name_text = FONT.render(device_name, True, (0, 255, 255))
-        screen.blit(device_name_text, (WIDTH//2 - device_name_text.get_width()//2, setting_y + 110))
-        device_hint = FONT.render("Use UP/DOWN Arrows to change device", True, (200, 200, 200))
-        screen.blit(device_hint, (WIDTH//2 - device_hint.get_width()//2, setting_y + 140))
+        device_name_text = text_cache.render(FONT, device_name, (0, 255, 255))
+        mark(screen.blit(device_name_text, (WIDTH//2 - device_name_text.get_width()//2, setting_y + 110)))
+        device_hint = text_cache.render(FONT, "Use UP/DOWN Arrows to change device, R to rescan", (200, 200, 200))
+        mark(screen.blit(device_hint, (WIDTH//2 - device_hint.get_width()//2, setting_y + 140)))
+        if audio_devices is not None and audio_devices.error:
+            device_error = text_cache.render(FONT, audio_devices.error[:60], (255, 100, 100))
+            mark(screen.blit(device_error, (WIDTH//2 - device_error.get_width()//2, setting_y + 170)))
         
-        start_text = FONT.render("Use Left/Right Arrows for Sensitivity", True, (200, 200, 200))
-        screen.blit(start_text, (WIDTH//2 - start_text.get_width()//2, HEIGHT - 150))
-        start_text = FONT.render("Press SPACE to Start", True, (100, 255, 100))
-        screen.blit(start_text, (WIDTH//2 - start_text.get_width()//2, HEIGHT - 100))
+        start_text = text_cache.render(FONT, "Use Left/Right Arrows for Sensitivity", (200, 200, 200))
+        mark(screen.blit(start_text, (WIDTH//2 - start_text.get_width()//2, HEIGHT - 150)))
+        if startup_ready: start_text = text_cache.render(FONT, "Press SPACE to Start", (100, 255, 100))
+        else: start_text = text_cache.render(FONT, startup_status(), (255, 200, 100))
+        mark(screen.blit(start_text, (WIDTH//2 - start_text.get_width()//2, HEIGHT - 100)))
 
     elif game_state == "GAME_OVER":
-        t = BIG_FONT.render("GAME OVER", True, (255, 50, 50))
-        screen.blit(t, (WIDTH//2 - t.get_width()//2, HEIGHT//3))
-        s = BIG_FONT.render(f"Score: {score}", True, (255, 255, 255))
-        screen.blit(s, (WIDTH//2 - s.get_width()//2, HEIGHT//2))
-        r = FONT.render("Press Any Key to Continue", True, (200, 200, 200))
-        screen.blit(r, (WIDTH//2 - r.get_width()//2, HEIGHT//2 + 80))
-
-    pygame.display.flip()
-    clock.tick(60)
-
-if audio_stream: audio_stream.stop(); audio_stream.close()
-if cap: cap.release()
+        t = text_cache.render(BIG_FONT, "GAME OVER", (255, 50, 50))
+        mark(screen.blit(t, (WIDTH//2 - t.get_width()//2, HEIGHT//3)))
+        s = text_cache.render(BIG_FONT, f"Score: {sim.score}", (255, 255, 255))
+        mark(screen.blit(s, (WIDTH//2 - s.get_width()//2, HEIGHT//2)))
+        r = text_cache.render(FONT, "Press Any Key to Continue", (200, 200, 200))
+        mark(screen.blit(r, (WIDTH//2 - r.get_width()//2, HEIGHT//2 + 80)))
+
+    mark(profiler_overlay.draw(screen, time.perf_counter()))
+    profiler.lap("hud")
+    renderer.present()
+    profiler.lap("flip")
+    if first_frame:
+        first_frame = False
+        profiler.metric("time_to_first_frame_ms", (time.perf_counter() - STARTUP_T0) * 1000)
+        print(f"首帧耗时: {profiler.metrics['time_to_first_frame_ms']:.0f} ms")
+    clock.tick(MAX_FPS)
+    profiler.lap("idle")
+
+if PROFILE_PREFIX: export_profile(PROFILE_PREFIX)
+if landmark_log: np.save(LANDMARK_TRACE_PATH, np.array(landmark_log))
+if recorder is not None: recorder.close()
+if audio_devices is not None: audio_devices.close()
+sim.close()
+# 还在加载的启动任务先等它们结束，以便释放它们打开的摄像头和模型
+startup.shutdown(wait=True)
+# 退出时只接管结果以便释放，不报告就绪、不新建录制
+if not startup_ready: adopt_startup()
+# 线程模式释放摄像头并关闭 Hands；进程模式通知子进程收尾，再回收共享内存
+if vision_worker is not None: vision_worker.stop()
+elif startup.result("hands") is not None: startup.result("hands").close()
+if gpu is not None: gpu.close()
 pygame.quit()
@@ -7,6 +7,13 @@ import random
 import cv2
 import os
 import mediapipe as mp
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from sound_jumper.camera import find_camera
+from sound_jumper.gestures import GestureDebouncer, classify_hand
+from sound_jumper.sprites import load_sprite_atlas
+from sound_jumper.vision import VisionWorker
 
 # ---------- 1. 初始化 & 屏幕设置 ----------
 pygame.init()
@@ -63,47 +70,21 @@ CAMERA_INDEX = 0  # 摄像头索引：0=默认, 1/2/3=其他设备（包括虚
 USE_IP_WEBCAM = False
 IP_WEBCAM_URL = "http://192.168.1.100:8080/video"  # 替换为你的手机IP
 
-# 初始化摄像头
-cap = None
-camera_available = False
-
+# 初始化摄像头：候选设备并发探测（每个都有超时，连不上的网络地址不会卡住启动），
+# 按分辨率 / 帧率选最好的一个并设置 MJPG、帧率、单帧缓冲；选中的设备记在缓存目录，下次启动直接打开
+CAMERA_PROBE_TIMEOUT = 3.0
+CAPTURE_SETTINGS = dict(width=1280, height=720, fps=30, fourcc="MJPG", buffer_size=1)
 if USE_IP_WEBCAM:
-    # 使用 IP Webcam
-    try:
-        cap = cv2.VideoCapture(IP_WEBCAM_URL)
-        if cap.isOpened():
-            camera_available = True
-            print(f"成功连接到 IP Webcam: {IP_WEBCAM_URL}")
-        else:
-            print(f"无法连接到 IP Webcam: {IP_WEBCAM_URL}")
-    except Exception as e:
-        print(f"IP Webcam 连接错误: {e}")
+    camera_sources = [IP_WEBCAM_URL]
+elif USE_VIRTUAL_CAMERA:
+    camera_sources = [1, 2, 3, 0]   # 尝试多个可能的虚拟摄像头索引
 else:
-    # 使用本地或虚拟摄像头
-    if USE_VIRTUAL_CAMERA:
-        # 尝试多个可能的虚拟摄像头索引
-        for idx in [1, 2, 3, 0]:
-            test_cap = cv2.VideoCapture(idx)
-            if test_cap.isOpened():
-                ret, frame = test_cap.read()
-                if ret and frame is not None:
-                    cap = test_cap
-                    camera_available = True
-                    print(f"成功打开虚拟摄像头 (索引 {idx})")
-                    break
-                else:
-                    test_cap.release()
-    else:
-        # 使用指定索引的摄像头
-        cap = cv2.VideoCapture(CAMERA_INDEX)
-        if cap.isOpened():
-            ret, frame = cap.read()
-            if ret and frame is not None:
-                camera_available = True
-                print(f"成功打开摄像头 (索引 {CAMERA_INDEX})")
-            else:
-                cap.release()
-                cap = None
+    camera_sources = [CAMERA_INDEX]
+camera = find_camera(camera_sources, CAMERA_PROBE_TIMEOUT, **CAPTURE_SETTINGS)
+cap = camera.cap if camera is not None else None
+camera_available = camera is not None
+if camera_available:
+    print(f"成功打开摄像头: {camera}")
 
 # 如果没有找到摄像头，提供键盘控制作为后备
 if not camera_available:
@@ -118,37 +99,6 @@ if not camera_available:
     print("=" * 50)
     cap = None
 
-# 简单的手势判断函数
-def count_extended_fingers(hand_landmarks):
-    """计算伸出的手指数量，并判断特定手势"""
-    # 指尖索引: Thumb=4, Index=8, Middle=12, Ring=16, Pinky=20
-    # 指节索引: Thumb=3, Index=6, Middle=10, Ring=14, Pinky=18
-    tips = [4, 8, 12, 16, 20]
-    pips = [3, 6, 10, 14, 18]
-    
-    extended = [0, 0, 0, 0, 0]
-    
-    # 拇指比较特殊，比较x坐标 (根据左右手不同，这里简化判断：只要指尖离手掌中心够远)
-    # 为简化逻辑，我们主要判断另外四指
-    
-    # 食指到小指：如果指尖的y坐标小于指节y坐标 (屏幕坐标系y向下增大，所以"上"是更小)，则为伸出
-    for i in range(1, 5):
-        if hand_landmarks.landmark[tips[i]].y < hand_landmarks.landmark[pips[i]].y:
-            extended[i] = 1
-            
-    # 拇指简单判断：如果指尖y小于指节y（向上），则为伸出
-    if hand_landmarks.landmark[tips[0]].y < hand_landmarks.landmark[pips[0]].y:
-        extended[0] = 1
-
-    count = sum(extended)
-    
-    # 判定手势类型
-    if count >= 4: return "PALM"  # 五指张开
-    if count <= 1: return "FIST"  # 握拳
-    if extended[1] and extended[2] and not extended[3] and not extended[4]: return "VICTORY" # 剪刀手
-    
-    return "UNKNOWN"
-
 # ---------- 4. 游戏变量 ----------
 clock = pygame.time.Clock()
 FONT = pygame.font.SysFont(None, 30)
@@ -231,23 +181,6 @@ last_frame_time = 0
 # Scale multiplier for the player (1.5 = 150%)
 PLAYER_SCALE = 1.5
 
-def load_sprite_sheet(path, fw, fh):
-    try:
-        sheet = pygame.image.load(path).convert_alpha()
-    except Exception:
-        return []
-    sw, sh = sheet.get_size()
-    cols = max(1, sw // fw)
-    rows = max(1, sh // fh)
-    frames = []
-    for r in range(rows):
-        for c in range(cols):
-            rect = pygame.Rect(c*fw, r*fh, fw, fh)
-            frame = pygame.Surface((fw, fh), pygame.SRCALPHA)
-            frame.blit(sheet, (0, 0), rect)
-            frames.append(frame)
-    return frames
-
 # Try several likely locations for the sheet
 possible_paths = [
     os.path.join(os.getcwd(), "sheet.png"),
@@ -257,11 +190,12 @@ possible_paths = [
 for p in possible_paths:
     if os.path.exists(p):
         tile_w, tile_h = 48, 48
-        loaded = load_sprite_sheet(p, tile_w, tile_h)
-        if loaded:
-            player_frames = loaded
-            # Apply scale to collision size while keeping original frames available
-            player_w, player_h = int(tile_w * PLAYER_SCALE), int(tile_h * PLAYER_SCALE)
+        scaled_w, scaled_h = int(tile_w * PLAYER_SCALE), int(tile_h * PLAYER_SCALE)
+        # Frames are smoothscaled to the player size once here (and cached on disk), not every frame
+        atlas = load_sprite_atlas(p, tile_w, tile_h, (scaled_w, scaled_h))
+        if atlas:
+            player_frames = atlas.frames
+            player_w, player_h = scaled_w, scaled_h
             print(f"Loaded sprite sheet: {p} frames={len(player_frames)} size=({player_w},{player_h})")
             break
 
@@ -269,53 +203,31 @@ for p in possible_paths:
 if not player_frames:
     player_w, player_h = int(player_w * PLAYER_SCALE), int(player_h * PLAYER_SCALE)
 
+# 后台视觉线程（持有 cap 与 hands）
+vision_worker = None
+if camera_available and cap is not None:
+    vision_worker = VisionWorker(cap, hands, classify_hand, WIDTH, player_w, mark_gesture_hand=True,
+                                 debouncer=GestureDebouncer()).start()
+last_vision_frame_id = 0
+bg_surface = None
+
 # 主循环
 running = True
 while running:
     # ================= CAMERA & HAND TRACKING =================
-    bg_surface = None
     current_gesture = "NONE"
     
-    if camera_available and cap is not None:
-        success, image = cap.read()
-        
-        if success:
-            image = cv2.flip(image, 1) # 镜像翻转
-            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            results = hands.process(image_rgb)
-            
-            h, w, c = image.shape
-            
-            if results.multi_hand_landmarks and results.multi_handedness:
-                for idx, hand_landmarks in enumerate(results.multi_hand_landmarks):
-                    # 获取 MediaPipe 的左右手标签
-                    # 注意：因为我们做了 cv2.flip，所以 MediaPipe 的 "Left" 其实是用户的 "Right" (屏幕右侧)
-                    label = results.multi_handedness[idx].classification[0].label
-                    
-                    # 计算手掌中心X坐标 (0~1)
-                    hand_cx = hand_landmarks.landmark[9].x
-                    
-                    # 逻辑：屏幕右侧的手 (label=="Left") 控制移动，屏幕左侧的手 (label=="Right") 控制技能
-                    
-                    if label == "Left": # 这是用户的右手，在屏幕右侧 -> 移动控制
-                        target_raw = hand_cx * WIDTH
-                        # 稍微加点偏移，让手的位置更自然对应屏幕中心
-                        hand_target_x = max(0, min(WIDTH - player_w, target_raw - player_w/2))
-                        
-                        # 视觉反馈：绿色点
-                        cv2.circle(image, (int(hand_cx*w), int(hand_landmarks.landmark[9].y*h)), 15, (0, 255, 0), -1)
-                        
-                    elif label == "Right": # 这是用户的左手，在屏幕左侧 -> 技能控制
-                        gesture = count_extended_fingers(hand_landmarks)
-                        current_gesture = gesture
-                        
-                        # 视觉反馈：显示识别到的手势文字
-                        cv2.putText(image, gesture, (int(hand_cx*w)-40, int(hand_landmarks.landmark[9].y*h)-40), 
-                                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 3)
-                        cv2.circle(image, (int(hand_cx*w), int(hand_landmarks.landmark[9].y*h)), 15, (0, 255, 255), -1)
+    if vision_worker is not None:
+        # 摄像头与手势识别在后台线程运行，这里只取最新一帧的结果，不会阻塞渲染
+        snapshot = vision_worker.latest
+        if snapshot.frame_id != last_vision_frame_id:
+            last_vision_frame_id = snapshot.frame_id
+            current_gesture = snapshot.gesture
+            if snapshot.hand_target_x is not None:
+                hand_target_x = snapshot.hand_target_x
 
             # 渲染背景
-            bg_image = cv2.resize(image, (WIDTH, HEIGHT))
+            bg_image = cv2.resize(snapshot.frame, (WIDTH, HEIGHT))
             bg_surface = pygame.image.frombuffer(bg_image.tobytes(), bg_image.shape[1::-1], "RGB")
     else:
         # 无摄像头时使用键盘控制
@@ -543,10 +455,7 @@ while running:
             if now_ms - last_frame_time >= frame_delay_ms:
                 frame_index = (frame_index + 1) % len(player_frames)
                 last_frame_time = now_ms
-            frame = player_frames[frame_index]
-            if frame.get_width() != player_w or frame.get_height() != player_h:
-                frame = pygame.transform.smoothscale(frame, (player_w, player_h))
-            screen.blit(frame, (int(player_x), int(player_y)))
+            screen.blit(player_frames[frame_index], (int(player_x), int(player_y)))
         else:
             pygame.draw.rect(screen, (200, 80, 120), (int(player_x), int(player_y), player_w, player_h))
         
@@ -694,6 +603,8 @@ while running:
 # 清理
 audio_stream.stop()
 audio_stream.close()
-if cap is not None:
+if vision_worker is not None:
+    vision_worker.stop()
+elif cap is not None:
     cap.release()
 pygame.quit()
\ No newline at end of file
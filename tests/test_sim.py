@@ -0,0 +1,54 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from sound_jumper.sim import SimConfig, Simulation
+from sound_jumper.world import BOUNCY, FALLING, START
+
+
+def run_until_start_culled(sim, max_ticks=600):
+    """Shout until the start platform has scrolled out below the screen and been compacted away."""
+    for _ in range(max_ticks):
+        sim.step(voice_level=0.01)
+        if not (sim.world.platforms.flags & START).any():
+            return True
+    return False
+
+
+def land_on(sim, i):
+    """Drop the player onto platform ``i`` from just above it, with every random roll succeeding."""
+    cfg, p = sim.config, sim.world.platforms
+    sim.rng.random = lambda: 0.0
+    sim.player_x = sim.keyboard_target_x = float(p.x[i])
+    sim.player_y = float(p.y[i]) - cfg.player_h - 5
+    sim.velocity_y = 10
+    sim.step()
+
+
+class StartPlatformTest(unittest.TestCase):
+    def test_start_platform_is_flagged(self):
+        sim = Simulation(SimConfig(1920, 1080), seed=1)
+        flags = sim.world.platforms.flags
+        self.assertEqual(int((flags & START != 0).sum()), 1)
+        self.assertTrue(flags[0] & START)
+
+    def test_slot_zero_after_first_cull_can_fall(self):
+        sim = Simulation(SimConfig(1920, 1080), seed=1)
+        self.assertTrue(run_until_start_culled(sim))
+        p = sim.world.platforms
+        self.assertFalse(p.flags[0] & (START | BOUNCY | FALLING))
+        land_on(sim, 0)
+        self.assertTrue(p.flags[0] & FALLING)
+
+    def test_start_platform_never_falls(self):
+        sim = Simulation(SimConfig(1920, 1080), seed=1)
+        p = sim.world.platforms
+        p.flags[0] &= ~BOUNCY          # 只靠 START 豁免
+        land_on(sim, 0)
+        self.assertFalse(p.flags[0] & FALLING)
+
+
+if __name__ == "__main__":
+    unittest.main()